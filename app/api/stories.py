@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 from app.core.auth import build_error, require_api_key
 from app.core.config import get_settings
@@ -8,16 +19,27 @@ from app.schemas.story import (
     ErrorResponse,
     StoryCreateAcceptedResponse,
     StoryCreateRequest,
+    StoryPageResponse,
     StoryResultResponse,
     StoryStatusResponse,
 )
+from app.services.admission import get_admission_controller, owner_key
+from app.services.http_cache import apply_conditional
 from app.services.rate_limiter import post_stories_rate_limiter
+from app.services.result_selection import (
+    build_field_include,
+    parse_field_selection,
+    parse_page_selection,
+)
 from app.services.request_context import get_request_id
+from app.services.story_event_stream import stream_story_events
 from app.services.story_orchestrator import (
     cancel_story_job,
     enqueue_story_generation,
-    load_story_result,
+    load_story_page_conditional,
+    load_story_result_conditional,
     load_story_status,
+    load_story_status_conditional,
 )
 
 router = APIRouter(
@@ -34,14 +56,17 @@ router = APIRouter(
         401: {"model": ErrorResponse},
         429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
     },
     status_code=status.HTTP_202_ACCEPTED,
 )
-async def create_story(
+def create_story(
     http_request: Request,
     request: StoryCreateRequest,
     background_tasks: BackgroundTasks,
 ) -> StoryCreateAcceptedResponse:
+    # A plain def: FastAPI runs it in the threadpool, so the SQLite admission
+    # queries and the enqueue transaction never block the event loop.
     api_key = (http_request.headers.get("X-API-Key") or "").strip()
     limit_per_min = get_settings().rate_limit_post_stories_per_min
     if not post_stories_rate_limiter.is_allowed(
@@ -57,10 +82,23 @@ async def create_story(
             ),
         )
 
+    admission = get_admission_controller().check(owner=owner_key(api_key))
+    if not admission.allowed:
+        raise HTTPException(
+            status_code=admission.status_code,
+            detail=build_error(
+                code=admission.code,
+                message=admission.message,
+                detail={**(admission.detail or {}), "retry_after_sec": admission.retry_after_sec},
+            ),
+            headers={"Retry-After": str(admission.retry_after_sec)},
+        )
+
     return enqueue_story_generation(
         request=request,
         background_tasks=background_tasks,
         request_id=get_request_id(),
+        api_key=api_key,
     )
 
 
@@ -68,27 +106,125 @@ async def create_story(
     "/{story_id}",
     response_model=StoryStatusResponse,
     responses={
+        304: {"description": "Not Modified (If-None-Match matched the current ETag)"},
         401: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
-async def get_story(story_id: str) -> StoryStatusResponse:
-    return load_story_status(story_id=story_id)
+async def get_story(
+    story_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> StoryStatusResponse:
+    return apply_conditional(
+        load_story_status_conditional(story_id=story_id, if_none_match=if_none_match),
+        response,
+    )
+
+
+@router.get(
+    "/{story_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+    },
+)
+async def get_story_events(
+    story_id: str,
+    request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    load_story_status(story_id=story_id)
+    try:
+        resume_after = max(0, int(last_event_id or 0))
+    except ValueError:
+        resume_after = 0
+    return StreamingResponse(
+        stream_story_events(
+            story_id=story_id,
+            last_event_id=resume_after,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
     "/{story_id}/result",
     response_model=StoryResultResponse,
     responses={
+        304: {"description": "Not Modified (If-None-Match matched the current ETag)"},
         401: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
         409: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
-async def get_story_result(story_id: str) -> StoryResultResponse:
-    return load_story_result(story_id=story_id)
+async def get_story_result(
+    story_id: str,
+    response: Response,
+    pages: str | None = Query(default=None, description="Page ranges, e.g. 1-4 or 1-4,7"),
+    fields: str | None = Query(
+        default=None,
+        description="Result fields (assets, meta, ...) and/or page fields (text_primary, ...)",
+    ),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> StoryResultResponse:
+    try:
+        page_numbers = parse_page_selection(pages)
+        selected_fields = parse_field_selection(fields)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=build_error(
+                code="INVALID_RESULT_SELECTION",
+                message="invalid pages or fields selection",
+                detail={"pages": pages, "fields": fields, "reason": str(error)},
+            ),
+        ) from None
+
+    return apply_conditional(
+        load_story_result_conditional(
+            story_id=story_id,
+            if_none_match=if_none_match,
+            page_numbers=page_numbers,
+            fields=selected_fields,
+        ),
+        response,
+        include=build_field_include(selected_fields) if selected_fields is not None else None,
+    )
+
+
+@router.get(
+    "/{story_id}/pages/{page_number}",
+    response_model=StoryPageResponse,
+    responses={
+        304: {"description": "Not Modified (If-None-Match matched the current ETag)"},
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def get_story_page(
+    story_id: str,
+    page_number: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> StoryPageResponse:
+    return apply_conditional(
+        load_story_page_conditional(
+            story_id=story_id,
+            page_number=page_number,
+            if_none_match=if_none_match,
+        ),
+        response,
+    )
 
 
 @router.delete(
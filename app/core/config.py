@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -18,6 +18,17 @@ def _parse_int_env(name: str, default: int) -> int:
     return value
 
 
+def _parse_bool_env(name: str, default: bool) -> bool:
+    raw = (os.getenv(name) or "").strip().lower()
+    if not raw:
+        return default
+    if raw in {"1", "true", "yes", "on"}:
+        return True
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    return default
+
+
 def _parse_csv_env(name: str, default: list[str]) -> tuple[str, ...]:
     raw = (os.getenv(name) or "").strip()
     if not raw:
@@ -26,6 +37,22 @@ def _parse_csv_env(name: str, default: list[str]) -> tuple[str, ...]:
     return values if values else tuple(default)
 
 
+def _parse_weights_env(name: str) -> dict[str, float]:
+    """Parse ``key:weight`` pairs, e.g. ``key-a:3,key-b:0.5``; bad pairs are skipped."""
+    weights: dict[str, float] = {}
+    for item in _parse_csv_env(name, default=[]):
+        key, separator, raw_weight = item.rpartition(":")
+        if not separator or not key.strip():
+            continue
+        try:
+            weight = float(raw_weight)
+        except ValueError:
+            continue
+        if weight > 0:
+            weights[key.strip()] = weight
+    return weights
+
+
 @dataclass(frozen=True)
 class Settings:
     api_keys: tuple[str, ...]
@@ -40,6 +67,23 @@ class Settings:
     theme_max_len: int = 120
     extra_prompt_max_len: int = 2000
     child_name_max_len: int = 40
+    job_executor_max_workers: int = 2
+    # Job queue backend: "memory" (default, in-process) or "sqlite" (durable)
+    job_queue_backend: str = "memory"
+    job_queue_path: Path = Path("data/jobs.sqlite3")
+    job_queue_embedded_worker: bool = True
+    job_lease_sec: int = 60
+    job_max_attempts: int = 3
+    admission_max_queued_jobs: int = 100
+    admission_max_active_jobs_per_key: int = 10
+    # Fair-share scheduling: per-API-key weights and how many TTS/illustration
+    # jobs may run at once (the remaining workers stay free for text-only jobs).
+    scheduler_key_weights: dict[str, float] = field(default_factory=dict)
+    scheduler_max_heavy_jobs: int = 1
+    # Minimum seconds between progress writes to a job's meta.json.
+    progress_write_interval_sec: int = 2
+    # Built result payloads kept in memory per process (LRU).
+    result_cache_max_entries: int = 128
     allowed_story_models: tuple[str, ...] = ("gemini-2.5-flash",)
     allowed_quiz_models: tuple[str, ...] = ("gemini-2.5-flash",)
     allowed_tts_models: tuple[str, ...] = ("gemini-2.5-flash-preview-tts",)
@@ -70,6 +114,15 @@ def get_settings() -> Settings:
     storage_backend = (os.getenv("MORETALE_STORAGE_BACKEND") or "local").strip().lower()
     gcs_bucket = (os.getenv("MORETALE_GCS_BUCKET") or "").strip()
     gcs_key_prefix = (os.getenv("MORETALE_GCS_KEY_PREFIX") or "").strip()
+    job_queue_backend = (os.getenv("MORETALE_JOB_QUEUE_BACKEND") or "memory").strip().lower()
+    # Kept outside outputs_dir, which is served as static files.
+    job_queue_override = (os.getenv("MORETALE_JOB_QUEUE_PATH") or "").strip()
+    job_queue_path = (
+        Path(job_queue_override).resolve()
+        if job_queue_override
+        else project_root / "data" / "jobs.sqlite3"
+    )
+    job_executor_max_workers = _parse_int_env("MORETALE_JOB_EXECUTOR_MAX_WORKERS", default=2)
     return Settings(
         api_keys=api_keys,
         project_root=project_root,
@@ -87,6 +140,36 @@ def get_settings() -> Settings:
             default=2000,
         ),
         child_name_max_len=_parse_int_env("MORETALE_CHILD_NAME_MAX_LEN", default=40),
+        job_executor_max_workers=job_executor_max_workers,
+        job_queue_backend=job_queue_backend,
+        job_queue_path=job_queue_path,
+        job_queue_embedded_worker=_parse_bool_env(
+            "MORETALE_JOB_QUEUE_EMBEDDED_WORKER",
+            default=True,
+        ),
+        job_lease_sec=_parse_int_env("MORETALE_JOB_LEASE_SEC", default=60),
+        job_max_attempts=_parse_int_env("MORETALE_JOB_MAX_ATTEMPTS", default=3),
+        admission_max_queued_jobs=_parse_int_env(
+            "MORETALE_ADMISSION_MAX_QUEUED_JOBS",
+            default=100,
+        ),
+        admission_max_active_jobs_per_key=_parse_int_env(
+            "MORETALE_ADMISSION_MAX_ACTIVE_JOBS_PER_KEY",
+            default=10,
+        ),
+        scheduler_key_weights=_parse_weights_env("MORETALE_SCHEDULER_KEY_WEIGHTS"),
+        scheduler_max_heavy_jobs=_parse_int_env(
+            "MORETALE_SCHEDULER_MAX_HEAVY_JOBS",
+            default=max(1, job_executor_max_workers - 1),
+        ),
+        progress_write_interval_sec=_parse_int_env(
+            "MORETALE_PROGRESS_WRITE_INTERVAL_SEC",
+            default=2,
+        ),
+        result_cache_max_entries=_parse_int_env(
+            "MORETALE_RESULT_CACHE_MAX_ENTRIES",
+            default=128,
+        ),
         allowed_story_models=_parse_csv_env(
             "MORETALE_ALLOWED_STORY_MODELS",
             default=["gemini-2.5-flash"],
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
@@ -10,9 +11,15 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+from generators.common.repair_stats import repair_stats_snapshot
+
 from app.api.stories import router as stories_router
 from app.core.auth import build_error
 from app.core.config import get_settings
+from app.services.admission import get_admission_controller
+from app.services.job_executor import shutdown_job_executor
+from app.services.job_queue import get_job_queue
+from app.services.result_cache import get_result_payload_cache
 from app.services.request_context import (
     generate_request_id,
     get_request_id,
@@ -20,6 +27,7 @@ from app.services.request_context import (
     reset_request_id,
     set_request_id,
 )
+from app.worker import QueueWorker
 
 
 def _json_safe_validation_errors(errors: Any) -> Any:
@@ -31,6 +39,23 @@ def _json_safe_validation_errors(errors: Any) -> Any:
     )
 
 
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    worker = None
+    if settings.job_queue_backend == "sqlite" and settings.job_queue_embedded_worker:
+        worker = QueueWorker(
+            queue=get_job_queue(),
+            max_concurrent_jobs=settings.job_executor_max_workers,
+            max_heavy_running=settings.scheduler_max_heavy_jobs,
+        )
+        worker.start()
+    yield
+    if worker is not None:
+        worker.stop(wait=False)
+    shutdown_job_executor(wait=False)
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     settings.outputs_dir.mkdir(parents=True, exist_ok=True)
@@ -39,6 +64,7 @@ def create_app() -> FastAPI:
     application = FastAPI(
         title="MoreTale FastAPI",
         version="0.1.0",
+        lifespan=_lifespan,
     )
     application.mount(
         settings.static_outputs_prefix,
@@ -83,8 +109,16 @@ def create_app() -> FastAPI:
             reset_request_id(token)
 
     @application.get("/healthz")
-    async def healthz() -> dict[str, str]:
-        return {"status": "ok"}
+    def healthz() -> dict[str, Any]:
+        # Liveness stays "ok" under load; callers read the saturation block.
+        # A plain def: FastAPI runs it in the threadpool, so the SQLite queue
+        # queries behind saturation() never block the event loop.
+        return {
+            "status": "ok",
+            "saturation": get_admission_controller().saturation(),
+            "repairs": repair_stats_snapshot(),
+            "result_cache": get_result_payload_cache().stats(),
+        }
 
     @application.exception_handler(HTTPException)
     async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
@@ -97,8 +131,14 @@ def create_app() -> FastAPI:
                 message=str(detail),
             )
         request_id = get_request_id()
-        headers = {"X-Request-ID": request_id} if request_id else None
-        return JSONResponse(status_code=exc.status_code, content=payload, headers=headers)
+        headers = dict(exc.headers or {})
+        if request_id:
+            headers["X-Request-ID"] = request_id
+        return JSONResponse(
+            status_code=exc.status_code,
+            content=payload,
+            headers=headers or None,
+        )
 
     @application.exception_handler(RequestValidationError)
     async def validation_exception_handler(
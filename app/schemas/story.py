@@ -6,7 +6,9 @@ from pydantic import BaseModel, Field, field_validator
 
 from app.core.config import get_settings
 
+JobPriority = Literal["low", "normal", "high"]
 JobStatus = Literal["queued", "running", "completed", "failed", "canceled"]
+StageStatus = Literal["running", "completed", "failed", "canceled"]
 AssetStatus = Literal[
     "not_requested",
     "generated",
@@ -19,21 +21,34 @@ AssetStatus = Literal[
 
 class GenerationOptions(BaseModel):
     story_model: str = Field(default="gemini-2.5-flash")
+    # Streams the story so audio and illustrations start on the first pages.
+    stream_story: bool = Field(default=False)
+    # Outline first, then this many concurrent calls each write a page range.
+    story_chunk_count: int = Field(default=1, ge=1, le=8)
     enable_quiz: bool = Field(default=False)
     quiz_model: str = Field(default="gemini-2.5-flash")
     quiz_question_count: int = Field(default=5, ge=1, le=10)
+    # Target token size of the story text sent to the quiz model.
+    quiz_context_token_budget: int | None = Field(default=None, ge=256)
+    quiz_include_secondary_text: bool = Field(default=True)
     enable_tts: bool = Field(default=False)
     tts_model: str = Field(default="gemini-2.5-flash-preview-tts")
     tts_voice: str = Field(default="Achernar")
     tts_temperature: float = Field(default=1.0)
     tts_request_interval_sec: float = Field(default=10.0)
+    tts_requests_per_minute: float | None = Field(default=None, gt=0)
+    tts_max_concurrent_requests: int = Field(default=1, ge=1, le=8)
     enable_illustration: bool = Field(default=False)
     enable_cover_illustration: bool = Field(default=True)
     illustration_model: str = Field(default="gemini-2.5-flash-image")
     illustration_aspect_ratio: str = Field(default="1:1")
     illustration_cover_aspect_ratio: str = Field(default="5:4")
     illustration_request_interval_sec: float = Field(default=1.0)
+    illustration_max_concurrent_requests: int = Field(default=1, ge=1, le=8)
     illustration_skip_existing: bool = Field(default=True)
+    adaptive_rate_control: bool = Field(default=False)
+    # Orders jobs within the submitting API key's own fair share.
+    priority: JobPriority = Field(default="normal")
 
     @field_validator("story_model")
     @classmethod
@@ -162,6 +177,21 @@ class ErrorResponse(BaseModel):
     error: StoryError
 
 
+class StageProgressResponse(BaseModel):
+    status: StageStatus = "running"
+    total: int | None = None
+    completed: int = 0
+    failed: int = 0
+    remaining: int | None = None
+    eta_sec: float | None = None
+
+
+class JobProgressResponse(BaseModel):
+    stages: dict[str, StageProgressResponse] = Field(default_factory=dict)
+    eta_sec: float | None = None
+    updated_at: str | None = None
+
+
 class StoryStatusResponse(BaseModel):
     id: str
     status: JobStatus
@@ -170,6 +200,7 @@ class StoryStatusResponse(BaseModel):
     request: dict[str, Any]
     result: dict[str, Any] | None = None
     error: StoryError | None = None
+    progress: JobProgressResponse | None = None
 
 
 class VocabularyPronunciationResponse(BaseModel):
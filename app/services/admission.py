@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+
+from app.core.config import get_settings
+from app.services.job_queue import DURATION_SAMPLE_SIZE, get_job_queue
+
+_DEFAULT_JOB_DURATION_SEC = 60.0
+_MAX_RETRY_AFTER_SEC = 3600
+
+
+def owner_key(api_key: str) -> str:
+    # Queue rows and logs only ever see a digest of the API key.
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class JobLoadSource(Protocol):
+    def load(self, owner: str | None = None) -> tuple[int, int]: ...
+
+    def average_duration_sec(self) -> float | None: ...
+
+
+class JobLoadTracker:
+    """In-process queued/running counts for the in-memory job backend."""
+
+    def __init__(self, monotonic_fn: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._monotonic_fn = monotonic_fn
+        self._owners: dict[str, str] = {}
+        self._started_at: dict[str, float] = {}
+        self._durations: deque[float] = deque(maxlen=DURATION_SAMPLE_SIZE)
+
+    def add(self, story_id: str, owner: str) -> None:
+        with self._lock:
+            self._owners[story_id] = owner
+
+    def mark_running(self, story_id: str) -> None:
+        with self._lock:
+            if story_id in self._owners:
+                self._started_at[story_id] = self._monotonic_fn()
+
+    def finish(self, story_id: str) -> None:
+        with self._lock:
+            self._owners.pop(story_id, None)
+            started_at = self._started_at.pop(story_id, None)
+            if started_at is not None:
+                self._durations.append(self._monotonic_fn() - started_at)
+
+    def load(self, owner: str | None = None) -> tuple[int, int]:
+        with self._lock:
+            story_ids = [
+                story_id
+                for story_id, story_owner in self._owners.items()
+                if owner is None or story_owner == owner
+            ]
+            running = sum(1 for story_id in story_ids if story_id in self._started_at)
+        return len(story_ids) - running, running
+
+    def average_duration_sec(self) -> float | None:
+        with self._lock:
+            if not self._durations:
+                return None
+            return sum(self._durations) / len(self._durations)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._owners.clear()
+            self._started_at.clear()
+            self._durations.clear()
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    allowed: bool
+    status_code: int = 0
+    code: str = ""
+    message: str = ""
+    retry_after_sec: int = 0
+    detail: dict[str, Any] | None = None
+
+
+class AdmissionController:
+    """Global and per-key caps on outstanding jobs, with a computed Retry-After.
+
+    The wait estimate assumes ``workers`` jobs finish every average job
+    duration, so N jobs ahead take about ``ceil(N / workers)`` durations.
+    """
+
+    def __init__(
+        self,
+        source: JobLoadSource,
+        max_queued_jobs: int,
+        max_active_jobs_per_key: int,
+        workers: int,
+    ) -> None:
+        self.source = source
+        self.max_queued_jobs = max_queued_jobs
+        self.max_active_jobs_per_key = max_active_jobs_per_key
+        self.workers = max(1, workers)
+
+    def _estimate_wait_sec(self, jobs_ahead: int) -> int:
+        duration = self.source.average_duration_sec() or _DEFAULT_JOB_DURATION_SEC
+        rounds = max(1, math.ceil(jobs_ahead / self.workers))
+        return max(1, min(_MAX_RETRY_AFTER_SEC, math.ceil(rounds * duration)))
+
+    def check(self, owner: str) -> AdmissionDecision:
+        queued, running = self.source.load()
+        if queued >= self.max_queued_jobs:
+            return AdmissionDecision(
+                allowed=False,
+                status_code=503,
+                code="SERVER_SATURATED",
+                message="job queue is full",
+                retry_after_sec=self._estimate_wait_sec(queued - self.max_queued_jobs + 1),
+                detail={"queued": queued, "max_queued_jobs": self.max_queued_jobs},
+            )
+
+        owner_queued, owner_running = self.source.load(owner=owner)
+        owner_active = owner_queued + owner_running
+        if owner_active >= self.max_active_jobs_per_key:
+            # A slot frees up when one of the key's jobs finishes: about one
+            # round if one is already running, else once the queue drains.
+            jobs_ahead = 1 if owner_running else queued
+            return AdmissionDecision(
+                allowed=False,
+                status_code=429,
+                code="TOO_MANY_ACTIVE_JOBS",
+                message="too many active jobs for this API key",
+                retry_after_sec=self._estimate_wait_sec(jobs_ahead),
+                detail={
+                    "active": owner_active,
+                    "max_active_jobs_per_key": self.max_active_jobs_per_key,
+                },
+            )
+        return AdmissionDecision(allowed=True)
+
+    def saturation(self) -> dict[str, Any]:
+        queued, running = self.source.load()
+        return {
+            "queued": queued,
+            "running": running,
+            "workers": self.workers,
+            "max_queued_jobs": self.max_queued_jobs,
+            "queue_utilization": (
+                round(queued / self.max_queued_jobs, 3) if self.max_queued_jobs > 0 else None
+            ),
+            "saturated": queued >= self.max_queued_jobs,
+            "estimated_wait_sec": self._estimate_wait_sec(queued + 1) if queued else 0,
+        }
+
+
+job_load_tracker = JobLoadTracker()
+
+
+def get_admission_controller() -> AdmissionController:
+    settings = get_settings()
+    if settings.job_queue_backend == "sqlite":
+        source: JobLoadSource = get_job_queue()
+    else:
+        source = job_load_tracker
+    return AdmissionController(
+        source=source,
+        max_queued_jobs=settings.admission_max_queued_jobs,
+        max_active_jobs_per_key=settings.admission_max_active_jobs_per_key,
+        workers=settings.job_executor_max_workers,
+    )
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
 
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.common.progress import ProgressCallback, report_progress
 from generators.quiz.quiz_model import Quiz
 from generators.story.story_model import Story
+from generators.story.story_stream import StoryPageFeed
 
 from app.schemas.story import StoryCreateRequest
 
@@ -27,21 +31,31 @@ class StoryPipelineRequest:
     extra_prompt: str = ""
     include_style_guide: bool = True
     story_model: str = "gemini-2.5-flash"
+    stream_story: bool = False
+    story_chunk_count: int = 1
     enable_quiz: bool = False
     quiz_model: str = "gemini-2.5-flash"
     quiz_question_count: int = 5
+    quiz_context_token_budget: int | None = None
+    quiz_include_secondary_text: bool = True
     enable_tts: bool = False
     tts_model: str = "gemini-2.5-flash-preview-tts"
     tts_voice: str = "Achernar"
     tts_temperature: float = 1.0
     tts_request_interval_sec: float = 10.0
+    tts_requests_per_minute: float | None = None
+    tts_max_concurrent_requests: int = 1
     enable_illustration: bool = False
     enable_cover_illustration: bool = True
     illustration_model: str = "gemini-2.5-flash-image"
     illustration_aspect_ratio: str = "1:1"
     illustration_cover_aspect_ratio: str = "5:4"
     illustration_request_interval_sec: float = 1.0
+    illustration_max_concurrent_requests: int = 1
     illustration_skip_existing: bool = True
+    adaptive_rate_control: bool = False
+    cancel_token: CancellationToken | None = field(default=None, compare=False, repr=False)
+    progress_callback: ProgressCallback | None = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "include_style_guide", True)
@@ -72,25 +86,38 @@ def build_pipeline_request_from_story_request(
         extra_prompt=request.extra_prompt,
         include_style_guide=True,
         story_model=request.generation.story_model,
+        stream_story=request.generation.stream_story,
+        story_chunk_count=request.generation.story_chunk_count,
         enable_quiz=request.generation.enable_quiz,
         quiz_model=request.generation.quiz_model,
         quiz_question_count=request.generation.quiz_question_count,
+        quiz_context_token_budget=request.generation.quiz_context_token_budget,
+        quiz_include_secondary_text=request.generation.quiz_include_secondary_text,
         enable_tts=request.generation.enable_tts,
         tts_model=request.generation.tts_model,
         tts_voice=request.generation.tts_voice,
         tts_temperature=request.generation.tts_temperature,
         tts_request_interval_sec=request.generation.tts_request_interval_sec,
+        tts_requests_per_minute=request.generation.tts_requests_per_minute,
+        tts_max_concurrent_requests=request.generation.tts_max_concurrent_requests,
         enable_illustration=request.generation.enable_illustration,
         enable_cover_illustration=request.generation.enable_cover_illustration,
         illustration_model=request.generation.illustration_model,
         illustration_aspect_ratio=request.generation.illustration_aspect_ratio,
         illustration_cover_aspect_ratio=request.generation.illustration_cover_aspect_ratio,
         illustration_request_interval_sec=request.generation.illustration_request_interval_sec,
+        illustration_max_concurrent_requests=(
+            request.generation.illustration_max_concurrent_requests
+        ),
         illustration_skip_existing=request.generation.illustration_skip_existing,
+        adaptive_rate_control=request.generation.adaptive_rate_control,
     )
 
 
-def generate_story(request: StoryPipelineRequest) -> tuple[Story, str]:
+def generate_story(
+    request: StoryPipelineRequest,
+    page_feed: StoryPageFeed | None = None,
+) -> tuple[Story, str]:
     from generators.story.story_generator import StoryGenerator
 
     generator = StoryGenerator(
@@ -104,6 +131,9 @@ def generate_story(request: StoryPipelineRequest) -> tuple[Story, str]:
         secondary_lang=request.secondary_lang,
         theme=request.theme,
         extra_prompt=request.extra_prompt,
+        page_feed=page_feed,
+        chunk_count=request.story_chunk_count,
+        cancel_token=request.cancel_token,
     )
     return story, generator.model_name
 
@@ -115,7 +145,11 @@ def generate_quiz(
 ) -> tuple[Quiz, str]:
     from generators.quiz.quiz_generator import QuizGenerator
 
-    generator = QuizGenerator(model_name=request.quiz_model)
+    generator = QuizGenerator(
+        model_name=request.quiz_model,
+        context_token_budget=request.quiz_context_token_budget,
+        include_secondary_text=request.quiz_include_secondary_text,
+    )
     quiz = generator.generate_quiz(
         story_id=story_id,
         story=story,
@@ -126,7 +160,7 @@ def generate_quiz(
 
 def generate_tts(
     request: StoryPipelineRequest,
-    story: Story,
+    story: Story | StoryPageFeed,
     output_dir: str | Path,
 ) -> dict[str, Any]:
     from generators.tts.tts_generator import TTSGenerator
@@ -141,6 +175,9 @@ def generate_tts(
         voice_name=request.tts_voice,
         temperature=request.tts_temperature,
         request_interval_sec=request.tts_request_interval_sec,
+        requests_per_minute=request.tts_requests_per_minute,
+        max_concurrent_requests=request.tts_max_concurrent_requests,
+        adaptive_rate_control=request.adaptive_rate_control,
     )
     return generator.generate_book_audio(
         story=story,
@@ -148,12 +185,14 @@ def generate_tts(
         primary_language=request.primary_lang,
         secondary_language=request.secondary_lang,
         skip_existing=True,
+        cancel_token=request.cancel_token,
+        progress_callback=request.progress_callback,
     )
 
 
 def generate_illustrations(
     request: StoryPipelineRequest,
-    story: Story,
+    story: Story | StoryPageFeed,
     output_dir: str | Path,
 ) -> dict[str, Any]:
     from generators.illustration.illustration_pipeline import IllustrationGenerator
@@ -168,12 +207,16 @@ def generate_illustrations(
         aspect_ratio=request.illustration_aspect_ratio,
         cover_aspect_ratio=request.illustration_cover_aspect_ratio,
         request_interval_sec=request.illustration_request_interval_sec,
+        max_concurrent_requests=request.illustration_max_concurrent_requests,
+        adaptive_rate_control=request.adaptive_rate_control,
     )
     return generator.generate_from_story(
         story=story,
         output_dir=str(output_dir),
         skip_existing=request.illustration_skip_existing,
         generate_cover=request.enable_cover_illustration,
+        cancel_token=request.cancel_token,
+        progress_callback=request.progress_callback,
     )
 
 
@@ -224,62 +267,270 @@ def _raise_on_illustration_failures(illustration_result: dict[str, Any]) -> None
     raise RuntimeError("Illustration generation failed.")
 
 
+@dataclass(frozen=True)
+class _AssetStage:
+    name: str
+    run: Callable[[], Any]
+    depends_on: tuple[str, ...] = ()
+
+
+def _report_stage(
+    request: StoryPipelineRequest,
+    stage: str,
+    run: Callable[[], Any],
+) -> Callable[[], Any]:
+    def run_and_report() -> Any:
+        report_progress(request.progress_callback, "stage.start", stage=stage)
+        try:
+            result = run()
+        except GenerationCanceled:
+            report_progress(request.progress_callback, "stage.end", stage=stage, status="canceled")
+            raise
+        except Exception as error:
+            report_progress(
+                request.progress_callback,
+                "stage.end",
+                stage=stage,
+                status="failed",
+                error=str(error),
+            )
+            raise
+        report_progress(request.progress_callback, "stage.end", stage=stage, status="completed")
+        return result
+
+    return run_and_report
+
+
+def _raise_if_canceled(request: StoryPipelineRequest) -> None:
+    if request.cancel_token is not None:
+        request.cancel_token.raise_if_canceled()
+
+
+def _run_stage_graph(
+    stages: list[_AssetStage],
+    *,
+    stop_on_error: bool,
+    cancel_token: CancellationToken | None = None,
+    on_stop: Callable[[], None] | None = None,
+) -> tuple[dict[str, Any], dict[str, BaseException]]:
+    """Run stages concurrently, starting each one once its dependencies succeed.
+
+    A failing stage never affects independent stages; its dependents are
+    skipped with the same error. No new stage is started once ``cancel_token``
+    fires. With ``stop_on_error`` the first failure fires ``cancel_token`` (the
+    stages must share it) and ``on_stop``, then waits for the running stages
+    to wind down, so none of them still writes once this returns.
+    """
+    results: dict[str, Any] = {}
+    errors: dict[str, BaseException] = {}
+    pending = {stage.name: stage for stage in stages}
+    running: dict[Future, str] = {}
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, len(stages)),
+        thread_name_prefix="moretale-stage",
+    )
+    try:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                failed_dependency = next(
+                    (dependency for dependency in stage.depends_on if dependency in errors),
+                    None,
+                )
+                if failed_dependency is not None:
+                    errors[name] = errors[failed_dependency]
+                    del pending[name]
+                    continue
+                if cancel_token is not None and cancel_token.is_canceled:
+                    del pending[name]
+                    continue
+                if all(dependency in results for dependency in stage.depends_on):
+                    running[executor.submit(stage.run)] = name
+                    del pending[name]
+
+            if not running:
+                if pending:
+                    unresolved = ", ".join(sorted(pending))
+                    raise RuntimeError(f"asset stages have unresolved dependencies: {unresolved}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    errors[name] = error
+                else:
+                    results[name] = future.result()
+            if stop_on_error and errors:
+                if cancel_token is not None:
+                    cancel_token.cancel()
+                if on_stop is not None:
+                    on_stop()
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return results, errors
+
+
 def run_story_generation_pipeline(
     request: StoryPipelineRequest,
     output_dir_factory: Callable[[Story, str], str | Path],
     *,
     strict_assets: bool,
+    existing_story: tuple[Story, str] | None = None,
+    output_dir: str | Path | None = None,
 ) -> StoryPipelineResult:
-    story, story_model = generate_story(request)
-    output_dir = Path(output_dir_factory(story, story_model))
-    story_json_path = write_story_json_to_output_dir(output_dir, story, story_model)
-
+    _raise_if_canceled(request)
     service_errors: dict[str, str | None] = {"quiz": None, "tts": None, "illustrations": None}
-    quiz_result: Quiz | None = None
-    quiz_json_path: Path | None = None
-    tts_result: dict[str, Any] | None = None
-    illustration_result: dict[str, Any] | None = None
+    stages: list[_AssetStage] = []
+    # Stages get their own token: it fires with the job's, and in strict mode
+    # also on the first stage failure, which must not look like a user cancel.
+    stage_token = (
+        request.cancel_token.child() if request.cancel_token is not None else CancellationToken()
+    )
+    stage_request = replace(request, cancel_token=stage_token)
+
+    # Streaming needs the run directory before the story exists, and only
+    # pays off when audio or illustrations can start on the early pages.
+    page_feed: StoryPageFeed | None = None
+    if (
+        request.stream_story
+        and output_dir is not None
+        and existing_story is None
+        and (request.enable_tts or request.enable_illustration)
+    ):
+        page_feed = StoryPageFeed()
+        output_dir = Path(output_dir)
+
+        def run_story_stage() -> tuple[Story, str, Path]:
+            # Always close the feed, even if the generator failed before it
+            # started streaming, so the consuming stages never wait forever.
+            try:
+                streamed_story, streamed_model = generate_story(
+                    stage_request, page_feed=page_feed
+                )
+            except BaseException as error:
+                page_feed.fail(error)
+                raise
+            page_feed.finish(streamed_story)
+            return (
+                streamed_story,
+                streamed_model,
+                write_story_json_to_output_dir(output_dir, streamed_story, streamed_model),
+            )
 
+        stages.append(
+            _AssetStage(name="story", run=_report_stage(request, "story", run_story_stage))
+        )
+        story_for_assets: Story | StoryPageFeed = page_feed
+    else:
+        # A resumed job keeps its earlier story so already rendered audio and
+        # illustrations (reused via skip_existing) still match the text.
+        story, story_model = existing_story or _report_stage(
+            request, "story", lambda: generate_story(request)
+        )()
+        output_dir = Path(output_dir_factory(story, story_model))
+        story_json_path = write_story_json_to_output_dir(output_dir, story, story_model)
+        _raise_if_canceled(request)
+        story_for_assets = story
+    story_dependency = ("story",) if page_feed is not None else ()
+
+    def run_quiz_stage() -> tuple[Quiz, Path]:
+        _raise_if_canceled(stage_request)
+        quiz, quiz_model = generate_quiz(
+            request=stage_request,
+            story_id=output_dir.name,
+            story=page_feed.story if page_feed is not None else story,
+        )
+        quiz_path = write_quiz_json_to_output_dir(
+            output_dir=output_dir,
+            quiz=quiz,
+            quiz_model=quiz_model,
+        )
+        return quiz, quiz_path
+
+    def run_tts_stage() -> dict[str, Any]:
+        result = generate_tts(request=stage_request, story=story_for_assets, output_dir=output_dir)
+        if strict_assets:
+            _raise_on_tts_failures(result)
+        return result
+
+    def run_illustration_stage() -> dict[str, Any]:
+        result = generate_illustrations(
+            request=stage_request,
+            story=story_for_assets,
+            output_dir=output_dir,
+        )
+        if strict_assets:
+            _raise_on_illustration_failures(result)
+        return result
+
+    # Asset stages only need the story, so they run side by side and total
+    # latency tracks the slowest. When streaming, audio and illustrations
+    # consume pages while the story stage is still writing them; the quiz
+    # needs the whole story and waits for that stage.
     if request.enable_quiz:
-        try:
-            quiz_result, quiz_model = generate_quiz(
-                request=request,
-                story_id=output_dir.name,
-                story=story,
-            )
-            quiz_json_path = write_quiz_json_to_output_dir(
-                output_dir=output_dir,
-                quiz=quiz_result,
-                quiz_model=quiz_model,
+        stages.append(
+            _AssetStage(
+                name="quiz",
+                run=_report_stage(request, "quiz", run_quiz_stage),
+                depends_on=story_dependency,
             )
-        except Exception as error:
-            if strict_assets:
-                raise
-            service_errors["quiz"] = str(error)
-
+        )
     if request.enable_tts:
-        try:
-            tts_result = generate_tts(request=request, story=story, output_dir=output_dir)
-            if strict_assets:
-                _raise_on_tts_failures(tts_result)
-        except Exception as error:
-            if strict_assets:
-                raise
-            service_errors["tts"] = str(error)
-
+        stages.append(
+            _AssetStage(name="tts", run=_report_stage(request, "tts", run_tts_stage))
+        )
     if request.enable_illustration:
-        try:
-            illustration_result = generate_illustrations(
-                request=request,
-                story=story,
-                output_dir=output_dir,
+        stages.append(
+            _AssetStage(
+                name="illustrations",
+                run=_report_stage(request, "illustrations", run_illustration_stage),
             )
-            if strict_assets:
-                _raise_on_illustration_failures(illustration_result)
-        except Exception as error:
-            if strict_assets:
-                raise
-            service_errors["illustrations"] = str(error)
+        )
+
+    stage_results, stage_errors = _run_stage_graph(
+        stages,
+        stop_on_error=strict_assets,
+        cancel_token=stage_token,
+        # Stages blocked on streamed pages would otherwise wait for the story.
+        on_stop=(
+            (lambda: page_feed.fail(GenerationCanceled("generation canceled")))
+            if page_feed is not None
+            else None
+        ),
+    )
+    # Stages write their partial manifests before returning, so by now there
+    # is nothing left to flush; a cancel simply ends the pipeline here. A
+    # strict-mode failure only cancels ``stage_token``, never the job's token.
+    _raise_if_canceled(request)
+    if strict_assets and stage_errors:
+        # Siblings stopped by the stage token report GenerationCanceled;
+        # the failure that stopped them is the one worth raising.
+        failures = [
+            error for error in stage_errors.values() if not isinstance(error, GenerationCanceled)
+        ]
+        raise (failures or list(stage_errors.values()))[0]
+    for error in stage_errors.values():
+        if isinstance(error, GenerationCanceled):
+            raise error
+    if page_feed is not None:
+        # Without a story there is no result, whatever the asset stages did.
+        if "story" in stage_errors:
+            raise stage_errors["story"]
+        story, story_model, story_json_path = stage_results["story"]
+
+    for stage in stages:
+        error = stage_errors.get(stage.name)
+        if error is not None:
+            service_errors[stage.name] = str(error)
+
+    quiz_result: Quiz | None = None
+    quiz_json_path: Path | None = None
+    if "quiz" in stage_results:
+        quiz_result, quiz_json_path = stage_results["quiz"]
 
     return StoryPipelineResult(
         story=story,
@@ -288,7 +539,7 @@ def run_story_generation_pipeline(
         story_json_path=story_json_path,
         quiz_json_path=quiz_json_path,
         quiz_result=quiz_result,
-        tts_result=tts_result,
-        illustration_result=illustration_result,
+        tts_result=stage_results.get("tts"),
+        illustration_result=stage_results.get("illustrations"),
         service_errors=service_errors,
     )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+
+from app.services.job_events import TERMINAL_STATUSES
+
+# Non-terminal jobs change at any moment: clients must revalidate every poll,
+# which costs a 304 while nothing changed. Terminal jobs only change on rerun.
+ACTIVE_CACHE_CONTROL = "private, no-cache"
+TERMINAL_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
+
+@dataclass(frozen=True)
+class ConditionalResult:
+    """A response body with its validators; ``body`` is None when the client's copy is current."""
+
+    etag: str
+    cache_control: str
+    body: Any = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
+
+
+def build_etag(*parts: Any) -> str:
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return f'"{hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def cache_control_for(job_status: str) -> str:
+    return TERMINAL_CACHE_CONTROL if job_status in TERMINAL_STATUSES else ACTIVE_CACHE_CONTROL
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` check with the weak comparison RFC 9110 requires for GET."""
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
+
+def apply_conditional(
+    result: ConditionalResult,
+    response: Response,
+    include: dict[str, Any] | None = None,
+) -> Any:
+    """Set the validator headers; return the body, or a bare 304 when it is unchanged.
+
+    ``include`` trims the body model to the selected fields.
+    """
+    headers = {"ETag": result.etag, "Cache-Control": result.cache_control}
+    if result.not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if include is not None:
+        return JSONResponse(
+            content=result.body.model_dump(mode="json", include=include),
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return result.body
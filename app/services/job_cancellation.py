@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from generators.common.cancellation import CancellationToken
+
+
+class JobCancellationRegistry:
+    """Cancellation tokens of the jobs running in this process, by story id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: dict[str, CancellationToken] = {}
+
+    def register(self, story_id: str) -> CancellationToken:
+        token = CancellationToken()
+        with self._lock:
+            self._tokens[story_id] = token
+        return token
+
+    def cancel(self, story_id: str) -> bool:
+        with self._lock:
+            token = self._tokens.get(story_id)
+        if token is None:
+            return False
+        token.cancel()
+        return True
+
+    def release(self, story_id: str, token: CancellationToken) -> None:
+        with self._lock:
+            if self._tokens.get(story_id) is token:
+                del self._tokens[story_id]
+
+
+def watch_for_cancellation(
+    token: CancellationToken,
+    is_canceled_fn: Callable[[], bool],
+    interval_sec: float,
+) -> threading.Event:
+    """Poll ``is_canceled_fn`` and fire ``token`` once it reports a cancel.
+
+    Covers cancels handled by another worker process, which cannot reach this
+    process's registry. Set the returned event to stop polling.
+    """
+    stop_event = threading.Event()
+
+    def poll() -> None:
+        while not stop_event.wait(interval_sec):
+            try:
+                canceled = is_canceled_fn()
+            except Exception:
+                continue
+            if canceled:
+                token.cancel()
+                return
+
+    threading.Thread(target=poll, name="moretale-cancel-watch", daemon=True).start()
+    return stop_event
+
+
+job_cancellation_registry = JobCancellationRegistry()
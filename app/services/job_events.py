@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "canceled"})
+_HISTORY_SIZE = 512
+_MAX_CHANNELS = 256
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    id: int
+    type: str
+    data: dict[str, Any]
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.type == "status" and self.data.get("status") in TERMINAL_STATUSES
+
+
+class JobEventSubscription:
+    """One listener's view of a story channel, consumed on the event loop."""
+
+    def __init__(self, broker: JobEventBroker, story_id: str) -> None:
+        self._broker = broker
+        self.story_id = story_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[JobEvent] = asyncio.Queue()
+
+    def _deliver(self, event: JobEvent) -> None:
+        # Publishers run on job worker threads; hand over to the loop.
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The listener's loop is gone (e.g. server shutdown); nobody can
+            # read this event, so drop it along with the subscription.
+            self.close()
+
+    async def get(self, timeout: float) -> JobEvent | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+
+@dataclass
+class _Channel:
+    history: deque[JobEvent] = field(default_factory=lambda: deque(maxlen=_HISTORY_SIZE))
+    subscribers: list[JobEventSubscription] = field(default_factory=list)
+
+
+class JobEventBroker:
+    """In-process pub/sub of job progress events, keyed by story id.
+
+    Each story keeps a bounded history so a client that connects (or
+    reconnects with ``Last-Event-ID``) after a job started still sees what it
+    missed. Only the most recent ``max_channels`` stories are retained.
+    """
+
+    def __init__(self, max_channels: int = _MAX_CHANNELS) -> None:
+        self._lock = threading.Lock()
+        self._channels: OrderedDict[str, _Channel] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._max_channels = max_channels
+
+    def _channel(self, story_id: str) -> _Channel:
+        # Called with self._lock held.
+        channel = self._channels.get(story_id)
+        if channel is None:
+            channel = self._channels[story_id] = _Channel()
+            while len(self._channels) > self._max_channels:
+                oldest_id = next(iter(self._channels))
+                if self._channels[oldest_id].subscribers:
+                    self._channels.move_to_end(oldest_id)
+                    break
+                del self._channels[oldest_id]
+        else:
+            self._channels.move_to_end(story_id)
+        return channel
+
+    def publish(self, story_id: str, event_type: str, data: dict[str, Any]) -> JobEvent:
+        with self._lock:
+            event = JobEvent(id=next(self._ids), type=event_type, data=data)
+            channel = self._channel(story_id)
+            channel.history.append(event)
+            subscribers = list(channel.subscribers)
+        for subscription in subscribers:
+            subscription._deliver(event)
+        return event
+
+    def publish_status(self, story_id: str, meta: dict[str, Any]) -> JobEvent:
+        return self.publish(
+            story_id,
+            "status",
+            {
+                "id": story_id,
+                "status": meta.get("status"),
+                "updated_at": meta.get("updated_at"),
+                "error": meta.get("error"),
+            },
+        )
+
+    def subscribe(
+        self,
+        story_id: str,
+        last_event_id: int = 0,
+    ) -> tuple[JobEventSubscription, list[JobEvent]]:
+        """Return a live subscription plus the history newer than ``last_event_id``."""
+        subscription = JobEventSubscription(self, story_id)
+        with self._lock:
+            channel = self._channel(story_id)
+            backlog = [event for event in channel.history if event.id > last_event_id]
+            channel.subscribers.append(subscription)
+        return subscription, backlog
+
+    def _unsubscribe(self, subscription: JobEventSubscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.story_id)
+            if channel is not None and subscription in channel.subscribers:
+                channel.subscribers.remove(subscription)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._channels.clear()
+
+
+job_event_broker = JobEventBroker()
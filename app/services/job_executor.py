@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.core.config import get_settings
+from app.services.admission import owner_key
+from app.services.job_scheduler import FairShareQueue, JobSpec
+
+
+@dataclass
+class _QueuedJob:
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    spec: JobSpec = field(default_factory=JobSpec)
+    future: Future = field(default_factory=Future)
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+
+class JobExecutor:
+    """Bounded pool of worker threads fed by an in-process fair-share queue.
+
+    Generation jobs are long and fully synchronous (blocking SDK calls and
+    rate-limit sleeps), so they must never run on the event loop. Jobs
+    submitted without a ``JobSpec`` share one owner and run in FIFO order.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        thread_name_prefix: str = "moretale-job",
+        job_queue: FairShareQueue | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0.")
+        self.max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._queue = job_queue or FairShareQueue()
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+        self._running = 0
+        self._shutdown = False
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running_count(self) -> int:
+        with self._lock:
+            return self._running
+
+    def submit(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return self.submit_job(JobSpec(), func, *args, **kwargs)
+
+    def submit_job(
+        self,
+        spec: JobSpec,
+        func: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future:
+        job = _QueuedJob(func=func, args=args, kwargs=kwargs, spec=spec)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit a job after the executor has shut down")
+            self._queue.put(job, spec)
+            self._ensure_workers()
+        return job.future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            workers = list(self._workers)
+        # Workers drain what is already queued, then exit.
+        self._queue.close()
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _ensure_workers(self) -> None:
+        # Called with self._lock held. Workers are started lazily so that
+        # importing the app (or running tests) does not spawn idle threads.
+        if len(self._workers) >= self.max_workers:
+            return
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"{self._thread_name_prefix}-{len(self._workers) + 1}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                with self._lock:
+                    self._running += 1
+                try:
+                    result = job.context.run(job.func, *job.args, **job.kwargs)
+                except BaseException as error:
+                    job.future.set_exception(error)
+                else:
+                    job.future.set_result(result)
+                finally:
+                    with self._lock:
+                        self._running -= 1
+            finally:
+                self._queue.done(job.spec)
+
+
+_executor: JobExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_job_executor() -> JobExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor = JobExecutor(
+                max_workers=settings.job_executor_max_workers,
+                job_queue=FairShareQueue(
+                    weights={
+                        owner_key(api_key): weight
+                        for api_key, weight in settings.scheduler_key_weights.items()
+                    },
+                    max_heavy_running=settings.scheduler_max_heavy_jobs,
+                ),
+            )
+        return _executor
+
+
+def shutdown_job_executor(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        executor.shutdown(wait=wait)
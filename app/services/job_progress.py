@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class _StageProgress:
+    status: str = "running"
+    total: int | None = None
+    completed: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+
+    def eta_sec(self, now: float) -> float | None:
+        done = self.completed + self.failed
+        if self.status != "running" or self.total is None or done == 0:
+            return None
+        remaining = max(0, self.total - done)
+        return round((now - self.started_at) / done * remaining, 1)
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        done = self.completed + self.failed
+        return {
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "remaining": max(0, self.total - done) if self.total is not None else None,
+            "eta_sec": self.eta_sec(now),
+        }
+
+
+class JobProgressTracker:
+    """Coalesces per-task progress events into throttled job metadata writes.
+
+    Task events only mark the snapshot dirty; it is written at most once per
+    ``min_interval_sec``. Stage boundaries and ``flush`` always write, so the
+    counts on disk are exact whenever a stage starts or ends.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[dict[str, Any]], Any],
+        min_interval_sec: float = 2.0,
+        monotonic_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._write_fn = write_fn
+        self._min_interval_sec = min_interval_sec
+        self._monotonic_fn = monotonic_fn
+        self._lock = threading.Lock()
+        self._stages: dict[str, _StageProgress] = {}
+        self._last_write_at: float | None = None
+        self._dirty = False
+
+    def observe(self, event: dict[str, Any]) -> None:
+        event_type = event.get("event")
+        stage_name = str(event.get("stage") or "")
+        if not stage_name:
+            return
+        with self._lock:
+            now = self._monotonic_fn()
+            stage = self._stages.get(stage_name)
+            if stage is None:
+                stage = self._stages[stage_name] = _StageProgress(started_at=now)
+            force = False
+            if event_type == "stage.start":
+                stage.status = "running"
+                stage.started_at = now
+                force = True
+            elif event_type == "stage.end":
+                stage.status = str(event.get("status") or "completed")
+                force = True
+            elif event_type == "tasks.planned":
+                stage.total = int(event.get("total") or 0)
+            elif event_type == "task":
+                if event.get("status") == "failed":
+                    stage.failed += 1
+                else:
+                    stage.completed += 1
+            else:
+                return
+            self._dirty = True
+            if force or self._due(now):
+                self._write(now)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._write(self._monotonic_fn())
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return self._build_snapshot(self._monotonic_fn())
+
+    def _due(self, now: float) -> bool:
+        return self._last_write_at is None or now - self._last_write_at >= self._min_interval_sec
+
+    def _build_snapshot(self, now: float) -> dict[str, Any]:
+        stages = {name: stage.to_dict(now) for name, stage in self._stages.items()}
+        # Stages run side by side, so the job finishes with its slowest one.
+        etas = [stage["eta_sec"] for stage in stages.values() if stage["eta_sec"] is not None]
+        return {"stages": stages, "eta_sec": max(etas) if etas else None}
+
+    def _write(self, now: float) -> None:
+        # Called with self._lock held so snapshots land on disk in order.
+        self._write_fn(self._build_snapshot(now))
+        self._last_write_at = now
+        self._dirty = False
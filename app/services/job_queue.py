@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping
+
+from app.core.config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    story_id TEXT PRIMARY KEY,
+    request_payload TEXT NOT NULL,
+    request_id TEXT,
+    owner TEXT NOT NULL DEFAULT '',
+    priority INTEGER NOT NULL DEFAULT 1,
+    heavy INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 1.0,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    heartbeat_at REAL,
+    started_at REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state_enqueued ON jobs (state, enqueued_at);
+"""
+_ADDED_COLUMNS = {
+    "owner": "TEXT NOT NULL DEFAULT ''",
+    "started_at": "REAL",
+    "priority": "INTEGER NOT NULL DEFAULT 1",
+    "heavy": "INTEGER NOT NULL DEFAULT 0",
+    "cost": "REAL NOT NULL DEFAULT 1.0",
+}
+# Recent completed jobs averaged into the expected job duration.
+DURATION_SAMPLE_SIZE = 20
+
+STATE_QUEUED = "queued"
+STATE_LEASED = "leased"
+STATE_DONE = "done"
+STATE_DEAD = "dead"
+
+
+@dataclass(frozen=True)
+class LeasedJob:
+    story_id: str
+    request_payload: dict[str, Any]
+    request_id: str | None
+    attempts: int
+    lease_owner: str
+
+    @property
+    def is_retry(self) -> bool:
+        return self.attempts > 1
+
+
+@dataclass(frozen=True)
+class RecoveryResult:
+    requeued: list[str]
+    exhausted: list[str]
+
+
+class SQLiteJobQueue:
+    """Durable job queue on a single SQLite file in WAL mode.
+
+    Workers claim jobs under a lease and extend it with heartbeats. A lease
+    that is not renewed (crashed worker, killed deploy) expires and the job
+    becomes claimable again, until ``max_attempts`` claims have been spent.
+    Claims go to the owner whose running jobs cost the least relative to its
+    weight (the same ``cost / weight`` share ``FairShareQueue`` charges), then
+    by priority and arrival, so one API key cannot monopolise the workers.
+    Timestamps are wall-clock so leases stay meaningful across restarts.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        lease_sec: float = 60.0,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+        weights: Mapping[str, float] | None = None,
+    ) -> None:
+        if lease_sec <= 0:
+            raise ValueError("lease_sec must be greater than 0.")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.db_path = Path(db_path)
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._weights = dict(weights or {})
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            # WAL lets the API process enqueue while workers hold write leases.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            existing = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writes open explicit BEGIN IMMEDIATE transactions.
+        connection = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.create_function("owner_weight", 1, self._owner_weight, deterministic=True)
+        return connection
+
+    def _owner_weight(self, owner: str) -> float:
+        weight = self._weights.get(owner, 1.0)
+        return weight if weight > 0 else 1.0
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def enqueue(
+        self,
+        story_id: str,
+        request_payload: dict[str, Any],
+        request_id: str | None = None,
+        owner: str = "",
+        priority: int = 1,
+        heavy: bool = False,
+        cost: float = 1.0,
+    ) -> None:
+        now = self._clock()
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO jobs (
+                    story_id, request_payload, request_id, owner, priority, heavy, cost,
+                    state, attempts, lease_owner, lease_expires_at, heartbeat_at,
+                    started_at, enqueued_at, updated_at, last_error
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, NULL, NULL, NULL, ?, ?, NULL)
+                """,
+                (
+                    story_id,
+                    json.dumps(request_payload, ensure_ascii=False),
+                    request_id,
+                    owner,
+                    priority,
+                    int(heavy),
+                    cost,
+                    STATE_QUEUED,
+                    now,
+                    now,
+                ),
+            )
+
+    def claim(
+        self,
+        worker_id: str,
+        max_heavy_running: int | None = None,
+    ) -> LeasedJob | None:
+        """Lease the next job; TTS/illustration jobs wait while heavy slots are full."""
+        now = self._clock()
+        with self._transaction() as connection:
+            heavy_running = connection.execute(
+                """
+                SELECT COUNT(*) FROM jobs
+                WHERE state = ? AND heavy = 1 AND lease_expires_at >= ?
+                """,
+                (STATE_LEASED, now),
+            ).fetchone()[0]
+            allow_heavy = max_heavy_running is None or heavy_running < max_heavy_running
+            row = connection.execute(
+                """
+                SELECT story_id, request_payload, request_id, attempts FROM jobs AS job
+                WHERE attempts < ?
+                  AND (state = ? OR (state = ? AND lease_expires_at < ?))
+                  AND (heavy = 0 OR ?)
+                ORDER BY (
+                    SELECT COALESCE(SUM(running.cost), 0) FROM jobs AS running
+                    WHERE running.owner = job.owner
+                      AND running.state = ? AND running.lease_expires_at >= ?
+                ) / owner_weight(job.owner), priority DESC, enqueued_at, story_id
+                LIMIT 1
+                """,
+                (
+                    self.max_attempts,
+                    STATE_QUEUED,
+                    STATE_LEASED,
+                    now,
+                    int(allow_heavy),
+                    STATE_LEASED,
+                    now,
+                ),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = int(row["attempts"]) + 1
+            connection.execute(
+                """
+                UPDATE jobs
+                SET state = ?, attempts = ?, lease_owner = ?, lease_expires_at = ?,
+                    heartbeat_at = ?, started_at = ?, updated_at = ?
+                WHERE story_id = ?
+                """,
+                (
+                    STATE_LEASED,
+                    attempts,
+                    worker_id,
+                    now + self.lease_sec,
+                    now,
+                    now,
+                    now,
+                    row["story_id"],
+                ),
+            )
+        return LeasedJob(
+            story_id=row["story_id"],
+            request_payload=json.loads(row["request_payload"]),
+            request_id=row["request_id"],
+            attempts=attempts,
+            lease_owner=worker_id,
+        )
+
+    def heartbeat(self, story_id: str, worker_id: str) -> bool:
+        """Extend the lease; ``False`` means it was lost to another worker."""
+        now = self._clock()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?, updated_at = ?
+                WHERE story_id = ? AND state = ? AND lease_owner = ?
+                """,
+                (now + self.lease_sec, now, now, story_id, STATE_LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, story_id: str, worker_id: str) -> None:
+        now = self._clock()
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                UPDATE jobs
+                SET state = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE story_id = ? AND lease_owner = ?
+                """,
+                (STATE_DONE, now, story_id, worker_id),
+            )
+
+    def release(self, story_id: str, worker_id: str, error: str) -> bool:
+        """Give the job back for another attempt (or bury it if none are left).
+
+        Returns True when the job was buried, so the caller can fail its meta.
+        """
+        now = self._clock()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE jobs
+                SET state = CASE WHEN attempts < ? THEN ? ELSE ? END,
+                    lease_owner = NULL, lease_expires_at = NULL,
+                    updated_at = ?, last_error = ?
+                WHERE story_id = ? AND state = ? AND lease_owner = ?
+                """,
+                (
+                    self.max_attempts,
+                    STATE_QUEUED,
+                    STATE_DEAD,
+                    now,
+                    error,
+                    story_id,
+                    STATE_LEASED,
+                    worker_id,
+                ),
+            )
+            if cursor.rowcount == 0:
+                return False
+            row = connection.execute(
+                "SELECT state FROM jobs WHERE story_id = ?",
+                (story_id,),
+            ).fetchone()
+        return row is not None and row["state"] == STATE_DEAD
+
+    def recover_orphans(self) -> RecoveryResult:
+        """Requeue jobs whose lease expired; bury those out of attempts."""
+        now = self._clock()
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT story_id, attempts FROM jobs WHERE state = ? AND lease_expires_at < ?",
+                (STATE_LEASED, now),
+            ).fetchall()
+            requeued: list[str] = []
+            exhausted: list[str] = []
+            for row in rows:
+                target = requeued if int(row["attempts"]) < self.max_attempts else exhausted
+                target.append(row["story_id"])
+                connection.execute(
+                    """
+                    UPDATE jobs
+                    SET state = ?, lease_owner = NULL, lease_expires_at = NULL,
+                        updated_at = ?, last_error = COALESCE(last_error, 'lease expired')
+                    WHERE story_id = ?
+                    """,
+                    (
+                        STATE_QUEUED if target is requeued else STATE_DEAD,
+                        now,
+                        row["story_id"],
+                    ),
+                )
+        return RecoveryResult(requeued=requeued, exhausted=exhausted)
+
+    def load(self, owner: str | None = None) -> tuple[int, int]:
+        """Return ``(queued, running)`` for every owner or just ``owner``."""
+        query = "SELECT state, COUNT(*) AS total FROM jobs WHERE state IN (?, ?)"
+        params: tuple[Any, ...] = (STATE_QUEUED, STATE_LEASED)
+        if owner is not None:
+            query += " AND owner = ?"
+            params += (owner,)
+        connection = self._connect()
+        try:
+            rows = connection.execute(query + " GROUP BY state", params).fetchall()
+        finally:
+            connection.close()
+        totals = {row["state"]: int(row["total"]) for row in rows}
+        return totals.get(STATE_QUEUED, 0), totals.get(STATE_LEASED, 0)
+
+    def average_duration_sec(self) -> float | None:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                """
+                SELECT AVG(duration) AS average FROM (
+                    SELECT updated_at - started_at AS duration FROM jobs
+                    WHERE state = ? AND started_at IS NOT NULL
+                    ORDER BY updated_at DESC
+                    LIMIT ?
+                )
+                """,
+                (STATE_DONE, DURATION_SAMPLE_SIZE),
+            ).fetchone()
+        finally:
+            connection.close()
+        return float(row["average"]) if row["average"] is not None else None
+
+    def counts(self) -> dict[str, int]:
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT state, COUNT(*) AS total FROM jobs GROUP BY state"
+            ).fetchall()
+        finally:
+            connection.close()
+        return {row["state"]: int(row["total"]) for row in rows}
+
+
+_queue: SQLiteJobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> SQLiteJobQueue:
+    global _queue
+    settings = get_settings()
+    with _queue_lock:
+        if _queue is None or _queue.db_path != settings.job_queue_path:
+            # Imported here: admission itself builds on this module.
+            from app.services.admission import owner_key
+
+            _queue = SQLiteJobQueue(
+                db_path=settings.job_queue_path,
+                lease_sec=settings.job_lease_sec,
+                max_attempts=settings.job_max_attempts,
+                weights={
+                    owner_key(api_key): weight
+                    for api_key, weight in settings.scheduler_key_weights.items()
+                },
+            )
+        return _queue
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+PRIORITY_RANKS = {"low": 0, "normal": 1, "high": 2}
+
+# Relative cost units used to charge a key's fair share. Story text is the
+# baseline; TTS and illustrations add many more provider calls per book.
+_BASE_JOB_COST = 1.0
+_TTS_JOB_COST = 2.0
+_ILLUSTRATION_JOB_COST = 3.0
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """Scheduling metadata for one generation job."""
+
+    owner: str = ""
+    priority: int = PRIORITY_RANKS["normal"]
+    heavy: bool = False
+    cost: float = _BASE_JOB_COST
+
+
+def build_job_spec(
+    owner: str,
+    priority: str = "normal",
+    enable_tts: bool = False,
+    enable_illustration: bool = False,
+) -> JobSpec:
+    cost = _BASE_JOB_COST
+    if enable_tts:
+        cost += _TTS_JOB_COST
+    if enable_illustration:
+        cost += _ILLUSTRATION_JOB_COST
+    return JobSpec(
+        owner=owner,
+        priority=PRIORITY_RANKS.get(priority, PRIORITY_RANKS["normal"]),
+        heavy=enable_tts or enable_illustration,
+        cost=cost,
+    )
+
+
+@dataclass(order=True)
+class _Entry:
+    sort_key: tuple[int, int]
+    item: Any = field(compare=False)
+    spec: JobSpec = field(compare=False)
+
+
+class FairShareQueue:
+    """Blocking job queue with weighted fair sharing across owners.
+
+    Each owner (API key digest) keeps its own queue ordered by priority, then
+    arrival. Owners are served by stride scheduling: every dispatch charges
+    the owner ``cost / weight`` and the owner with the smallest accumulated
+    charge goes next, so a key submitting many illustrated books cannot
+    starve a key with a single text-only one. Priority only reorders jobs
+    within the submitting key's own share.
+
+    When ``max_heavy_running`` TTS/illustration jobs are already running,
+    heavy jobs are held back and the next cheap text-only job is dispatched
+    instead.
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[str, float] | None = None,
+        max_heavy_running: int | None = None,
+    ) -> None:
+        if max_heavy_running is not None and max_heavy_running < 1:
+            raise ValueError("max_heavy_running must be at least 1.")
+        self._weights = dict(weights or {})
+        self.max_heavy_running = max_heavy_running
+        self._condition = threading.Condition()
+        self._queues: dict[str, list[_Entry]] = {}
+        self._passes: dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._heavy_running = 0
+        self._sequence = itertools.count()
+        self._size = 0
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._size
+
+    @property
+    def heavy_running(self) -> int:
+        with self._condition:
+            return self._heavy_running
+
+    def _weight(self, owner: str) -> float:
+        weight = self._weights.get(owner, 1.0)
+        return weight if weight > 0 else 1.0
+
+    def put(self, item: Any, spec: JobSpec | None = None) -> None:
+        spec = spec or JobSpec()
+        entry = _Entry(sort_key=(-spec.priority, next(self._sequence)), item=item, spec=spec)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("cannot put a job on a closed queue")
+            jobs = self._queues.setdefault(spec.owner, [])
+            if not jobs:
+                # A key returning from idle starts at the current virtual time
+                # instead of cashing in the share it did not use.
+                self._passes[spec.owner] = max(
+                    self._passes.get(spec.owner, 0.0), self._virtual_time
+                )
+            bisect.insort(jobs, entry)
+            self._size += 1
+            self._condition.notify()
+
+    def get(self) -> Any | None:
+        """Block until a job may run; ``None`` once closed and drained."""
+        with self._condition:
+            while True:
+                entry = self._select()
+                if entry is not None:
+                    return entry.item
+                if self._closed and self._size == 0:
+                    return None
+                self._condition.wait()
+
+    def done(self, spec: JobSpec | None) -> None:
+        if spec is None or not spec.heavy:
+            return
+        with self._condition:
+            self._heavy_running -= 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _select(self) -> _Entry | None:
+        # Called with the condition held.
+        heavy_blocked = (
+            self.max_heavy_running is not None
+            and self._heavy_running >= self.max_heavy_running
+        )
+        chosen_owner: str | None = None
+        chosen_index = 0
+        chosen_key: tuple[float, int] | None = None
+        for owner, jobs in self._queues.items():
+            for index, entry in enumerate(jobs):
+                if heavy_blocked and entry.spec.heavy:
+                    continue
+                key = (self._passes[owner], entry.sort_key[1])
+                if chosen_key is None or key < chosen_key:
+                    chosen_owner, chosen_index, chosen_key = owner, index, key
+                break
+        if chosen_owner is None:
+            return None
+
+        jobs = self._queues[chosen_owner]
+        entry = jobs.pop(chosen_index)
+        if not jobs:
+            del self._queues[chosen_owner]
+        self._size -= 1
+        self._virtual_time = self._passes[chosen_owner]
+        self._passes[chosen_owner] += entry.spec.cost / self._weight(chosen_owner)
+        # Forget idle keys that carry no outstanding charge.
+        for owner in [
+            owner
+            for owner, charge in self._passes.items()
+            if owner not in self._queues and charge <= self._virtual_time
+        ]:
+            del self._passes[owner]
+        if entry.spec.heavy:
+            self._heavy_running += 1
+        return entry
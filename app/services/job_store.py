@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts coordinate in-process only
+    fcntl = None
+
+from app.services.job_events import TERMINAL_STATUSES
 from app.services.output_paths import get_run_dir
 
 _META_FILE_NAME = "meta.json"
+_META_LOCK_FILE_NAME = ".meta.lock"
+_TERMINAL_STATUS_CANCELED = "canceled"
 _LOCK = threading.Lock()
 
 
@@ -34,16 +45,29 @@ class JobStore:
             "result": None,
             "error": None,
         }
-        self._write_meta(self._meta_path(story_id), meta)
+        with self._meta_lock(story_id):
+            self._write_meta(self._meta_path(story_id), meta)
         return meta
 
     def load_job(self, story_id: str) -> dict[str, Any] | None:
         meta_path = self._meta_path(story_id)
-        if not meta_path.is_file():
-            return None
-        with _LOCK:
+        # Writers replace meta.json atomically, so a plain read never sees a torn file.
+        try:
             with meta_path.open("r", encoding="utf-8") as file:
                 return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def meta_signature(self, story_id: str) -> list[int] | None:
+        """``[mtime_ns, size]`` of ``meta.json``; every job write replaces the file."""
+        try:
+            stat = self._meta_path(story_id).stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def mark_queued(self, story_id: str) -> dict[str, Any]:
+        return self._set_job_status(story_id=story_id, status="queued")
 
     def mark_running(self, story_id: str) -> dict[str, Any]:
         return self._set_job_status(story_id=story_id, status="running")
@@ -72,6 +96,26 @@ class JobStore:
     def mark_canceled(self, story_id: str) -> dict[str, Any]:
         return self._set_job_status(story_id=story_id, status="canceled")
 
+    def update_progress(self, story_id: str, progress: dict[str, Any]) -> dict[str, Any] | None:
+        """Store a progress snapshot without touching the job status.
+
+        Runs under the same cross-process lock as status changes, so the meta
+        it rewrites always carries the latest status. A finished job keeps its
+        final progress.
+        """
+        meta_path = self._meta_path(story_id)
+        if not meta_path.is_file():
+            return None
+
+        with self._meta_lock(story_id):
+            with meta_path.open("r", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("status") in TERMINAL_STATUSES:
+                return meta
+            meta["progress"] = {**progress, "updated_at": _utc_now_iso()}
+            self._write_meta(meta_path, meta)
+            return meta
+
     def _set_job_status(
         self,
         story_id: str,
@@ -83,10 +127,15 @@ class JobStore:
         if not meta_path.is_file():
             raise FileNotFoundError(f"story meta not found: {story_id}")
 
-        with _LOCK:
+        with self._meta_lock(story_id):
             with meta_path.open("r", encoding="utf-8") as file:
                 meta = json.load(file)
 
+            # A cancel may land while the job is still running; whatever the
+            # worker reports afterwards must not resurrect the job.
+            if meta.get("status") == _TERMINAL_STATUS_CANCELED:
+                return meta
+
             meta["status"] = status
             meta["updated_at"] = _utc_now_iso()
             if result is not None:
@@ -99,9 +148,43 @@ class JobStore:
             self._write_meta(meta_path, meta)
             return meta
 
+    @contextmanager
+    def _meta_lock(self, story_id: str) -> Iterator[None]:
+        """Serialize meta.json read-modify-writes across threads and processes.
+
+        The API and ``python -m app.worker`` both write a job's meta.json, so
+        an in-process lock alone would let one process overwrite the other's
+        update (e.g. a cancel).
+        """
+        with _LOCK:
+            if fcntl is None:
+                yield
+                return
+            lock_path = get_run_dir(story_id) / _META_LOCK_FILE_NAME
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
     @staticmethod
     def _write_meta(meta_path: Path, meta: dict[str, Any]) -> None:
-        temp_path = meta_path.with_suffix(".tmp")
-        with temp_path.open("w", encoding="utf-8") as file:
-            json.dump(meta, file, ensure_ascii=False, indent=2)
-        temp_path.replace(meta_path)
+        # A unique temp file per write: concurrent writers never share one.
+        file = tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=meta_path.parent,
+            prefix=".meta.",
+            suffix=".tmp",
+            delete=False,
+        )
+        temp_path = Path(file.name)
+        try:
+            with file:
+                json.dump(meta, file, ensure_ascii=False, indent=2)
+            os.replace(temp_path, meta_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
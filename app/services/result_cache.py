@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from app.core.config import get_settings
+from app.services.http_cache import build_etag
+from app.services.output_paths import get_run_dir
+from app.services.result_snapshot import (
+    RESULT_SNAPSHOT_VERSION,
+    _stat_signature,
+    build_result_fingerprint,
+    load_or_build_story_result_payload,
+)
+
+PayloadBuilder = Callable[..., dict[str, Any]]
+
+
+def build_cache_fingerprint(run_dir: Path) -> dict[str, list[int] | None]:
+    """``build_result_fingerprint`` plus ``meta.json``, which holds the job status."""
+    return {
+        "meta.json": _stat_signature(run_dir / "meta.json"),
+        **build_result_fingerprint(run_dir),
+    }
+
+
+@dataclass
+class _Entry:
+    fingerprint: dict[str, list[int] | None]
+    payload: dict[str, Any]
+
+
+class ResultPayloadCache:
+    """Bounded in-process LRU of built result payloads.
+
+    Entries are keyed by run directory and build inputs and are served only
+    while the run's fingerprint is unchanged. Concurrent misses for one key
+    wait for a single build instead of each rebuilding the payload. Cached
+    payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._building: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(
+        self,
+        build_kwargs: dict[str, Any],
+        build_fn: PayloadBuilder = load_or_build_story_result_payload,
+        fingerprint: dict[str, list[int] | None] | None = None,
+    ) -> dict[str, Any]:
+        """Serve the payload for ``build_kwargs``, building it with ``build_fn`` on a miss.
+
+        ``fingerprint`` may be passed when the caller already took it.
+        """
+        run_dir = get_run_dir(build_kwargs["story_id"])
+        if not run_dir.is_dir():
+            # Let the builder raise its usual FileNotFoundError.
+            return build_fn(**build_kwargs)
+        key = _cache_key(run_dir, build_kwargs)
+
+        while True:
+            # Taken before the build, so an asset written meanwhile forces a rebuild.
+            if fingerprint is None:
+                fingerprint = build_cache_fingerprint(run_dir)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.fingerprint == fingerprint:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.payload
+                building = self._building.get(key)
+                if building is None:
+                    building = threading.Event()
+                    self._building[key] = building
+                    self.misses += 1
+                    break
+            # Another thread is building this key; re-check once it finishes.
+            building.wait()
+            fingerprint = None
+
+        try:
+            payload = build_fn(**build_kwargs)
+            with self._lock:
+                self._entries[key] = _Entry(fingerprint=fingerprint, payload=payload)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return payload
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+            building.set()
+
+    def peek(
+        self,
+        build_kwargs: dict[str, Any],
+        fingerprint: dict[str, list[int] | None],
+    ) -> dict[str, Any] | None:
+        """Return a cached payload still valid for ``fingerprint`` without building one."""
+        key = _cache_key(get_run_dir(build_kwargs["story_id"]), build_kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fingerprint != fingerprint:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.payload
+
+    def invalidate(self, story_id: str) -> None:
+        prefix = f"{get_run_dir(story_id)}\n"
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def build_result_etag(
+    build_kwargs: dict[str, Any],
+    fingerprint: dict[str, list[int] | None],
+    *variant: Any,
+) -> str:
+    """Strong ETag for the payload built from ``build_kwargs`` over ``fingerprint``.
+
+    ``variant`` tells apart representations of the same payload (page or
+    field selections).
+    """
+    run_dir = get_run_dir(build_kwargs["story_id"])
+    return build_etag(
+        RESULT_SNAPSHOT_VERSION, _cache_key(run_dir, build_kwargs), fingerprint, *variant
+    )
+
+
+def _cache_key(run_dir: Path, build_kwargs: dict[str, Any]) -> str:
+    static_prefix = build_kwargs.get("static_prefix")
+    inputs = {
+        **build_kwargs,
+        "static_prefix": (
+            get_settings().static_outputs_prefix if static_prefix is None else static_prefix
+        ),
+    }
+    return f"{run_dir}\n{json.dumps(inputs, sort_keys=True, default=str)}"
+
+
+_cache: ResultPayloadCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_result_payload_cache() -> ResultPayloadCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultPayloadCache(max_entries=get_settings().result_cache_max_entries)
+        return _cache
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.schemas.story import StoryPageResponse, StoryResultResponse
+
+_RESULT_FIELDS = frozenset(StoryResultResponse.model_fields)
+_PAGE_FIELDS = frozenset(StoryPageResponse.model_fields)
+# Upper bound for range endpoints, so "1-999999999" cannot allocate a huge tuple.
+_MAX_PAGE_NUMBER = 999
+
+
+def parse_page_selection(raw: str | None) -> tuple[int, ...] | None:
+    """Parse ``?pages=`` such as ``1-4`` or ``1-4,7``; None selects every page."""
+    if raw is None or not raw.strip():
+        return None
+    page_numbers: set[int] = set()
+    for part in raw.split(","):
+        start_raw, separator, end_raw = part.strip().partition("-")
+        try:
+            start = int(start_raw)
+            end = int(end_raw) if separator else start
+        except ValueError:
+            raise ValueError(f"invalid page range: {part.strip()!r}") from None
+        if start < 1 or end < start or end > _MAX_PAGE_NUMBER:
+            raise ValueError(f"invalid page range: {part.strip()!r}")
+        page_numbers.update(range(start, end + 1))
+    return tuple(sorted(page_numbers))
+
+
+def parse_field_selection(raw: str | None) -> tuple[str, ...] | None:
+    """Parse ``?fields=``: result fields (``assets``, ``meta``...) and page fields.
+
+    Naming a page field (``text_primary``, ``illustration_url``...) keeps only
+    those fields (plus ``page_number``) in every page. None selects everything.
+    """
+    if raw is None:
+        return None
+    names = sorted({name.strip() for name in raw.split(",") if name.strip()})
+    if not names:
+        return None
+    unknown = [name for name in names if name not in _RESULT_FIELDS | _PAGE_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return tuple(names)
+
+
+def selects_pages(fields: tuple[str, ...] | None) -> bool:
+    return fields is None or any(name == "pages" or name in _PAGE_FIELDS for name in fields)
+
+
+def build_field_include(fields: tuple[str, ...]) -> dict[str, Any]:
+    """Pydantic ``include`` spec for ``model_dump``; ``id`` is always kept."""
+    include: dict[str, Any] = {"id": True}
+    include.update({name: True for name in fields if name in _RESULT_FIELDS})
+    page_fields = {name for name in fields if name in _PAGE_FIELDS}
+    if page_fields:
+        include["pages"] = {"__all__": {"page_number", *page_fields}}
+    return include
+
+
+def select_pages(payload: dict[str, Any], page_numbers: tuple[int, ...]) -> dict[str, Any]:
+    """Copy of a full payload keeping only ``page_numbers``; the input stays untouched."""
+    wanted = set(page_numbers)
+    return {
+        **payload,
+        "pages": [page for page in payload["pages"] if page.get("page_number") in wanted],
+    }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from generators.common.content_cache import write_bytes_atomic
+
+from app.core.config import get_settings
+from app.services.output_paths import get_run_dir
+from app.services.story_result_builder import build_story_result_payload
+
+# Bump whenever the result payload shape changes so old snapshots are rebuilt.
+RESULT_SNAPSHOT_VERSION = 1
+RESULT_SNAPSHOT_FILE_NAME = "result.json"
+
+# Every asset write (including atomic renames) updates its directory's mtime,
+# and every stage rewrites its manifest, so these stats cover all asset changes.
+_FINGERPRINT_FILES = (
+    Path("audio") / "manifest.json",
+    Path("illustrations") / "manifest.json",
+    Path("vocabulary") / "manifest.json",
+)
+# The run directory itself is left out: meta.json and result.json are
+# rewritten there without any asset changing.
+_FINGERPRINT_DIRS = (Path("illustrations"), Path("vocabulary"))
+
+
+def _stat_signature(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def build_result_fingerprint(run_dir: Path) -> dict[str, list[int] | None]:
+    """Cheap signature of the run's assets: a few ``stat`` calls, no page scan."""
+    paths = [*_FINGERPRINT_FILES, *_FINGERPRINT_DIRS]
+    for name in ("story_", "quiz_"):
+        paths.extend(
+            path.relative_to(run_dir) for path in sorted(run_dir.glob(f"{name}*.json"))
+        )
+    audio_dir = run_dir / "audio"
+    paths.append(Path("audio"))
+    if audio_dir.is_dir():
+        paths.extend(
+            Path("audio") / entry.name
+            for entry in sorted(os.scandir(audio_dir), key=lambda entry: entry.name)
+            if entry.is_dir()
+        )
+    return {path.as_posix(): _stat_signature(run_dir / path) for path in paths}
+
+
+def _snapshot_path(story_id: str) -> Path:
+    return get_run_dir(story_id) / RESULT_SNAPSHOT_FILE_NAME
+
+
+def _snapshot_inputs(build_kwargs: dict[str, Any]) -> dict[str, Any]:
+    static_prefix = build_kwargs.get("static_prefix")
+    return {
+        **build_kwargs,
+        "static_prefix": (
+            get_settings().static_outputs_prefix if static_prefix is None else static_prefix
+        ),
+    }
+
+
+def write_result_snapshot(
+    story_id: str,
+    payload: dict[str, Any],
+    build_kwargs: dict[str, Any],
+    fingerprint: dict[str, list[int] | None],
+) -> Path:
+    """Store ``payload``; ``fingerprint`` must be taken before it was built."""
+    run_dir = get_run_dir(story_id)
+    snapshot = {
+        "version": RESULT_SNAPSHOT_VERSION,
+        "inputs": _snapshot_inputs(build_kwargs),
+        "fingerprint": fingerprint,
+        "payload": payload,
+    }
+    snapshot_path = run_dir / RESULT_SNAPSHOT_FILE_NAME
+    write_bytes_atomic(
+        snapshot_path,
+        json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+    return snapshot_path
+
+
+def load_result_snapshot(story_id: str, build_kwargs: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the stored payload if it was built from the same inputs and assets."""
+    snapshot_path = _snapshot_path(story_id)
+    try:
+        snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("version") != RESULT_SNAPSHOT_VERSION
+        or snapshot.get("inputs") != _snapshot_inputs(build_kwargs)
+        or snapshot.get("fingerprint") != build_result_fingerprint(snapshot_path.parent)
+        or not isinstance(snapshot.get("payload"), dict)
+    ):
+        return None
+    return snapshot["payload"]
+
+
+def invalidate_result_snapshot(story_id: str) -> None:
+    _snapshot_path(story_id).unlink(missing_ok=True)
+
+
+def build_and_store_story_result_payload(**build_kwargs: Any) -> dict[str, Any]:
+    """Build the result payload and persist it as the ``result.json`` snapshot.
+
+    Takes the same keyword arguments as ``build_story_result_payload``.
+    """
+    story_id = build_kwargs["story_id"]
+    run_dir = get_run_dir(story_id)
+    # Taken first, so an asset written during the build invalidates the snapshot.
+    fingerprint = build_result_fingerprint(run_dir) if run_dir.is_dir() else {}
+    payload = build_story_result_payload(**build_kwargs)
+    try:
+        write_result_snapshot(story_id, payload, build_kwargs, fingerprint)
+    except OSError:
+        # A read-only or full disk only costs the next read a rebuild.
+        pass
+    return payload
+
+
+def load_or_build_story_result_payload(**build_kwargs: Any) -> dict[str, Any]:
+    """Serve the ``result.json`` snapshot, rebuilding it when stale or missing."""
+    payload = load_result_snapshot(build_kwargs["story_id"], build_kwargs)
+    if payload is not None:
+        return payload
+    return build_and_store_story_result_payload(**build_kwargs)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.services.output_paths import (
+    build_outputs_url,
+    resolve_manifest_asset_path,
+    to_outputs_url,
+)
+
+# Only illustration sizes are read: an empty image file counts as missing.
+_SIZED_DIRS = frozenset({"illustrations"})
+
+
+class RunIndex:
+    """In-memory listing of one run directory, built with a single scandir walk.
+
+    Lets the result builder answer "does this asset exist" and build its URL
+    without a filesystem call per page or vocabulary entry.
+    """
+
+    def __init__(
+        self,
+        *,
+        story_id: str,
+        run_dir: Path,
+        outputs_dir: Path,
+        files: dict[str, int | None],
+        url_prefix: str,
+    ) -> None:
+        self.story_id = story_id
+        self.run_dir = run_dir
+        self.outputs_dir = outputs_dir
+        # Run-relative POSIX path -> size (None where the size was not read).
+        self.files = files
+        self.url_prefix = url_prefix
+        self._dir_names: dict[str, list[str]] = {}
+        for rel_path in sorted(files):
+            rel_dir, _, name = rel_path.rpartition("/")
+            self._dir_names.setdefault(rel_dir, []).append(name)
+        self._run_roots = {os.path.abspath(run_dir), os.path.realpath(run_dir)}
+
+    @classmethod
+    def scan(
+        cls,
+        *,
+        story_id: str,
+        run_dir: Path,
+        outputs_dir: Path,
+        static_prefix: str | None = None,
+    ) -> RunIndex:
+        files: dict[str, int | None] = {}
+        pending = [("", str(run_dir))]
+        while pending:
+            rel_dir, abs_dir = pending.pop()
+            try:
+                with os.scandir(abs_dir) as iterator:
+                    entries = list(iterator)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            top_dir = rel_dir.split("/", 1)[0]
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    pending.append((rel_path, entry.path))
+                elif entry.is_file():
+                    files[rel_path] = entry.stat().st_size if top_dir in _SIZED_DIRS else None
+        return cls(
+            story_id=story_id,
+            run_dir=run_dir,
+            outputs_dir=outputs_dir,
+            files=files,
+            url_prefix=(
+                get_settings().static_outputs_prefix if static_prefix is None else static_prefix
+            ),
+        )
+
+    def has_file(self, rel_path: str) -> bool:
+        return rel_path in self.files
+
+    def first_file(self, rel_dir: str, name_prefix: str, suffix: str = "") -> str | None:
+        """First non-empty file in ``rel_dir`` whose name starts with ``name_prefix``."""
+        dir_prefix = f"{rel_dir}/" if rel_dir else ""
+        for name in self._dir_names.get(rel_dir, ()):
+            if name.startswith(name_prefix) and name.endswith(suffix):
+                rel_path = f"{dir_prefix}{name}"
+                if self.files[rel_path] != 0:
+                    return rel_path
+        return None
+
+    def url(self, rel_path: str) -> str:
+        return build_outputs_url(f"{self.story_id}/{rel_path}", prefix=self.url_prefix)
+
+    def file_url(self, rel_path: str | None) -> str | None:
+        return self.url(rel_path) if rel_path is not None and self.has_file(rel_path) else None
+
+    def resolve_manifest_path(self, raw_path: str | None) -> str | None:
+        """Map a manifest ``path`` to a run-relative path of an existing file.
+
+        Tries the same candidates as ``resolve_manifest_asset_path``, but
+        only inside this run; other locations are left to the caller.
+        """
+        normalized = (raw_path or "").strip().replace("\\", "/")
+        if not normalized:
+            return None
+        candidate = Path(normalized)
+        if candidate.is_absolute():
+            candidates = [candidate]
+        else:
+            candidates = [self.run_dir / candidate, self.outputs_dir / candidate]
+            if candidate.parts and candidate.parts[0] == self.outputs_dir.name:
+                candidates.append(self.outputs_dir.parent / candidate)
+
+        for path in candidates:
+            absolute = os.path.abspath(path)
+            for root in self._run_roots:
+                if absolute.startswith(root + os.sep):
+                    rel_path = Path(os.path.relpath(absolute, root)).as_posix()
+                    if self.has_file(rel_path):
+                        return rel_path
+        return None
+
+    def manifest_asset_url(self, raw_path: str | None) -> str | None:
+        rel_path = self.resolve_manifest_path(raw_path)
+        if rel_path is not None:
+            return self.url(rel_path)
+        if not (raw_path or "").strip():
+            return None
+        # Rare: a missing asset or one outside this run; check the disk.
+        resolved_path = resolve_manifest_asset_path(run_dir=self.run_dir, raw_path=raw_path)
+        if resolved_path is None:
+            return None
+        return to_outputs_url(resolved_path, prefix=self.url_prefix)
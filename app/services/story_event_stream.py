@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from app.services.job_events import TERMINAL_STATUSES, JobEvent, job_event_broker
+from app.services.story_orchestrator import job_store
+
+_POLL_INTERVAL_SEC = 2.0
+_KEEPALIVE_INTERVAL_SEC = 15.0
+
+
+def format_sse(event_type: str, data: dict[str, Any], event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _format_event(event: JobEvent) -> str:
+    return format_sse(event.type, event.data, event_id=event.id)
+
+
+def _status_snapshot(story_id: str, job: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": story_id,
+        "status": job.get("status"),
+        "updated_at": job.get("updated_at"),
+        "error": job.get("error"),
+    }
+
+
+async def stream_story_events(
+    story_id: str,
+    last_event_id: int = 0,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    poll_interval_sec: float = _POLL_INTERVAL_SEC,
+    keepalive_interval_sec: float = _KEEPALIVE_INTERVAL_SEC,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a story until it reaches a terminal status.
+
+    Events come from the in-process broker. While the stream is idle it
+    re-reads ``meta.json`` every ``poll_interval_sec``, so status changes
+    made by a worker in another process still reach the client.
+    """
+    subscription, backlog = job_event_broker.subscribe(story_id, last_event_id=last_event_id)
+    try:
+        job = await asyncio.to_thread(job_store.load_job, story_id) or {}
+        last_status = job.get("status")
+        if not backlog:
+            yield format_sse("status", _status_snapshot(story_id, job))
+            if last_status in TERMINAL_STATUSES:
+                return
+        for event in backlog:
+            yield _format_event(event)
+            if event.is_terminal:
+                return
+
+        idle_sec = 0.0
+        while True:
+            if is_disconnected is not None and await is_disconnected():
+                return
+            event = await subscription.get(timeout=poll_interval_sec)
+            if event is not None:
+                idle_sec = 0.0
+                yield _format_event(event)
+                if event.type == "status":
+                    last_status = event.data.get("status")
+                if event.is_terminal:
+                    return
+                continue
+
+            job = await asyncio.to_thread(job_store.load_job, story_id) or {}
+            if job.get("status") != last_status:
+                last_status = job.get("status")
+                idle_sec = 0.0
+                yield format_sse("status", _status_snapshot(story_id, job))
+                if last_status in TERMINAL_STATUSES:
+                    return
+                continue
+
+            idle_sec += poll_interval_sec
+            if idle_sec >= keepalive_interval_sec:
+                idle_sec = 0.0
+                yield ": keep-alive\n\n"
+    finally:
+        subscription.close()
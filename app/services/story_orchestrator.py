@@ -1,31 +1,65 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from dataclasses import replace
 from typing import Any
 
 from fastapi import BackgroundTasks, HTTPException, status
+from generators.common.cancellation import GenerationCanceled
+from generators.common.progress import ProgressCallback
+from generators.story.story_model import Story
 
 from app.core.auth import build_error
+from app.core.config import get_settings
 from app.schemas.story import (
     StoryCreateAcceptedResponse,
     StoryCreateRequest,
     StoryResultResponse,
     StoryStatusResponse,
 )
+from app.services.admission import job_load_tracker, owner_key
 from app.services.generation_pipeline import (
     build_pipeline_request_from_story_request,
     run_story_generation_pipeline,
 )
+from app.services.http_cache import (
+    ConditionalResult,
+    build_etag,
+    cache_control_for,
+    etag_matches,
+)
+from app.services.job_cancellation import (
+    job_cancellation_registry,
+    watch_for_cancellation,
+)
+from app.services.job_events import job_event_broker
+from app.services.job_executor import get_job_executor
+from app.services.job_progress import JobProgressTracker
+from app.services.job_scheduler import JobSpec, build_job_spec
+from app.services.job_queue import get_job_queue
 from app.services.job_store import JobStore
 from app.services.request_context import log_event
 from app.services.output_paths import (
+    find_story_json_path,
     get_run_dir,
     make_story_id,
     to_static_outputs_url,
 )
+from app.services.result_cache import (
+    build_cache_fingerprint,
+    build_result_etag,
+    get_result_payload_cache,
+)
+from app.services.result_selection import select_pages, selects_pages
+from app.services.result_snapshot import (
+    build_and_store_story_result_payload,
+    invalidate_result_snapshot,
+)
 from app.services.story_result_builder import build_story_result_payload
 
 job_store = JobStore()
+_CANCEL_POLL_INTERVAL_SEC = 1.0
 
 
 def _extract_generation_flags(request_payload: dict[str, Any]) -> tuple[bool, bool, bool, bool]:
@@ -42,6 +76,18 @@ def _extract_generation_flags(request_payload: dict[str, Any]) -> tuple[bool, bo
     return include_quiz, include_tts, include_illustration, include_cover_illustration
 
 
+def _build_job_spec(request_payload: dict[str, Any], owner: str) -> JobSpec:
+    _, include_tts, include_illustration, _ = _extract_generation_flags(request_payload)
+    generation = request_payload.get("generation")
+    priority = generation.get("priority", "normal") if isinstance(generation, dict) else "normal"
+    return build_job_spec(
+        owner=owner,
+        priority=priority,
+        enable_tts=include_tts,
+        enable_illustration=include_illustration,
+    )
+
+
 def _extract_service_errors(job_payload: dict[str, Any]) -> dict[str, str | None]:
     result = job_payload.get("result")
     if not isinstance(result, dict):
@@ -66,21 +112,43 @@ def _extract_service_errors(job_payload: dict[str, Any]) -> dict[str, str | None
     }
 
 
+def _is_job_canceled(story_id: str) -> bool:
+    job = job_store.load_job(story_id)
+    return bool(job) and job.get("status") == "canceled"
+
+
 def enqueue_story_generation(
     request: StoryCreateRequest,
     background_tasks: BackgroundTasks,
     request_id: str | None = None,
+    api_key: str = "",
 ) -> StoryCreateAcceptedResponse:
     story_id = make_story_id(child_name=request.child_name, theme=request.theme)
     request_payload = request.model_dump(mode="json")
-    job_store.initialize_job(story_id=story_id, request_payload=request_payload)
+    queued_meta = job_store.initialize_job(story_id=story_id, request_payload=request_payload)
+    job_event_broker.publish_status(story_id, queued_meta)
+    job_spec = _build_job_spec(request_payload, owner=owner_key(api_key))
 
-    background_tasks.add_task(
-        run_story_generation_job_background,
-        story_id,
-        request_payload,
-        request_id,
-    )
+    if get_settings().job_queue_backend == "sqlite":
+        # Durable mode: a worker (embedded or `python -m app.worker`) claims it.
+        get_job_queue().enqueue(
+            story_id=story_id,
+            request_payload=request_payload,
+            request_id=request_id,
+            owner=job_spec.owner,
+            priority=job_spec.priority,
+            heavy=job_spec.heavy,
+            cost=job_spec.cost,
+        )
+    else:
+        job_load_tracker.add(story_id, owner=job_spec.owner)
+        background_tasks.add_task(
+            run_story_generation_job_background,
+            story_id,
+            request_payload,
+            request_id,
+            job_spec,
+        )
 
     log_event(
         event="story.job.queued",
@@ -101,12 +169,35 @@ async def run_story_generation_job_background(
     story_id: str,
     request_payload: dict[str, Any],
     request_id: str | None = None,
+    job_spec: JobSpec | None = None,
 ) -> None:
-    run_story_generation_job(
+    # The pipeline is fully blocking, so hand it to the bounded job executor
+    # and only await its completion here; the event loop stays free. The
+    # executor's fair-share queue decides which tenant's job runs next.
+    future = get_job_executor().submit_job(
+        job_spec or _build_job_spec(request_payload, owner=""),
+        _run_tracked_job,
         story_id=story_id,
         request_payload=request_payload,
         request_id=request_id,
     )
+    await asyncio.wrap_future(future)
+
+
+def _run_tracked_job(
+    story_id: str,
+    request_payload: dict[str, Any],
+    request_id: str | None = None,
+) -> None:
+    job_load_tracker.mark_running(story_id)
+    try:
+        run_story_generation_job(
+            story_id=story_id,
+            request_payload=request_payload,
+            request_id=request_id,
+        )
+    finally:
+        job_load_tracker.finish(story_id)
 
 
 def cancel_story_job(story_id: str) -> StoryStatusResponse:
@@ -133,6 +224,8 @@ def cancel_story_job(story_id: str) -> StoryStatusResponse:
         )
 
     updated = job_store.mark_canceled(story_id=story_id)
+    job_event_broker.publish_status(story_id, updated)
+    job_cancellation_registry.cancel(story_id)
     log_event(
         event="story.job.canceled",
         story_id=story_id,
@@ -142,6 +235,16 @@ def cancel_story_job(story_id: str) -> StoryStatusResponse:
 
 
 def load_story_status(story_id: str) -> StoryStatusResponse:
+    return load_story_status_conditional(story_id).body
+
+
+def load_story_status_conditional(
+    story_id: str,
+    if_none_match: str | None = None,
+) -> ConditionalResult:
+    """Status response with its ETag; the body is skipped when ``if_none_match`` matches."""
+    # Taken before reading meta.json: a write in between only costs a full response.
+    meta_signature = job_store.meta_signature(story_id)
     job = job_store.load_job(story_id=story_id)
     if job is None:
         raise HTTPException(
@@ -152,10 +255,42 @@ def load_story_status(story_id: str) -> StoryStatusResponse:
                 detail={"id": story_id},
             ),
         )
-    return StoryStatusResponse.model_validate(job)
+    progress = job.get("progress")
+    etag = build_etag(
+        "status",
+        story_id,
+        job.get("updated_at"),
+        progress.get("updated_at") if isinstance(progress, dict) else None,
+        meta_signature,
+    )
+    cache_control = cache_control_for(str(job.get("status", "")))
+    if etag_matches(if_none_match, etag):
+        return ConditionalResult(etag=etag, cache_control=cache_control)
+    return ConditionalResult(
+        etag=etag,
+        cache_control=cache_control,
+        body=StoryStatusResponse.model_validate(job),
+    )
 
 
 def load_story_result(story_id: str) -> StoryResultResponse:
+    return load_story_result_conditional(story_id).body
+
+
+def load_story_result_conditional(
+    story_id: str,
+    if_none_match: str | None = None,
+    page_numbers: tuple[int, ...] | None = None,
+    fields: tuple[str, ...] | None = None,
+    representation: str = "result",
+) -> ConditionalResult:
+    """Result response with its ETag; a matching ``if_none_match`` skips the build.
+
+    ``page_numbers`` limits the pages built and returned. ``fields`` only
+    feeds the ETag (the caller trims the body), except that a selection
+    without page fields skips page building entirely. ``representation``
+    keeps ETags of other endpoints over the same payload distinct.
+    """
     job = job_store.load_job(story_id=story_id)
     if job is None:
         raise HTTPException(
@@ -200,17 +335,29 @@ def load_story_result(story_id: str) -> StoryResultResponse:
         else "5:4"
     )
 
+    build_kwargs = {
+        "story_id": story_id,
+        "include_tts": include_tts,
+        "include_illustration": include_illustration,
+        "include_cover_illustration": include_cover_illustration,
+        "illustration_aspect_ratio": illustration_aspect_ratio,
+        "cover_aspect_ratio": cover_aspect_ratio,
+        "job_status": job_status,
+        "service_errors": service_errors,
+    }
+    run_dir = get_run_dir(story_id)
+    fingerprint = build_cache_fingerprint(run_dir) if run_dir.is_dir() else None
+    if not selects_pages(fields):
+        page_numbers = ()
+    etag = build_result_etag(
+        build_kwargs, fingerprint or {}, representation, page_numbers, fields
+    )
+    cache_control = cache_control_for(job_status)
+    if fingerprint is not None and etag_matches(if_none_match, etag):
+        return ConditionalResult(etag=etag, cache_control=cache_control)
+
     try:
-        payload = build_story_result_payload(
-            story_id=story_id,
-            include_tts=include_tts,
-            include_illustration=include_illustration,
-            include_cover_illustration=include_cover_illustration,
-            illustration_aspect_ratio=illustration_aspect_ratio,
-            cover_aspect_ratio=cover_aspect_ratio,
-            job_status=job_status,
-            service_errors=service_errors,
-        )
+        payload = _load_result_payload(build_kwargs, fingerprint, page_numbers)
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,13 +377,80 @@ def load_story_result(story_id: str) -> StoryResultResponse:
             ),
         ) from None
 
-    return StoryResultResponse.model_validate(payload)
+    return ConditionalResult(
+        etag=etag,
+        cache_control=cache_control,
+        body=StoryResultResponse.model_validate(payload),
+    )
+
+
+def load_story_page_conditional(
+    story_id: str,
+    page_number: int,
+    if_none_match: str | None = None,
+) -> ConditionalResult:
+    result = load_story_result_conditional(
+        story_id,
+        if_none_match=if_none_match,
+        page_numbers=(page_number,),
+        representation="page",
+    )
+    if result.not_modified:
+        return result
+    if not result.body.pages:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=build_error(
+                code="STORY_PAGE_NOT_FOUND",
+                message="story page not found",
+                detail={"id": story_id, "page_number": page_number},
+            ),
+        )
+    return replace(result, body=result.body.pages[0])
+
+
+def _load_result_payload(
+    build_kwargs: dict[str, Any],
+    fingerprint: dict[str, list[int] | None] | None,
+    page_numbers: tuple[int, ...] | None,
+) -> dict[str, Any]:
+    cache = get_result_payload_cache()
+    if page_numbers is None:
+        return cache.get_or_build(build_kwargs, fingerprint=fingerprint)
+    # A full payload already in memory is sliced; otherwise only the selected
+    # pages are built (and not cached, so page reads do not crowd out books).
+    cached = cache.peek(build_kwargs, fingerprint) if fingerprint is not None else None
+    if cached is not None:
+        return select_pages(cached, page_numbers)
+    return build_story_result_payload(**build_kwargs, page_numbers=page_numbers)
+
+
+def _build_progress_callback(story_id: str, tracker: JobProgressTracker) -> ProgressCallback:
+    def on_progress(event: dict[str, Any]) -> None:
+        fields = dict(event)
+        event_type = str(fields.pop("event"))
+        job_event_broker.publish(story_id, event_type, fields)
+        tracker.observe(event)
+
+    return on_progress
+
+
+def _load_existing_story(story_id: str) -> tuple[Story, str] | None:
+    story_json_path = find_story_json_path(story_id)
+    if story_json_path is None:
+        return None
+    try:
+        story = Story.model_validate_json(story_json_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    return story, story_json_path.stem.removeprefix("story_")
 
 
 def run_story_generation_job(
     story_id: str,
     request_payload: dict[str, Any],
     request_id: str | None = None,
+    resume: bool = False,
 ) -> None:
     (
         include_quiz,
@@ -269,15 +483,44 @@ def run_story_generation_job(
         story_id=story_id,
     )
 
+    cancel_token = job_cancellation_registry.register(story_id)
+    progress_tracker = JobProgressTracker(
+        write_fn=lambda progress: job_store.update_progress(story_id, progress),
+        min_interval_sec=get_settings().progress_write_interval_sec,
+    )
+    stop_watching = watch_for_cancellation(
+        token=cancel_token,
+        is_canceled_fn=lambda: _is_job_canceled(story_id),
+        interval_sec=_CANCEL_POLL_INTERVAL_SEC,
+    )
     try:
         request = StoryCreateRequest.model_validate(request_payload)
         illustration_aspect_ratio = request.generation.illustration_aspect_ratio
         cover_aspect_ratio = request.generation.illustration_cover_aspect_ratio
-        job_store.mark_running(story_id)
+        running_meta = job_store.mark_running(story_id)
+        # A rerun rewrites assets; never serve the previous run's snapshot.
+        invalidate_result_snapshot(story_id)
+        get_result_payload_cache().invalidate(story_id)
+        if running_meta.get("status") == "canceled":
+            cancel_token.cancel()
+        else:
+            job_event_broker.publish_status(story_id, running_meta)
+        pipeline_request = replace(
+            build_pipeline_request_from_story_request(request),
+            cancel_token=cancel_token,
+            progress_callback=_build_progress_callback(story_id, progress_tracker),
+        )
+        existing_story = None
+        if resume:
+            # A retried job reuses its story and every asset already on disk.
+            existing_story = _load_existing_story(story_id)
+            pipeline_request = replace(pipeline_request, illustration_skip_existing=True)
         pipeline_result = run_story_generation_pipeline(
-            request=build_pipeline_request_from_story_request(request),
+            request=pipeline_request,
             output_dir_factory=lambda _story, _story_model: get_run_dir(story_id),
             strict_assets=False,
+            existing_story=existing_story,
+            output_dir=get_run_dir(story_id),
         )
         story_json_path = pipeline_result.story_json_path
         quiz_json_path = pipeline_result.quiz_json_path
@@ -286,7 +529,7 @@ def run_story_generation_job(
         illustration_result = pipeline_result.illustration_result
         service_errors = pipeline_result.service_errors
 
-        result_payload = build_story_result_payload(
+        result_payload = build_and_store_story_result_payload(
             story_id=story_id,
             include_tts=include_tts,
             include_illustration=include_illustration,
@@ -311,7 +554,10 @@ def run_story_generation_job(
                 "illustrations": illustration_result,
             },
         }
-        job_store.mark_completed(story_id=story_id, result=result_summary)
+        job_event_broker.publish_status(
+            story_id,
+            job_store.mark_completed(story_id=story_id, result=result_summary),
+        )
         log_event(
             event="story.job.completed",
             request_id=request_id,
@@ -319,11 +565,21 @@ def run_story_generation_job(
             status="completed",
             has_partial_failures=result_payload["assets"]["has_partial_failures"],
         )
+    except GenerationCanceled:
+        # Partial TTS/illustration manifests were written by the stages; the
+        # job itself stays canceled (the API published that status already).
+        job_store.mark_canceled(story_id=story_id)
+        log_event(
+            event="story.job.aborted",
+            request_id=request_id,
+            story_id=story_id,
+            status="canceled",
+        )
     except Exception as error:
         failed_result: dict[str, Any] | None = None
         if story_json_path is not None:
             try:
-                failed_payload = build_story_result_payload(
+                failed_payload = build_and_store_story_result_payload(
                     story_id=story_id,
                     include_tts=include_tts,
                     include_illustration=include_illustration,
@@ -348,7 +604,7 @@ def run_story_generation_job(
             except Exception:
                 failed_result = None
 
-        job_store.mark_failed(
+        failed_meta = job_store.mark_failed(
             story_id=story_id,
             error={
                 "code": "GENERATION_FAILED",
@@ -357,6 +613,7 @@ def run_story_generation_job(
             },
             result=failed_result,
         )
+        job_event_broker.publish_status(story_id, failed_meta)
         log_event(
             event="story.job.failed",
             request_id=request_id,
@@ -365,3 +622,7 @@ def run_story_generation_job(
             reason=str(error),
             level=logging.ERROR,
         )
+    finally:
+        progress_tracker.flush()
+        stop_watching.set()
+        job_cancellation_registry.release(story_id, cancel_token)
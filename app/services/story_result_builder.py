@@ -1,26 +1,20 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any
 
 from app.schemas.story import AssetStatus
 from app.services.output_paths import (
-    build_outputs_url,
     ensure_outputs_dir,
-    find_quiz_json_path,
-    find_story_json_path,
-    get_run_dir,
     load_json,
     slugify,
     slugify_language_name,
-    to_outputs_url,
 )
 from app.services.result_manifests import (
-    find_manifest_asset_url,
     load_audio_manifest,
     load_illustration_manifest,
     load_vocabulary_manifest,
 )
+from app.services.run_index import RunIndex
 
 
 def _default_asset_summary(
@@ -72,30 +66,6 @@ def _derive_asset_summary_from_statuses(
     }
 
 
-def _first_existing_illustration_url(
-    run_dir: Path,
-    page_number: int,
-    static_prefix: str | None = None,
-) -> str | None:
-    illustrations_dir = run_dir / "illustrations"
-    if not illustrations_dir.is_dir():
-        return None
-    for file_path in sorted(illustrations_dir.glob(f"page_{page_number:02d}.*")):
-        if file_path.is_file() and file_path.stat().st_size > 0:
-            return to_outputs_url(file_path, prefix=static_prefix)
-    return None
-
-
-def _first_existing_cover_url(run_dir: Path, static_prefix: str | None = None) -> str | None:
-    illustrations_dir = run_dir / "illustrations"
-    if not illustrations_dir.is_dir():
-        return None
-    for file_path in sorted(illustrations_dir.glob("cover.*")):
-        if file_path.is_file() and file_path.stat().st_size > 0:
-            return to_outputs_url(file_path, prefix=static_prefix)
-    return None
-
-
 def _normalize_vocabulary_entry_id(raw_entry: dict[str, Any], index: int) -> str:
     raw_id = slugify(str(raw_entry.get("entry_id", "")).strip())
     if raw_id:
@@ -114,10 +84,7 @@ def _normalize_vocabulary_entry_id(raw_entry: dict[str, Any], index: int) -> str
 
 def _build_vocabulary_payload(
     *,
-    story_id: str,
-    run_dir: Path,
-    outputs_dir: Path,
-    static_prefix: str | None,
+    run_index: RunIndex,
     page_number: int,
     raw_entries: Any,
     vocabulary_entry_map: dict[tuple[int, str, str], dict[str, Any]],
@@ -140,23 +107,10 @@ def _build_vocabulary_payload(
             suffix += 1
         seen_ids.add(entry_id)
 
-        primary_rel = (
-            Path(story_id)
-            / "vocabulary"
-            / f"page_{page_number:02d}"
-            / f"{entry_id}_primary.wav"
-        )
-        secondary_rel = (
-            Path(story_id)
-            / "vocabulary"
-            / f"page_{page_number:02d}"
-            / f"{entry_id}_secondary.wav"
-        )
-        primary_file = outputs_dir / primary_rel
-        secondary_file = outputs_dir / secondary_rel
-
-        has_primary_audio = primary_file.exists() and primary_file.is_file()
-        has_secondary_audio = secondary_file.exists() and secondary_file.is_file()
+        primary_rel = f"vocabulary/page_{page_number:02d}/{entry_id}_primary.wav"
+        secondary_rel = f"vocabulary/page_{page_number:02d}/{entry_id}_secondary.wav"
+        has_primary_audio = run_index.has_file(primary_rel)
+        has_secondary_audio = run_index.has_file(secondary_rel)
 
         primary_manifest_entry = vocabulary_entry_map.get((page_number, entry_id, "primary"))
         secondary_manifest_entry = vocabulary_entry_map.get((page_number, entry_id, "secondary"))
@@ -164,17 +118,13 @@ def _build_vocabulary_payload(
         if primary_manifest_entry is not None:
             primary_status = primary_manifest_entry["status"]
             primary_error = primary_manifest_entry.get("error")
-            primary_url = find_manifest_asset_url(
-                run_dir=run_dir,
-                entry=primary_manifest_entry,
-                static_prefix=static_prefix,
-            )
+            primary_url = run_index.manifest_asset_url(primary_manifest_entry.get("path"))
             if primary_url is None and has_primary_audio:
-                primary_url = build_outputs_url(primary_rel, prefix=static_prefix)
+                primary_url = run_index.url(primary_rel)
         elif has_primary_audio:
             primary_status = "generated"
             primary_error = None
-            primary_url = build_outputs_url(primary_rel, prefix=static_prefix)
+            primary_url = run_index.url(primary_rel)
         else:
             primary_status = "missing" if vocabulary_manifest_exists else "not_requested"
             primary_error = None
@@ -183,17 +133,13 @@ def _build_vocabulary_payload(
         if secondary_manifest_entry is not None:
             secondary_status = secondary_manifest_entry["status"]
             secondary_error = secondary_manifest_entry.get("error")
-            secondary_url = find_manifest_asset_url(
-                run_dir=run_dir,
-                entry=secondary_manifest_entry,
-                static_prefix=static_prefix,
-            )
+            secondary_url = run_index.manifest_asset_url(secondary_manifest_entry.get("path"))
             if secondary_url is None and has_secondary_audio:
-                secondary_url = build_outputs_url(secondary_rel, prefix=static_prefix)
+                secondary_url = run_index.url(secondary_rel)
         elif has_secondary_audio:
             secondary_status = "generated"
             secondary_error = None
-            secondary_url = build_outputs_url(secondary_rel, prefix=static_prefix)
+            secondary_url = run_index.url(secondary_rel)
         else:
             secondary_status = "missing" if vocabulary_manifest_exists else "not_requested"
             secondary_error = None
@@ -232,28 +178,33 @@ def build_story_result_payload(
     job_status: str,
     service_errors: dict[str, str | None] | None = None,
     static_prefix: str | None = None,
+    page_numbers: tuple[int, ...] | None = None,
 ) -> dict[str, Any]:
-    run_dir = get_run_dir(story_id)
+    outputs_dir = ensure_outputs_dir()
+    run_dir = outputs_dir / story_id
     if not run_dir.is_dir():
         raise FileNotFoundError(f"run not found: {story_id}")
 
-    story_json_path = find_story_json_path(story_id)
-    if story_json_path is None:
+    # One scandir walk answers every existence check and URL below, so the
+    # syscall count no longer grows with pages x vocabulary entries.
+    run_index = RunIndex.scan(
+        story_id=story_id,
+        run_dir=run_dir,
+        outputs_dir=outputs_dir,
+        static_prefix=static_prefix,
+    )
+    story_json_rel = run_index.first_file("", "story_", ".json")
+    if story_json_rel is None:
         raise FileNotFoundError(f"story json not found for run: {story_id}")
 
-    story_json_url = to_outputs_url(story_json_path, prefix=static_prefix)
-    quiz_json_path = find_quiz_json_path(story_id)
-    quiz_json_url = (
-        to_outputs_url(quiz_json_path, prefix=static_prefix)
-        if quiz_json_path is not None
-        else None
-    )
-    story = load_json(story_json_path)
+    story_json_url = run_index.url(story_json_rel)
+    quiz_json_rel = run_index.first_file("", "quiz_", ".json")
+    quiz_json_url = run_index.url(quiz_json_rel) if quiz_json_rel is not None else None
+    story = load_json(run_dir / story_json_rel)
     pages = story.get("pages")
     if not isinstance(pages, list):
         raise ValueError("story json is missing a valid 'pages' list")
 
-    outputs_dir = ensure_outputs_dir()
     primary_language = str(story.get("primary_language", ""))
     secondary_language = str(story.get("secondary_language", ""))
     primary_slug = slugify_language_name(primary_language)
@@ -275,6 +226,7 @@ def build_story_result_payload(
     illustration_statuses: list[AssetStatus] = []
 
     payload_pages: list[dict[str, Any]] = []
+    story_page_count = 0
     for index, page in enumerate(pages):
         if not isinstance(page, dict):
             continue
@@ -284,18 +236,15 @@ def build_story_result_payload(
             page_number = int(raw_page_number)
         except (TypeError, ValueError):
             page_number = index + 1
+        # Unselected pages only contribute their statuses, so the asset
+        # summaries and meta.page_count still cover the whole story.
+        selected = page_numbers is None or page_number in page_numbers
+        story_page_count += 1
 
-        primary_rel = (
-            Path(story_id) / "audio" / f"01_{primary_slug}" / f"page_{page_number:02d}_primary.wav"
-        )
-        secondary_rel = (
-            Path(story_id) / "audio" / f"02_{secondary_slug}" / f"page_{page_number:02d}_secondary.wav"
-        )
-        primary_file = outputs_dir / primary_rel
-        secondary_file = outputs_dir / secondary_rel
-
-        has_primary_audio = primary_file.exists() and primary_file.is_file()
-        has_secondary_audio = secondary_file.exists() and secondary_file.is_file()
+        primary_rel = f"audio/01_{primary_slug}/page_{page_number:02d}_primary.wav"
+        secondary_rel = f"audio/02_{secondary_slug}/page_{page_number:02d}_secondary.wav"
+        has_primary_audio = run_index.has_file(primary_rel)
+        has_secondary_audio = run_index.has_file(secondary_rel)
 
         primary_manifest_entry = audio_entry_map.get((page_number, "primary"))
         secondary_manifest_entry = audio_entry_map.get((page_number, "secondary"))
@@ -338,16 +287,11 @@ def build_story_result_payload(
             if illustration_entry is not None:
                 illustration_status = illustration_entry["status"]
                 illustration_error = illustration_entry.get("error")
-                illustration_url = find_manifest_asset_url(
-                    run_dir,
-                    illustration_entry,
-                    static_prefix=static_prefix,
-                )
+                if selected:
+                    illustration_url = run_index.manifest_asset_url(illustration_entry.get("path"))
             else:
-                illustration_url = _first_existing_illustration_url(
-                    run_dir,
-                    page_number,
-                    static_prefix=static_prefix,
+                illustration_url = run_index.file_url(
+                    run_index.first_file("illustrations", f"page_{page_number:02d}.")
                 )
                 if illustration_url:
                     illustration_status = "generated"
@@ -357,11 +301,11 @@ def build_story_result_payload(
                     illustration_error = None
 
         illustration_statuses.append(illustration_status)
+        if not selected:
+            continue
+
         vocabulary_payload = _build_vocabulary_payload(
-            story_id=story_id,
-            run_dir=run_dir,
-            outputs_dir=outputs_dir,
-            static_prefix=static_prefix,
+            run_index=run_index,
             page_number=page_number,
             raw_entries=page.get("vocabulary", []),
             vocabulary_entry_map=vocabulary_entry_map,
@@ -373,16 +317,8 @@ def build_story_result_payload(
                 "page_number": page_number,
                 "text_primary": str(page.get("text_primary", "")),
                 "text_secondary": str(page.get("text_secondary", "")),
-                "audio_primary_url": (
-                    build_outputs_url(primary_rel, prefix=static_prefix)
-                    if has_primary_audio
-                    else None
-                ),
-                "audio_secondary_url": (
-                    build_outputs_url(secondary_rel, prefix=static_prefix)
-                    if has_secondary_audio
-                    else None
-                ),
+                "audio_primary_url": run_index.file_url(primary_rel),
+                "audio_secondary_url": run_index.file_url(secondary_rel),
                 "illustration_url": illustration_url,
                 "audio_primary_status": primary_status,
                 "audio_primary_error": primary_error,
@@ -449,13 +385,9 @@ def build_story_result_payload(
         if cover_manifest_entry is not None:
             cover_status = cover_manifest_entry["status"]
             cover_error = cover_manifest_entry.get("error")
-            cover_url = find_manifest_asset_url(
-                run_dir,
-                cover_manifest_entry,
-                static_prefix=static_prefix,
-            )
+            cover_url = run_index.manifest_asset_url(cover_manifest_entry.get("path"))
         else:
-            cover_url = _first_existing_cover_url(run_dir, static_prefix=static_prefix)
+            cover_url = run_index.file_url(run_index.first_file("illustrations", "cover."))
             if cover_url:
                 cover_status = "generated"
                 cover_error = None
@@ -504,7 +436,7 @@ def build_story_result_payload(
             "title_secondary": str(story.get("title_secondary", "")),
             "primary_language": primary_language,
             "secondary_language": secondary_language,
-            "page_count": len(payload_pages),
+            "page_count": story_page_count,
         },
         "pages": payload_pages,
     }
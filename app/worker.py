@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+from typing import Any, Callable
+
+from app.core.config import get_settings
+from app.services.job_events import job_event_broker
+from app.services.job_queue import LeasedJob, SQLiteJobQueue, get_job_queue
+from app.services.request_context import log_event
+from app.services.story_orchestrator import job_store, run_story_generation_job
+
+
+def build_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class QueueWorker:
+    """Claims jobs from the durable queue and runs them on worker threads.
+
+    Runs embedded in the API process or standalone via ``python -m app.worker``;
+    any number of workers may share one queue file.
+    """
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        max_concurrent_jobs: int = 1,
+        poll_interval_sec: float = 1.0,
+        run_job: Callable[..., Any] = run_story_generation_job,
+        worker_id: str | None = None,
+        max_heavy_running: int | None = None,
+    ) -> None:
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1.")
+        self.queue = queue
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.poll_interval_sec = poll_interval_sec
+        self.run_job = run_job
+        self.worker_id = worker_id or build_worker_id()
+        # Shared across every worker on the queue file, not per process.
+        self.max_heavy_running = max_heavy_running
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def recover(self) -> None:
+        """Requeue jobs orphaned by a dead worker; fail the ones out of attempts."""
+        recovery = self.queue.recover_orphans()
+        for story_id in recovery.requeued:
+            job_event_broker.publish_status(story_id, job_store.mark_queued(story_id))
+            log_event(event="story.job.recovered", story_id=story_id, status="queued")
+        for story_id in recovery.exhausted:
+            self._fail_exhausted(
+                story_id,
+                message="story generation job was interrupted too many times",
+            )
+
+    def _fail_exhausted(self, story_id: str, message: str, last_error: str | None = None) -> None:
+        """Mirror a job the queue buried into its meta, which would otherwise stay active."""
+        detail: dict[str, Any] = {"max_attempts": self.queue.max_attempts}
+        if last_error is not None:
+            detail["last_error"] = last_error
+        failed_meta = job_store.mark_failed(
+            story_id=story_id,
+            error={"code": "JOB_ATTEMPTS_EXHAUSTED", "message": message, "detail": detail},
+        )
+        job_event_broker.publish_status(story_id, failed_meta)
+        log_event(
+            event="story.job.failed",
+            story_id=story_id,
+            status="failed",
+            reason="attempts exhausted",
+            level=logging.ERROR,
+        )
+
+    def run_once(self) -> bool:
+        job = self.queue.claim(self.worker_id, max_heavy_running=self.max_heavy_running)
+        if job is None:
+            return False
+        self._run(job)
+        return True
+
+    def _run(self, job: LeasedJob) -> None:
+        stop_heartbeat = threading.Event()
+
+        def heartbeat() -> None:
+            while not stop_heartbeat.wait(self.queue.lease_sec / 3):
+                if not self.queue.heartbeat(job.story_id, self.worker_id):
+                    return
+
+        threading.Thread(
+            target=heartbeat,
+            name=f"moretale-heartbeat-{job.story_id}",
+            daemon=True,
+        ).start()
+        log_event(
+            event="story.job.claimed",
+            request_id=job.request_id,
+            story_id=job.story_id,
+            attempt=job.attempts,
+        )
+        try:
+            self.run_job(
+                story_id=job.story_id,
+                request_payload=job.request_payload,
+                request_id=job.request_id,
+                resume=job.is_retry,
+            )
+        except Exception as error:
+            if self.queue.release(job.story_id, self.worker_id, error=str(error)):
+                self._fail_exhausted(
+                    job.story_id,
+                    message="story generation job failed on every attempt",
+                    last_error=str(error),
+                )
+            raise
+        else:
+            self.queue.complete(job.story_id, self.worker_id)
+        finally:
+            stop_heartbeat.set()
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                ran = self.run_once()
+                if not ran:
+                    # Idle: pick up leases that expired since the last poll.
+                    self.recover()
+            except Exception as error:
+                log_event(
+                    event="worker.job.error",
+                    reason=str(error),
+                    level=logging.ERROR,
+                )
+                ran = False
+            if not ran:
+                self._stop_event.wait(self.poll_interval_sec)
+
+    def start(self) -> None:
+        self.recover()
+        for index in range(self.max_concurrent_jobs):
+            thread = threading.Thread(
+                target=self._loop,
+                name=f"moretale-worker-{index + 1}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop_event.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def wait(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run MoreTale story generation workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_settings().job_executor_max_workers,
+        help="Number of jobs this process runs at once.",
+    )
+    parser.add_argument(
+        "--poll_interval_sec",
+        type=float,
+        default=1.0,
+        help="Seconds to wait between polls when the queue is empty.",
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(level=logging.INFO)
+    worker = QueueWorker(
+        queue=get_job_queue(),
+        max_concurrent_jobs=args.workers,
+        poll_interval_sec=args.poll_interval_sec,
+        max_heavy_running=get_settings().scheduler_max_heavy_jobs,
+    )
+
+    def handle_signal(_signum: int, _frame: Any) -> None:
+        # Running jobs finish; anything cut short by a hard kill is picked up
+        # again once its lease expires.
+        worker.stop(wait=False)
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    log_event(event="worker.start", worker_id=worker.worker_id, workers=args.workers)
+    worker.start()
+    worker.wait()
+    log_event(event="worker.stop", worker_id=worker.worker_id)
+
+
+if __name__ == "__main__":
+    main()
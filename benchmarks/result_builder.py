@@ -0,0 +1,234 @@
+"""Count filesystem syscalls and time of one result payload build.
+
+Builds a synthetic finished run (32 pages with audio, illustrations, cover
+and vocabulary audio) in a temporary outputs dir and reports how many
+stat/lstat/scandir/mkdir/open calls ``build_story_result_payload`` makes.
+``DirEntry.stat()`` is counted too (as ``DirEntry.stat``): it is a method of
+the entries ``os.scandir`` yields, not an ``os`` function, so the scandir
+results are wrapped to see it. ``DirEntry.is_dir()``/``is_file()`` answer
+from the directory listing on Linux and are not counted.
+
+    python -m benchmarks.result_builder --vocabulary-per-page 3 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+_COUNTED_CALLS = ("stat", "lstat", "scandir", "mkdir", "listdir")
+
+
+class _CountedDirEntry:
+    def __init__(self, entry: os.DirEntry, counts: Counter) -> None:
+        self._entry = entry
+        self._counts = counts
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return os.fspath(self._entry)
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._counts["DirEntry.stat"] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _CountedScandir:
+    def __init__(self, iterator, counts: Counter) -> None:
+        self._iterator = iterator
+        self._counts = counts
+
+    def __enter__(self) -> "_CountedScandir":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._iterator.close()
+
+    def __iter__(self) -> "_CountedScandir":
+        return self
+
+    def __next__(self) -> _CountedDirEntry:
+        return _CountedDirEntry(next(self._iterator), self._counts)
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+@contextmanager
+def count_syscalls() -> Iterator[Counter]:
+    counts: Counter = Counter()
+    patches = []
+    for name in _COUNTED_CALLS:
+        original = getattr(os, name)
+
+        def counted(*args, _name=name, _original=original, **kwargs):
+            counts[_name] += 1
+            result = _original(*args, **kwargs)
+            return _CountedScandir(result, counts) if _name == "scandir" else result
+
+        patches.append(patch.object(os, name, counted))
+    original_open = builtins.open
+
+    def counted_open(*args, **kwargs):
+        counts["open"] += 1
+        return original_open(*args, **kwargs)
+
+    patches.append(patch.object(builtins, "open", counted_open))
+    patches.append(patch("io.open", counted_open))
+    for active in patches:
+        active.start()
+    try:
+        yield counts
+    finally:
+        for active in reversed(patches):
+            active.stop()
+
+
+def _write(path: Path, data: bytes | str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        path.write_text(data, encoding="utf-8")
+    else:
+        path.write_bytes(data)
+
+
+def build_fake_run(run_dir: Path, *, page_count: int, vocabulary_per_page: int) -> None:
+    pages = []
+    audio_entries = []
+    illustration_entries = []
+    vocabulary_entries = []
+    for number in range(1, page_count + 1):
+        vocabulary = [
+            {
+                "entry_id": f"word-{number}-{index}",
+                "primary_word": f"word {index}",
+                "secondary_word": f"단어 {index}",
+                "primary_definition": "definition",
+                "secondary_definition": "정의",
+            }
+            for index in range(1, vocabulary_per_page + 1)
+        ]
+        pages.append(
+            {
+                "page_number": number,
+                "text_primary": f"Primary {number}",
+                "text_secondary": f"Secondary {number}",
+                "illustration_prompt": f"Prompt {number}",
+                "illustration_scene_prompt": f"Scene {number}",
+                "vocabulary": vocabulary,
+            }
+        )
+        for role, folder in (("primary", "01_korean"), ("secondary", "02_english")):
+            path = run_dir / "audio" / folder / f"page_{number:02d}_{role}.wav"
+            _write(path, b"RIFF")
+            audio_entries.append(
+                {"page_number": number, "role": role, "path": str(path), "status": "generated"}
+            )
+        image_path = run_dir / "illustrations" / f"page_{number:02d}.png"
+        _write(image_path, b"png")
+        illustration_entries.append(
+            {
+                "asset_type": "page",
+                "page_number": number,
+                "status": "generated",
+                "path": str(image_path),
+            }
+        )
+        for entry in vocabulary:
+            for role in ("primary", "secondary"):
+                path = (
+                    run_dir / "vocabulary" / f"page_{number:02d}" / f"{entry['entry_id']}_{role}.wav"
+                )
+                _write(path, b"RIFF")
+                vocabulary_entries.append(
+                    {
+                        "page_number": number,
+                        "entry_id": entry["entry_id"],
+                        "role": role,
+                        "path": str(path),
+                        "status": "generated",
+                    }
+                )
+    cover_path = run_dir / "illustrations" / "cover.png"
+    _write(cover_path, b"png")
+    illustration_entries.append(
+        {"asset_type": "cover", "status": "generated", "path": str(cover_path)}
+    )
+
+    story = {
+        "title_primary": "Title",
+        "title_secondary": "제목",
+        "primary_language": "Korean",
+        "secondary_language": "English",
+        "cover_illustration_prompt": "Cover",
+        "pages": pages,
+    }
+    _write(run_dir / "story_gemini-2.5-flash.json", json.dumps(story))
+    summary = {"total_tasks": 0, "generated": 0, "skipped": 0, "failed": 0}
+    _write(run_dir / "audio" / "manifest.json", json.dumps({**summary, "entries": audio_entries}))
+    _write(
+        run_dir / "illustrations" / "manifest.json",
+        json.dumps({**summary, "entries": illustration_entries}),
+    )
+    _write(run_dir / "vocabulary" / "manifest.json", json.dumps({"entries": vocabulary_entries}))
+
+
+def run(page_count: int, vocabulary_per_page: int, repeat: int) -> dict[str, object]:
+    with tempfile.TemporaryDirectory() as outputs_dir:
+        with patch.dict(os.environ, {"MORETALE_OUTPUTS_DIR": outputs_dir}):
+            from app.services.story_result_builder import build_story_result_payload
+
+            story_id = "benchmark_story"
+            build_fake_run(
+                Path(outputs_dir) / story_id,
+                page_count=page_count,
+                vocabulary_per_page=vocabulary_per_page,
+            )
+            build_kwargs = {
+                "story_id": story_id,
+                "include_tts": True,
+                "include_illustration": True,
+                "include_cover_illustration": True,
+                "illustration_aspect_ratio": "1:1",
+                "cover_aspect_ratio": "5:4",
+                "job_status": "completed",
+            }
+            with count_syscalls() as counts:
+                build_story_result_payload(**build_kwargs)
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                build_story_result_payload(**build_kwargs)
+            elapsed_ms = (time.perf_counter() - started) * 1000 / max(1, repeat)
+
+    return {
+        "pages": page_count,
+        "vocabulary_per_page": vocabulary_per_page,
+        "syscalls": sum(counts.values()),
+        "by_call": dict(sorted(counts.items())),
+        "ms_per_build": round(elapsed_ms, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--vocabulary-per-page", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.pages, args.vocabulary_per_page, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from .cancellation import CancellationToken, GenerationCanceled
+from .content_cache import ContentCache, content_key
+from .llm_cache import LLMCacheMiss, LLMResponseCache, get_llm_response_cache
+from .progress import ProgressCallback, report_progress
+from .quota import ProviderQuota, QuotaLimits, get_provider_quota
+from .rate_limit import TokenBucket
+from .repair_stats import RepairStats, get_repair_stats, repair_stats_snapshot
+from .structured_output import response_items
+
+__all__ = [
+    "CancellationToken",
+    "ContentCache",
+    "GenerationCanceled",
+    "LLMCacheMiss",
+    "LLMResponseCache",
+    "ProgressCallback",
+    "ProviderQuota",
+    "QuotaLimits",
+    "RepairStats",
+    "TokenBucket",
+    "content_key",
+    "get_llm_response_cache",
+    "get_provider_quota",
+    "get_repair_stats",
+    "repair_stats_snapshot",
+    "report_progress",
+    "response_items",
+]
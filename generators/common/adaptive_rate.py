@@ -0,0 +1,165 @@
+import random
+import re
+import threading
+import time
+from typing import Any, Callable
+
+from .rate_limit import TokenBucket
+
+DEFAULT_CEILING_FACTOR = 4.0
+DEFAULT_FLOOR_FACTOR = 0.125
+_RETRY_DELAY_PATTERN = re.compile(
+    r"(?:retryDelay['\"]?\s*[:=]\s*['\"]?|retry in\s+)(\d+(?:\.\d+)?)\s*s",
+    re.IGNORECASE,
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    if getattr(error, "code", None) == 429:
+        return True
+    if str(getattr(error, "status", "") or "").upper() == "RESOURCE_EXHAUSTED":
+        return True
+    message = str(error)
+    return "RESOURCE_EXHAUSTED" in message or message.startswith("429 ")
+
+
+def _parse_duration_sec(raw: Any) -> float | None:
+    if isinstance(raw, (int, float)):
+        return float(raw) if raw >= 0 else None
+    text = str(raw or "").strip().lower()
+    if text.endswith("s"):
+        text = text[:-1]
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def extract_retry_delay(error: BaseException) -> float | None:
+    """Return the server-requested retry delay carried by a google-genai error.
+
+    Checks the structured ``google.rpc.RetryInfo`` detail, then a
+    ``Retry-After`` response header, then the error text.
+    """
+    details = getattr(error, "details", None)
+    payload = details.get("error", details) if isinstance(details, dict) else None
+    if isinstance(payload, dict):
+        for item in payload.get("details") or []:
+            if isinstance(item, dict) and "retryDelay" in item:
+                delay = _parse_duration_sec(item.get("retryDelay"))
+                if delay is not None:
+                    return delay
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is not None:
+        try:
+            delay = _parse_duration_sec(headers.get("Retry-After"))
+        except Exception:
+            delay = None
+        if delay is not None:
+            return delay
+
+    match = _RETRY_DELAY_PATTERN.search(str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def compute_backoff_delay(
+    base_delay: float,
+    retry_after: float | None = None,
+    rng: random.Random | None = None,
+) -> float:
+    """Jittered wait before the next attempt.
+
+    A server-provided delay is honored and only padded slightly so that
+    callers released at the same time do not retry in lockstep; otherwise
+    "equal jitter" keeps the wait between half and all of ``base_delay``.
+    """
+    generator = rng or random
+    if retry_after is not None:
+        return retry_after + generator.uniform(0.0, min(1.0, 0.1 * retry_after + 0.1))
+    return generator.uniform(base_delay / 2.0, base_delay)
+
+
+class AdaptiveRateController:
+    """AIMD pacing around a TokenBucket.
+
+    Every success raises the rate additively up to a ceiling; every 429 /
+    RESOURCE_EXHAUSTED cuts it multiplicatively down to a floor and pauses all
+    callers for the server-provided retry delay. With ``adaptive=False`` the
+    rate stays fixed and only the shared pause is applied, which is also all
+    that happens when there is no bucket (unpaced callers).
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket | None,
+        adaptive: bool = False,
+        min_requests_per_minute: float | None = None,
+        max_requests_per_minute: float | None = None,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+        monotonic_fn: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < multiplicative_decrease < 1:
+            raise ValueError("multiplicative_decrease must be between 0 and 1.")
+        initial = bucket.requests_per_minute if bucket is not None else 0.0
+        self.bucket = bucket
+        self.adaptive = adaptive and bucket is not None
+        self.min_requests_per_minute = min_requests_per_minute or initial * DEFAULT_FLOOR_FACTOR
+        self.max_requests_per_minute = max(
+            max_requests_per_minute or initial * DEFAULT_CEILING_FACTOR,
+            initial,
+        )
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self._monotonic_fn = monotonic_fn
+        self._lock = threading.Lock()
+        self._paused_until: float | None = None
+
+    @property
+    def requests_per_minute(self) -> float | None:
+        return self.bucket.requests_per_minute if self.bucket is not None else None
+
+    def acquire(
+        self,
+        sleep_fn: Callable[[float], None] = time.sleep,
+        now: float | None = None,
+    ) -> float:
+        current = self._monotonic_fn() if now is None else now
+        with self._lock:
+            paused_until = self._paused_until
+        pause_sec = max(0.0, paused_until - current) if paused_until is not None else 0.0
+        if pause_sec > 0:
+            sleep_fn(pause_sec)
+            current += pause_sec
+        if self.bucket is None:
+            return pause_sec
+        return pause_sec + self.bucket.acquire(sleep_fn=sleep_fn, now=current)
+
+    def on_success(self) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self.bucket.set_rate(
+                min(
+                    self.max_requests_per_minute,
+                    self.bucket.requests_per_minute + self.additive_increase,
+                )
+            )
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            if retry_after:
+                resume_at = self._monotonic_fn() + retry_after
+                if self._paused_until is None or resume_at > self._paused_until:
+                    self._paused_until = resume_at
+            if self.adaptive:
+                self.bucket.set_rate(
+                    max(
+                        self.min_requests_per_minute,
+                        self.bucket.requests_per_minute * self.multiplicative_decrease,
+                    )
+                )
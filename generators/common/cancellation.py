@@ -0,0 +1,49 @@
+import threading
+
+
+class GenerationCanceled(BaseException):
+    """Raised when a job's cancellation token fires.
+
+    Derives from ``BaseException`` (like ``asyncio.CancelledError``) so the
+    per-page/per-task ``except Exception`` handlers record real failures but
+    never swallow a cancellation.
+    """
+
+
+class CancellationToken:
+    """Thread-safe, one-way cancellation flag shared by every stage of a job."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._children: list["CancellationToken"] = []
+
+    @property
+    def is_canceled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            children, self._children = self._children, []
+        for child in children:
+            child.cancel()
+
+    def child(self) -> "CancellationToken":
+        """A token that fires with this one but can also be canceled on its own."""
+        token = CancellationToken()
+        with self._lock:
+            if not self._event.is_set():
+                self._children.append(token)
+                return token
+        token.cancel()
+        return token
+
+    def raise_if_canceled(self) -> None:
+        if self._event.is_set():
+            raise GenerationCanceled("generation canceled")
+
+    def sleep(self, seconds: float) -> None:
+        """Drop-in for ``time.sleep`` that wakes up and raises on cancel."""
+        if self._event.wait(timeout=max(0.0, seconds)):
+            raise GenerationCanceled("generation canceled")
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts coordinate in-process only
+    fcntl = None
+
+_LOCK_FILE = ".lock"
+_BYTES_PER_MB = 1024 * 1024
+# Writes from other processes are not seen by the running size estimate, so
+# the directory is rescanned at least this often.
+_RESCAN_EVERY_WRITES = 64
+
+
+def content_key(*parts: object) -> str:
+    """Hash the parts that determine a generated asset into a cache key."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def write_bytes_atomic(path: str | Path, data: bytes) -> None:
+    """Write ``data`` through a temporary file and rename it over ``path``.
+
+    Renaming replaces the directory entry instead of truncating the existing
+    inode, so a file hardlinked from a content cache is never overwritten.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class ContentCache:
+    """Size-bounded, content-addressed file cache shared by every job on a host.
+
+    Entries are immutable files named after their key. Reads refresh the
+    entry's mtime and eviction removes the oldest entries first, which gives
+    LRU order across processes without a shared index. Writes go through a
+    temporary file and ``os.replace``, so concurrent writers of the same key
+    are safe and readers never see a partial entry.
+
+    Scanning the whole cache on every write would cost a stat per entry, so
+    each instance keeps a running size estimate from its last scan plus its
+    own writes, and only evicts once that estimate exceeds ``max_bytes`` or
+    after ``_RESCAN_EVERY_WRITES`` writes.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._estimated_bytes: int | None = None
+        self._writes_since_scan = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str, suffix: str = "") -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def lookup(self, key: str, suffix: str = "") -> Path | None:
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def remove(self, key: str, suffix: str = "") -> None:
+        self.path_for(key, suffix).unlink(missing_ok=True)
+
+    def put_bytes(self, key: str, data: bytes, suffix: str = "") -> Path:
+        path = self.path_for(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(path, data)
+        self._note_write(len(data))
+        return path
+
+    def put_file(self, key: str, source: str | Path, suffix: str = "") -> Path:
+        path = self.path_for(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            # Copy rather than link: the source stays writable by its owner.
+            shutil.copyfile(source, tmp_path)
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._note_write(size)
+        return path
+
+    def materialize(self, cached_path: str | Path, destination: str | Path) -> bool:
+        """Hardlink (or copy) a cache entry to ``destination``.
+
+        Returns False when the entry was evicted in the meantime, so callers
+        can fall back to generating the asset.
+        """
+        destination = Path(destination)
+        tmp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            try:
+                os.link(cached_path, tmp_path)
+            except FileNotFoundError:
+                return False
+            except OSError:
+                # Cross-device or no hardlink support.
+                shutil.copyfile(cached_path, tmp_path)
+            os.replace(tmp_path, destination)
+        except FileNotFoundError:
+            tmp_path.unlink(missing_ok=True)
+            return False
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return True
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        with self._exclusive():
+            entries: list[tuple[float, int, Path]] = []
+            total = 0
+            for shard in _scandir(self.root):
+                if not shard.is_dir(follow_symlinks=False):
+                    continue
+                for entry in _scandir(shard.path):
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+                    total += stat.st_size
+
+            removed = 0
+            entries.sort(key=lambda item: item[0])
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            # self._lock is held by _exclusive().
+            self._estimated_bytes = total
+            self._writes_since_scan = 0
+            return removed
+
+    def _note_write(self, size: int) -> None:
+        with self._lock:
+            self._writes_since_scan += 1
+            if self._estimated_bytes is not None:
+                self._estimated_bytes += size
+            due = (
+                self._estimated_bytes is None
+                or self._estimated_bytes > self.max_bytes
+                or self._writes_since_scan >= _RESCAN_EVERY_WRITES
+            )
+        if due:
+            self.evict()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self.root / _LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+def _scandir(path: str | Path) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as iterator:
+            return list(iterator)
+    except FileNotFoundError:
+        return []
+
+
+def cache_from_env(dir_env: str, max_mb_env: str, default_max_mb: int) -> ContentCache | None:
+    """Build a cache from ``dir_env``; caching is off while it is unset."""
+    root = (os.getenv(dir_env) or "").strip()
+    if not root:
+        return None
+    raw_max_mb = (os.getenv(max_mb_env) or "").strip()
+    try:
+        max_mb = float(raw_max_mb) if raw_max_mb else float(default_max_mb)
+    except ValueError as exc:
+        raise ValueError(f"{max_mb_env} must be a number of megabytes") from exc
+    return ContentCache(root, max_bytes=int(max_mb * _BYTES_PER_MB))
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .content_cache import ContentCache, content_key
+
+LLM_CACHE_MODE_ENV = "MORETALE_LLM_CACHE_MODE"
+LLM_CACHE_DIR_ENV = "MORETALE_LLM_CACHE_DIR"
+LLM_CACHE_TTL_SEC_ENV = "MORETALE_LLM_CACHE_TTL_SEC"
+LLM_CACHE_MAX_MB_ENV = "MORETALE_LLM_CACHE_MAX_MB"
+LLM_CACHE_MODES = ("off", "record", "replay")
+_DEFAULT_TTL_SEC = 7 * 24 * 60 * 60
+_DEFAULT_MAX_MB = 256
+_SUFFIX = ".json"
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when no recorded response exists for a call."""
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Stand-in for a ``generate_content`` response served from the cache."""
+
+    text: str
+    parsed: Any = None
+
+
+def _schema_fingerprint(response_schema: Any) -> str:
+    name = getattr(response_schema, "__name__", str(response_schema))
+    schema_fn = getattr(response_schema, "model_json_schema", None)
+    schema = json.dumps(schema_fn(), sort_keys=True) if callable(schema_fn) else ""
+    return f"{name}:{hashlib.sha256(schema.encode('utf-8')).hexdigest()[:16]}"
+
+
+class LLMResponseCache:
+    """Record/replay cache for structured text-model calls.
+
+    ``record`` serves recorded responses and records new ones; ``replay``
+    only serves recorded responses and raises ``LLMCacheMiss`` instead of
+    calling the model. Entries expire after ``ttl_sec`` and the store is
+    size-bounded with LRU eviction.
+
+    Callers record a response only once it has validated and ``evict`` a
+    served one that fails validation; a bad reply is never replayed into a
+    repair round or a retried job.
+    """
+
+    def __init__(
+        self,
+        cache: ContentCache,
+        *,
+        mode: str = "record",
+        ttl_sec: float | None = None,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported LLM cache mode: {mode}")
+        self.cache = cache
+        self.mode = mode
+        self.ttl_sec = ttl_sec
+
+    @staticmethod
+    def build_key(
+        *,
+        model_name: str,
+        system_instruction: str,
+        user_prompt: str,
+        response_schema: Any,
+    ) -> str:
+        return content_key(
+            "llm",
+            model_name,
+            hashlib.sha256(system_instruction.encode("utf-8")).hexdigest(),
+            user_prompt,
+            _schema_fingerprint(response_schema),
+        )
+
+    def lookup(self, key: str) -> str | None:
+        """Return the recorded text, or None if the call must go to the model."""
+        text = self._read(key)
+        if text is None and self.mode == "replay":
+            raise LLMCacheMiss(f"No recorded LLM response for key {key[:12]}")
+        return text
+
+    def record(self, key: str, response: Any) -> None:
+        """Store a validated response (or its text); a no-op in replay mode.
+
+        A response served from the cache, or a key that still has a valid
+        entry, is left alone: rewriting it would restart its TTL and pay for
+        a cache write on every hit.
+        """
+        if self.mode != "record" or isinstance(response, CachedResponse):
+            return
+        text = _response_text(response)
+        if not text or self._read(key) is not None:
+            return
+        payload = json.dumps({"created_at": time.time(), "text": text}, ensure_ascii=False)
+        try:
+            self.cache.put_bytes(key, payload.encode("utf-8"), _SUFFIX)
+        except OSError as error:
+            print(f"[warn] LLM cache write failed error={error}")
+
+    def evict(self, key: str) -> None:
+        """Drop an entry whose response failed validation; replay fixtures are kept."""
+        if self.mode == "record":
+            self.cache.remove(key, _SUFFIX)
+
+    def fetch(self, key: str, request_fn: Callable[[], Any]) -> Any:
+        """Serve ``key`` from the cache, or call ``request_fn``.
+
+        Nothing is recorded here: the caller records the response once it
+        has validated.
+        """
+        text = self.lookup(key)
+        if text is not None:
+            return CachedResponse(text=text)
+        return request_fn()
+
+    def _read(self, key: str) -> str | None:
+        path = self.cache.lookup(key, _SUFFIX)
+        if path is None:
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("text"), str):
+            return None
+        created_at = data.get("created_at")
+        if self.ttl_sec is not None and (
+            not isinstance(created_at, (int, float)) or time.time() - created_at > self.ttl_sec
+        ):
+            return None
+        return data["text"]
+
+
+def _response_text(response: Any) -> str | None:
+    if isinstance(response, str):
+        return response
+    text = getattr(response, "text", None)
+    if text:
+        return text
+    parsed = getattr(response, "parsed", None)
+    dump_json = getattr(parsed, "model_dump_json", None)
+    return dump_json() if callable(dump_json) else None
+
+
+def _parse_float_env(name: str, default: float) -> float:
+    raw_value = (os.getenv(name) or "").strip()
+    if not raw_value:
+        return default
+    try:
+        return float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be a number") from exc
+
+
+def get_llm_response_cache() -> LLMResponseCache | None:
+    """Build the cache from ``MORETALE_LLM_CACHE_*``; returns None while it is off."""
+    mode = (os.getenv(LLM_CACHE_MODE_ENV) or "off").strip().lower()
+    if mode not in LLM_CACHE_MODES:
+        raise ValueError(f"{LLM_CACHE_MODE_ENV} must be one of {', '.join(LLM_CACHE_MODES)}")
+    if mode == "off":
+        return None
+    root = (os.getenv(LLM_CACHE_DIR_ENV) or "").strip()
+    ttl_sec = _parse_float_env(LLM_CACHE_TTL_SEC_ENV, _DEFAULT_TTL_SEC)
+    max_mb = _parse_float_env(LLM_CACHE_MAX_MB_ENV, _DEFAULT_MAX_MB)
+    cache = ContentCache(
+        Path(root) if root else Path(tempfile.gettempdir()) / "moretale-llm-cache",
+        max_bytes=int(max_mb * 1024 * 1024),
+    )
+    return LLMResponseCache(cache, mode=mode, ttl_sec=ttl_sec if ttl_sec > 0 else None)
@@ -0,0 +1,17 @@
+from typing import Any, Callable
+
+ProgressCallback = Callable[[dict[str, Any]], None]
+
+
+def report_progress(callback: ProgressCallback | None, event: str, **fields: Any) -> None:
+    """Send one progress event to ``callback``, if any.
+
+    Listeners run on the generator's worker threads. A failing listener is
+    ignored so progress reporting can never break a generation job.
+    """
+    if callback is None:
+        return
+    try:
+        callback({"event": event, **fields})
+    except Exception:
+        pass
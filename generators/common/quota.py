@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .cancellation import CancellationToken
+from .rate_limit import TokenBucket, reserve_slot
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts coordinate in-process only
+    fcntl = None
+
+QUOTA_LIMITS_ENV = "MORETALE_QUOTA_LIMITS"
+QUOTA_DIR_ENV = "MORETALE_QUOTA_DIR"
+_WILDCARD_MODEL = "*"
+_SLOT_POLL_SEC = 0.05
+# A persisted schedule further ahead than this cannot come from real queued
+# callers; it is left over from a wall-clock step and is discarded.
+_MAX_SCHEDULE_AHEAD_SEC = 3600.0
+
+
+@dataclass(frozen=True)
+class QuotaLimits:
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    max_concurrency: int | None = None
+
+    @property
+    def is_unlimited(self) -> bool:
+        return (
+            self.requests_per_minute is None
+            and self.tokens_per_minute is None
+            and self.max_concurrency is None
+        )
+
+
+def estimate_tokens(*texts: str | None) -> int:
+    # Rough chars/4 heuristic; good enough to keep a TPM budget honest.
+    return sum(len(text) for text in texts if text) // 4 + 1
+
+
+def _positive_or_none(value) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def load_quota_limits(model_name: str) -> QuotaLimits:
+    """Read limits for ``model_name`` from ``MORETALE_QUOTA_LIMITS``.
+
+    The variable holds a JSON object keyed by model name (``"*"`` is the
+    fallback), e.g. ``{"gemini-2.5-flash": {"rpm": 10, "tpm": 250000,
+    "concurrency": 4}}``. Unset or invalid configuration means unlimited.
+    """
+    raw = (os.getenv(QUOTA_LIMITS_ENV) or "").strip()
+    if not raw:
+        return QuotaLimits()
+    try:
+        config = json.loads(raw)
+    except ValueError:
+        return QuotaLimits()
+    if not isinstance(config, dict):
+        return QuotaLimits()
+
+    model_config = config.get(model_name, config.get(_WILDCARD_MODEL))
+    if not isinstance(model_config, dict):
+        return QuotaLimits()
+
+    concurrency = _positive_or_none(model_config.get("concurrency"))
+    return QuotaLimits(
+        requests_per_minute=_positive_or_none(model_config.get("rpm")),
+        tokens_per_minute=_positive_or_none(model_config.get("tpm")),
+        max_concurrency=int(concurrency) if concurrency is not None else None,
+    )
+
+
+def _default_state_dir() -> Path | None:
+    if fcntl is None:
+        return None
+    override = (os.getenv(QUOTA_DIR_ENV) or "").strip()
+    return Path(override) if override else Path(tempfile.gettempdir()) / "moretale-quota"
+
+
+def _fresh_schedule(next_free_at, now: float) -> float | None:
+    if not isinstance(next_free_at, (int, float)):
+        return None
+    return next_free_at if next_free_at - now <= _MAX_SCHEDULE_AHEAD_SEC else None
+
+
+class ProviderQuota:
+    """Outbound RPM/TPM/concurrency budget for one (API key, model) pair.
+
+    With a ``state_dir`` the budget is coordinated through ``flock``-guarded
+    files, so every process on the host (e.g. uvicorn workers) shares it.
+    Without one, coordination is limited to the current process.
+    """
+
+    def __init__(
+        self,
+        quota_id: str,
+        limits: QuotaLimits,
+        state_dir: Path | None = None,
+        monotonic_fn: Callable[[], float] = time.monotonic,
+        sleep_fn: Callable[[float], None] = time.sleep,
+        wall_clock_fn: Callable[[], float] = time.time,
+    ):
+        self.quota_id = quota_id
+        self.limits = limits
+        self.state_dir = state_dir if fcntl is not None else None
+        self._monotonic_fn = monotonic_fn
+        self._wall_clock_fn = wall_clock_fn
+        self._sleep_fn = sleep_fn
+        self._request_bucket = (
+            TokenBucket(limits.requests_per_minute, monotonic_fn=monotonic_fn)
+            if limits.requests_per_minute
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(
+                limits.tokens_per_minute,
+                capacity=limits.tokens_per_minute,
+                monotonic_fn=monotonic_fn,
+            )
+            if limits.tokens_per_minute
+            else None
+        )
+        self._semaphore = (
+            threading.BoundedSemaphore(limits.max_concurrency)
+            if limits.max_concurrency
+            else None
+        )
+        if self.state_dir is not None and not limits.is_unlimited:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def slot(
+        self,
+        estimated_tokens: int = 0,
+        cancel_token: CancellationToken | None = None,
+    ) -> Iterator[None]:
+        """Wait for the rate budget, then hold a concurrency slot for the call.
+
+        The rate wait comes first so no slot sits idle through it. With a
+        ``cancel_token`` both waits raise ``GenerationCanceled`` on cancel.
+        """
+        if self.limits.is_unlimited:
+            yield
+            return
+
+        sleep_fn = cancel_token.sleep if cancel_token is not None else self._sleep_fn
+        wait_sec = self._reserve_rate(estimated_tokens)
+        if wait_sec > 0:
+            sleep_fn(wait_sec)
+        release = self._acquire_concurrency(cancel_token, sleep_fn)
+        try:
+            yield
+        finally:
+            release()
+
+    def _reserve_rate(self, estimated_tokens: int) -> float:
+        if self.state_dir is None:
+            waits = [0.0]
+            if self._request_bucket is not None:
+                waits.append(self._request_bucket.reserve())
+            if self._token_bucket is not None and estimated_tokens > 0:
+                waits.append(self._token_bucket.reserve(cost=estimated_tokens))
+            return max(waits)
+        return self._reserve_rate_shared(estimated_tokens)
+
+    def _reserve_rate_shared(self, estimated_tokens: int) -> float:
+        state_path = self.state_dir / f"{self.quota_id}.state"
+        with open(state_path, "a+", encoding="utf-8") as file:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read() or "{}")
+                except ValueError:
+                    state = {}
+                # State files outlive reboots (and monotonic clocks reset on
+                # them), so shared schedules are kept in wall-clock time.
+                now = self._wall_clock_fn()
+                waits = [0.0]
+                if self.limits.requests_per_minute:
+                    wait_sec, state["requests_next_free_at"] = reserve_slot(
+                        next_free_at=_fresh_schedule(state.get("requests_next_free_at"), now),
+                        now=now,
+                        interval_sec=60.0 / self.limits.requests_per_minute,
+                        capacity=1,
+                    )
+                    waits.append(wait_sec)
+                if self.limits.tokens_per_minute and estimated_tokens > 0:
+                    wait_sec, state["tokens_next_free_at"] = reserve_slot(
+                        next_free_at=_fresh_schedule(state.get("tokens_next_free_at"), now),
+                        now=now,
+                        interval_sec=60.0 / self.limits.tokens_per_minute,
+                        capacity=self.limits.tokens_per_minute,
+                        cost=estimated_tokens,
+                    )
+                    waits.append(wait_sec)
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state))
+                file.flush()
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        return max(waits)
+
+    def _acquire_concurrency(
+        self,
+        cancel_token: CancellationToken | None,
+        sleep_fn: Callable[[float], None],
+    ) -> Callable[[], None]:
+        if not self.limits.max_concurrency:
+            return lambda: None
+        if self.state_dir is None:
+            if cancel_token is None:
+                self._semaphore.acquire()
+            else:
+                while not self._semaphore.acquire(timeout=_SLOT_POLL_SEC):
+                    cancel_token.raise_if_canceled()
+            return self._semaphore.release
+
+        # One lock file per slot; the kernel drops a dead process's locks,
+        # so crashed workers never leak capacity.
+        while True:
+            for index in range(self.limits.max_concurrency):
+                slot_path = self.state_dir / f"{self.quota_id}.slot{index}"
+                fd = os.open(slot_path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    os.close(fd)
+                    continue
+
+                def release(fd: int = fd) -> None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+
+                return release
+            sleep_fn(_SLOT_POLL_SEC)
+
+
+class QuotaRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._quotas: dict[str, ProviderQuota] = {}
+
+    @staticmethod
+    def build_quota_id(api_key: str, model_name: str) -> str:
+        # Never persist raw API keys in state file names.
+        digest = hashlib.sha256(f"{api_key}\0{model_name}".encode("utf-8")).hexdigest()
+        return digest[:24]
+
+    def get(self, api_key: str, model_name: str) -> ProviderQuota:
+        quota_id = self.build_quota_id(api_key, model_name)
+        with self._lock:
+            quota = self._quotas.get(quota_id)
+            if quota is None:
+                quota = ProviderQuota(
+                    quota_id=quota_id,
+                    limits=load_quota_limits(model_name),
+                    state_dir=_default_state_dir(),
+                )
+                self._quotas[quota_id] = quota
+            return quota
+
+    def reset(self) -> None:
+        with self._lock:
+            self._quotas.clear()
+
+
+quota_registry = QuotaRegistry()
+
+
+def get_provider_quota(api_key: str, model_name: str) -> ProviderQuota:
+    return quota_registry.get(api_key=api_key or "", model_name=model_name)
@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Callable
+
+
+def reserve_slot(
+    next_free_at: float | None,
+    now: float,
+    interval_sec: float,
+    capacity: float,
+    cost: float = 1.0,
+) -> tuple[float, float]:
+    """Pure GCRA step: return ``(wait_sec, new_next_free_at)`` for ``cost`` tokens."""
+    start = now if next_free_at is None else max(next_free_at, now)
+    new_next_free_at = start + cost * interval_sec
+    allowed_at = new_next_free_at - capacity * interval_sec
+    return max(0.0, allowed_at - now), new_next_free_at
+
+
+class TokenBucket:
+    """Thread-safe token bucket expressed as a virtual schedule (GCRA).
+
+    Each caller reserves the next free slot under the lock and then sleeps
+    outside of it, so concurrent callers are spread ``60 / requests_per_minute``
+    seconds apart while ``capacity`` tokens may be spent back to back.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        capacity: float = 1,
+        monotonic_fn: Callable[[], float] = time.monotonic,
+    ):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be greater than 0.")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.requests_per_minute = requests_per_minute
+        self.capacity = capacity
+        self._monotonic_fn = monotonic_fn
+        self._lock = threading.Lock()
+        # Theoretical arrival time of the next request once the bucket is empty.
+        self._next_free_at: float | None = None
+
+    @property
+    def interval_sec(self) -> float:
+        return 60.0 / self.requests_per_minute
+
+    @property
+    def last_request_time(self) -> float | None:
+        with self._lock:
+            if self._next_free_at is None:
+                return None
+            return self._next_free_at - self.interval_sec
+
+    @last_request_time.setter
+    def last_request_time(self, value: float | None) -> None:
+        with self._lock:
+            self._next_free_at = None if value is None else value + self.interval_sec
+
+    def set_rate(self, requests_per_minute: float) -> None:
+        """Change the rate; reservations already handed out keep their slots."""
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be greater than 0.")
+        with self._lock:
+            self.requests_per_minute = requests_per_minute
+
+    def reserve(self, now: float | None = None, cost: float = 1.0) -> float:
+        """Consume ``cost`` tokens and return how long the caller must wait for them."""
+        current = self._monotonic_fn() if now is None else now
+        with self._lock:
+            wait_sec, self._next_free_at = reserve_slot(
+                next_free_at=self._next_free_at,
+                now=current,
+                interval_sec=self.interval_sec,
+                capacity=self.capacity,
+                cost=cost,
+            )
+        return wait_sec
+
+    def record(self, now: float | None = None) -> None:
+        """Account for a request that was sent without reserving a token."""
+        current = self._monotonic_fn() if now is None else now
+        with self._lock:
+            candidate = current + self.interval_sec
+            if self._next_free_at is None or candidate > self._next_free_at:
+                self._next_free_at = candidate
+
+    def acquire(
+        self,
+        sleep_fn: Callable[[float], None] = time.sleep,
+        now: float | None = None,
+        cost: float = 1.0,
+    ) -> float:
+        wait_sec = self.reserve(now=now, cost=cost)
+        if wait_sec > 0:
+            sleep_fn(wait_sec)
+        return wait_sec
@@ -0,0 +1,60 @@
+import threading
+from typing import Any
+
+
+class RepairStats:
+    """Process-wide counters for targeted repairs of invalid model output.
+
+    Counters live in the generating process only: with a separate worker
+    process (``python -m app.worker``) the API's ``/healthz`` does not see them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, *, repaired: bool, items_requested: int, rounds: int) -> None:
+        with self._lock:
+            self._attempts += 1
+            if repaired:
+                self._repaired += 1
+            self._items_requested += items_requested
+            self._rounds += rounds
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "attempts": self._attempts,
+                "repaired": self._repaired,
+                "failed": self._attempts - self._repaired,
+                "success_rate": (
+                    round(self._repaired / self._attempts, 3) if self._attempts else None
+                ),
+                "items_requested": self._items_requested,
+                "rounds": self._rounds,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._attempts = 0
+            self._repaired = 0
+            self._items_requested = 0
+            self._rounds = 0
+
+
+_registry_lock = threading.Lock()
+_registry: dict[str, RepairStats] = {}
+
+
+def get_repair_stats(kind: str) -> RepairStats:
+    with _registry_lock:
+        stats = _registry.get(kind)
+        if stats is None:
+            stats = _registry[kind] = RepairStats()
+        return stats
+
+
+def repair_stats_snapshot() -> dict[str, dict[str, Any]]:
+    with _registry_lock:
+        registry = dict(_registry)
+    return {kind: stats.snapshot() for kind, stats in sorted(registry.items())}
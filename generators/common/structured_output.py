@@ -0,0 +1,19 @@
+import json
+from typing import Any
+
+
+def response_items(response: Any, field: str) -> list:
+    """Raw entries of the list ``field`` in a structured-output response.
+
+    Uses the SDK-parsed model when the whole response validated, otherwise
+    the raw JSON text, so a partly invalid response can still be salvaged
+    item by item. Anything unreadable yields an empty list.
+    """
+    if response.parsed:
+        return [item.model_dump() for item in getattr(response.parsed, field)]
+    try:
+        data = json.loads(response.text or "")
+    except ValueError:
+        return []
+    raw_items = data.get(field) if isinstance(data, dict) else None
+    return raw_items if isinstance(raw_items, list) else []
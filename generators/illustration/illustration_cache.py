@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from generators.common.content_cache import ContentCache, cache_from_env, content_key
+
+ILLUSTRATION_CACHE_DIR_ENV = "MORETALE_ILLUSTRATION_CACHE_DIR"
+ILLUSTRATION_CACHE_MAX_MB_ENV = "MORETALE_ILLUSTRATION_CACHE_MAX_MB"
+_DEFAULT_MAX_MB = 4096
+# Entries keep the extension of the returned MIME type, so lookups try each.
+_CACHED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+
+def get_illustration_cache() -> ContentCache | None:
+    return cache_from_env(
+        ILLUSTRATION_CACHE_DIR_ENV, ILLUSTRATION_CACHE_MAX_MB_ENV, _DEFAULT_MAX_MB
+    )
+
+
+def build_illustration_cache_key(*, model_name: str, aspect_ratio: str, prompt: str) -> str:
+    return content_key("illustration", model_name, aspect_ratio, prompt)
+
+
+def find_cached_image(cache: ContentCache, key: str) -> Path | None:
+    for extension in _CACHED_EXTENSIONS:
+        cached_path = cache.lookup(key, extension)
+        if cached_path is not None:
+            return cached_path
+    return None
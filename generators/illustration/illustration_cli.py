@@ -42,6 +42,17 @@ def parse_args() -> argparse.Namespace:
         default=1.0,
         help="Seconds between image requests.",
     )
+    parser.add_argument(
+        "--max_concurrent_requests",
+        type=int,
+        default=1,
+        help="Number of image requests allowed in flight at once.",
+    )
+    parser.add_argument(
+        "--adaptive_rate_control",
+        action="store_true",
+        help="Raise the request rate while calls succeed and back off on 429s.",
+    )
     parser.add_argument(
         "--skip_existing",
         action="store_true",
@@ -67,6 +78,8 @@ def main() -> None:
         aspect_ratio=args.aspect_ratio,
         cover_aspect_ratio=args.cover_aspect_ratio,
         request_interval_sec=args.request_interval_sec,
+        max_concurrent_requests=args.max_concurrent_requests,
+        adaptive_rate_control=args.adaptive_rate_control,
     )
     story = generator.load_story(str(story_path))
     result = generator.generate_from_story(
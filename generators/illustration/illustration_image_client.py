@@ -1,7 +1,18 @@
 import time
+from typing import Callable
 
 from google.genai import types
 
+from generators.common.adaptive_rate import (
+    AdaptiveRateController,
+    compute_backoff_delay,
+    extract_retry_delay,
+    is_rate_limit_error,
+)
+from generators.common.cancellation import CancellationToken
+from generators.common.quota import ProviderQuota, estimate_tokens
+from generators.common.rate_limit import TokenBucket
+
 
 def _safe_chunk_text(chunk) -> str:
     text = getattr(chunk, "text", "")
@@ -15,36 +26,102 @@ class ImageGenerationClient:
         model_name: str,
         aspect_ratio: str,
         request_interval_sec: float,
+        rate_limiter: TokenBucket | None = None,
+        quota: ProviderQuota | None = None,
+        adaptive_rate_control: bool = False,
+        max_requests_per_minute: float | None = None,
+        max_attempts: int = 3,
     ):
         self.client = client
         self.model_name = model_name
         self.aspect_ratio = aspect_ratio
         self.request_interval_sec = max(0.0, request_interval_sec)
-        self._last_request_time: float | None = None
+        # The limiter is the only mutable state, and it is thread-safe, so one
+        # client can serve concurrent page requests.
+        if rate_limiter is None and self.request_interval_sec > 0:
+            rate_limiter = TokenBucket(requests_per_minute=60.0 / self.request_interval_sec)
+        self.rate_limiter = rate_limiter
+        self.rate_controller = AdaptiveRateController(
+            bucket=rate_limiter,
+            adaptive=adaptive_rate_control,
+            max_requests_per_minute=max_requests_per_minute,
+        )
+        self.quota = quota
+        self.max_attempts = max(1, max_attempts)
 
-    def _build_config(self) -> types.GenerateContentConfig:
-        image_config = types.ImageConfig(aspect_ratio=self.aspect_ratio)
+    def _build_config(self, aspect_ratio: str | None = None) -> types.GenerateContentConfig:
+        image_config = types.ImageConfig(aspect_ratio=aspect_ratio or self.aspect_ratio)
         return types.GenerateContentConfig(
             response_modalities=["IMAGE"],
             image_config=image_config,
         )
 
-    def _enforce_rate_limit(self) -> None:
-        if self._last_request_time is None:
-            return
-        elapsed = time.monotonic() - self._last_request_time
-        wait_sec = self.request_interval_sec - elapsed
-        if wait_sec > 0:
-            time.sleep(wait_sec)
+    def _enforce_rate_limit(self, sleep_fn: Callable[[float], None] = time.sleep) -> None:
+        self.rate_controller.acquire(sleep_fn=sleep_fn)
 
-    def generate_image_bytes(self, prompt: str) -> tuple[bytes, str]:
-        self._enforce_rate_limit()
-        self._last_request_time = time.monotonic()
+    def generate_image_bytes(
+        self,
+        prompt: str,
+        aspect_ratio: str | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[bytes, str]:
+        sleep_fn = cancel_token.sleep if cancel_token is not None else time.sleep
+        # Only quota errors are retried here; other failures are reported
+        # per page by the pipeline exactly as before.
+        attempt = 1
+        while True:
+            if cancel_token is not None:
+                cancel_token.raise_if_canceled()
+            self._enforce_rate_limit(sleep_fn=sleep_fn)
+            try:
+                result = self._request_image(
+                    prompt=prompt,
+                    aspect_ratio=aspect_ratio,
+                    cancel_token=cancel_token,
+                )
+            except Exception as error:
+                if not is_rate_limit_error(error):
+                    raise
+                retry_after = extract_retry_delay(error)
+                self.rate_controller.on_rate_limited(retry_after=retry_after)
+                if attempt >= self.max_attempts:
+                    raise
+                sleep_fn(
+                    compute_backoff_delay(base_delay=2.0**attempt, retry_after=retry_after)
+                )
+                attempt += 1
+                continue
+            self.rate_controller.on_success()
+            return result
 
+    def _request_image(
+        self,
+        prompt: str,
+        aspect_ratio: str | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[bytes, str]:
         contents = [
             types.Content(role="user", parts=[types.Part.from_text(text=prompt)]),
         ]
-        config = self._build_config()
+        config = self._build_config(aspect_ratio=aspect_ratio)
+        if self.quota is None:
+            return self._collect_image(
+                contents=contents, config=config, cancel_token=cancel_token
+            )
+        with self.quota.slot(
+            estimated_tokens=estimate_tokens(prompt),
+            cancel_token=cancel_token,
+        ):
+            return self._collect_image(
+                contents=contents, config=config, cancel_token=cancel_token
+            )
+
+    def _collect_image(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[bytes, str]:
         images: list[tuple[bytes, str]] = []
         text_messages: list[str] = []
 
@@ -53,6 +130,8 @@ class ImageGenerationClient:
             contents=contents,
             config=config,
         ):
+            if cancel_token is not None:
+                cancel_token.raise_if_canceled()
             if not chunk.parts:
                 chunk_text = _safe_chunk_text(chunk).strip()
                 if chunk_text:
@@ -75,4 +154,3 @@ class ImageGenerationClient:
             raise ValueError(f"No image data returned from image model: {reason}")
 
         return images[0]
-
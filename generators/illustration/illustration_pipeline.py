@@ -1,10 +1,22 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from google import genai
 
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.common.content_cache import ContentCache, write_bytes_atomic
+from generators.common.progress import ProgressCallback, report_progress
+from generators.common.quota import get_provider_quota
 from generators.story.story_model import Story
+from generators.story.story_stream import StoryPageFeed
 
+from .illustration_cache import (
+    build_illustration_cache_key,
+    find_cached_image,
+    get_illustration_cache,
+)
 from .illustration_cover_prompt import build_cover_prompt
 from .illustration_env import resolve_api_key
 from .illustration_image_client import ImageGenerationClient
@@ -26,18 +38,29 @@ class IllustrationGenerator:
         cover_aspect_ratio: str = "5:4",
         request_interval_sec: float = 1.0,
         client: genai.Client | None = None,
+        max_concurrent_requests: int = 1,
+        adaptive_rate_control: bool = False,
+        image_cache: ContentCache | None = None,
     ):
-        self.client = client or genai.Client(api_key=api_key or resolve_api_key())
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1.")
+        resolved_api_key = api_key or ("" if client is not None else resolve_api_key())
+        self.client = client or genai.Client(api_key=resolved_api_key)
         self.model_name = model_name
         self.aspect_ratio = aspect_ratio
         self.cover_aspect_ratio = cover_aspect_ratio
         self.request_interval_sec = max(0.0, request_interval_sec)
+        self.max_concurrent_requests = max_concurrent_requests
         self.image_client = ImageGenerationClient(
             client=self.client,
             model_name=self.model_name,
             aspect_ratio=self.aspect_ratio,
             request_interval_sec=self.request_interval_sec,
+            quota=get_provider_quota(api_key=resolved_api_key, model_name=self.model_name),
+            adaptive_rate_control=adaptive_rate_control,
         )
+        # Shared across jobs; configured by MORETALE_ILLUSTRATION_CACHE_DIR by default.
+        self.image_cache = image_cache if image_cache is not None else get_illustration_cache()
 
     @staticmethod
     def load_story(story_json_path: str) -> Story:
@@ -60,156 +83,300 @@ class IllustrationGenerator:
         prompt: str,
         *,
         aspect_ratio: str | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> tuple[bytes, str]:
         target_aspect_ratio = (aspect_ratio or self.aspect_ratio).strip() or self.aspect_ratio
-        original_aspect_ratio = self.image_client.aspect_ratio
-        self.image_client.aspect_ratio = target_aspect_ratio
+        return self.image_client.generate_image_bytes(
+            prompt=prompt,
+            aspect_ratio=target_aspect_ratio,
+            cancel_token=cancel_token,
+        )
+
+    def _render_image(
+        self,
+        prompt: str,
+        *,
+        aspect_ratio: str | None,
+        illustration_dir: Path,
+        stem: str,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[Path, bool]:
+        """Write the image for ``prompt`` to ``illustration_dir/stem.ext``.
+
+        Returns the path and whether it came from the shared image cache.
+        """
+        cache_key = None
+        if self.image_cache is not None:
+            cache_key = build_illustration_cache_key(
+                model_name=self.model_name,
+                aspect_ratio=(aspect_ratio or self.aspect_ratio).strip() or self.aspect_ratio,
+                prompt=prompt,
+            )
+            cached_path = find_cached_image(self.image_cache, cache_key)
+            if cached_path is not None:
+                image_path = illustration_dir / f"{stem}{cached_path.suffix}"
+                try:
+                    if self.image_cache.materialize(cached_path, image_path):
+                        return image_path, True
+                except OSError as error:
+                    print(f"[warn] Illustration cache read failed {stem} error={error}")
+
+        if aspect_ratio is None:
+            image_bytes, mime_type = self._generate_image_bytes(
+                prompt=prompt,
+                cancel_token=cancel_token,
+            )
+        else:
+            image_bytes, mime_type = self._generate_image_bytes(
+                prompt=prompt,
+                aspect_ratio=aspect_ratio,
+                cancel_token=cancel_token,
+            )
+        image_path = illustration_dir / f"{stem}{pick_image_extension(mime_type)}"
+        # Never truncate in place: the file may be a hardlink into the cache.
+        write_bytes_atomic(image_path, image_bytes)
+
+        if cache_key is not None:
+            try:
+                self.image_cache.put_file(cache_key, image_path, image_path.suffix)
+            except OSError as error:
+                print(f"[warn] Illustration cache write failed {stem} error={error}")
+        return image_path, False
+
+    def _render_page(
+        self,
+        story: Story,
+        page,
+        illustration_dir: Path,
+        cancel_token: CancellationToken | None = None,
+    ) -> dict[str, Any]:
+        page_number = page.page_number
         try:
-            return self.image_client.generate_image_bytes(prompt=prompt)
-        finally:
-            self.image_client.aspect_ratio = original_aspect_ratio
+            prompt, prompt_mode = self._build_page_prompt(story=story, page=page)
+            image_path, cache_hit = self._render_image(
+                prompt,
+                aspect_ratio=None,
+                illustration_dir=illustration_dir,
+                stem=f"page_{page_number:02d}",
+                cancel_token=cancel_token,
+            )
 
-    def generate_from_story(
+            print(
+                f"{'CACHE' if cache_hit else 'OK'} page={page_number} "
+                f"path={image_path} mode={prompt_mode}"
+            )
+            entry = {
+                "asset_type": "page",
+                "page_number": page_number,
+                "status": "generated",
+                "path": str(image_path),
+                "prompt_mode": prompt_mode,
+                "aspect_ratio": self.aspect_ratio,
+            }
+            if cache_hit:
+                entry["cache_hit"] = True
+            return entry
+        except Exception as error:
+            print(f"FAIL page={page_number} error={error}")
+            return {
+                "asset_type": "page",
+                "page_number": page_number,
+                "status": "failed",
+                "error": str(error),
+                "aspect_ratio": self.aspect_ratio,
+            }
+
+    def _render_cover(
         self,
         story: Story,
+        illustration_dir: Path,
+        cancel_token: CancellationToken | None = None,
+    ) -> dict[str, Any]:
+        try:
+            prompt = self._build_cover_prompt(story=story)
+            image_path, cache_hit = self._render_image(
+                prompt,
+                aspect_ratio=self.cover_aspect_ratio,
+                illustration_dir=illustration_dir,
+                stem="cover",
+                cancel_token=cancel_token,
+            )
+
+            print(f"{'CACHE' if cache_hit else 'OK'} cover path={image_path} mode=cover_prompt")
+            entry = {
+                "asset_type": "cover",
+                "status": "generated",
+                "path": str(image_path),
+                "prompt_mode": "cover_prompt",
+                "aspect_ratio": self.cover_aspect_ratio,
+            }
+            if cache_hit:
+                entry["cache_hit"] = True
+            return entry
+        except Exception as error:
+            print(f"FAIL cover error={error}")
+            return {
+                "asset_type": "cover",
+                "status": "failed",
+                "error": str(error),
+                "prompt_mode": "cover_prompt",
+                "aspect_ratio": self.cover_aspect_ratio,
+            }
+
+    def generate_from_story(
+        self,
+        story: Story | StoryPageFeed,
         output_dir: str,
         skip_existing: bool = True,
         generate_cover: bool = True,
+        cancel_token: CancellationToken | None = None,
+        progress_callback: ProgressCallback | None = None,
     ) -> dict[str, Any]:
+        """Render every page illustration plus the cover for ``story``.
+
+        ``story`` may be a ``StoryPageFeed``: page renders are then submitted
+        as the pages stream in, and the cover, which samples motifs from the
+        whole story, is rendered once the final story is available.
+        """
         illustration_dir = Path(output_dir) / "illustrations"
         illustration_dir.mkdir(parents=True, exist_ok=True)
+        page_total = len(story.pages)
+        report_progress(
+            progress_callback,
+            "tasks.planned",
+            stage="illustrations",
+            total=page_total + (1 if generate_cover else 0),
+        )
 
-        page_generated = 0
-        page_skipped = 0
-        page_failed = 0
-        entries: list[dict[str, Any]] = []
-
-        for page in story.pages:
-            page_number = page.page_number
-            if skip_existing:
-                existing_path = find_existing_page_asset(
-                    illustration_dir=illustration_dir,
-                    page_number=page_number,
-                )
-                if existing_path:
-                    page_skipped += 1
-                    print(f"SKIP page={page_number} reason=exists path={existing_path}")
-                    entries.append(
-                        {
-                            "asset_type": "page",
-                            "page_number": page_number,
-                            "status": "skipped_exists",
-                            "path": existing_path,
-                            "aspect_ratio": self.aspect_ratio,
-                        }
-                    )
-                    continue
+        def report_entry(entry: dict[str, Any]) -> None:
+            report_progress(
+                progress_callback,
+                "task",
+                stage="illustrations",
+                asset_type=entry["asset_type"],
+                page_number=entry.get("page_number"),
+                status=entry["status"],
+                error=entry.get("error"),
+            )
+
+        # Entries are slotted by task index (pages in order, then the cover),
+        # so the manifest order is stable even when renders finish out of order.
+        entries: list[dict[str, Any] | None] = []
 
+        def is_canceled() -> bool:
+            return cancel_token is not None and cancel_token.is_canceled
+
+        def run_render(index: int, render_fn: Callable[[], dict[str, Any]]) -> None:
+            # A canceled render leaves its slot empty; the manifest below is
+            # still written with whatever finished before the cancel.
+            if is_canceled():
+                return
             try:
-                prompt, prompt_mode = self._build_page_prompt(story=story, page=page)
-                image_bytes, mime_type = self._generate_image_bytes(prompt=prompt)
-                extension = pick_image_extension(mime_type)
-                image_path = illustration_dir / f"page_{page_number:02d}{extension}"
-
-                with open(image_path, "wb") as file:
-                    file.write(image_bytes)
-
-                page_generated += 1
-                print(f"OK page={page_number} path={image_path} mode={prompt_mode}")
-                entries.append(
-                    {
-                        "asset_type": "page",
-                        "page_number": page_number,
-                        "status": "generated",
-                        "path": str(image_path),
-                        "prompt_mode": prompt_mode,
-                        "aspect_ratio": self.aspect_ratio,
-                    }
-                )
-            except Exception as error:
-                page_failed += 1
-                print(f"FAIL page={page_number} error={error}")
-                entries.append(
-                    {
-                        "asset_type": "page",
-                        "page_number": page_number,
-                        "status": "failed",
-                        "error": str(error),
-                        "aspect_ratio": self.aspect_ratio,
-                    }
-                )
+                entries[index] = render_fn()
+                report_entry(entries[index])
+            except GenerationCanceled:
+                print(f"CANCEL task={index}")
+
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=self.max_concurrent_requests,
+                thread_name_prefix="moretale-illustration",
+            )
+            if self.max_concurrent_requests > 1
+            else None
+        )
+
+        futures: list[Future] = []
 
-        cover_status = "not_requested"
-        cover_error: str | None = None
-        cover_path: str | None = None
-        cover_generated = 0
-        cover_skipped = 0
-        cover_failed = 0
+        def submit(render_fn: Callable[[], dict[str, Any]]) -> None:
+            entries.append(None)
+            if executor is not None:
+                futures.append(executor.submit(run_render, len(entries) - 1, render_fn))
+            else:
+                run_render(len(entries) - 1, render_fn)
 
-        if generate_cover:
-            if skip_existing:
-                existing_cover_path = find_existing_cover_asset(illustration_dir=illustration_dir)
+        try:
+            for page in story.pages:
+                if is_canceled():
+                    break
+                page_number = page.page_number
+                if skip_existing:
+                    existing_path = find_existing_page_asset(
+                        illustration_dir=illustration_dir,
+                        page_number=page_number,
+                    )
+                    if existing_path:
+                        print(f"SKIP page={page_number} reason=exists path={existing_path}")
+                        entries.append(
+                            {
+                                "asset_type": "page",
+                                "page_number": page_number,
+                                "status": "skipped_exists",
+                                "path": existing_path,
+                                "aspect_ratio": self.aspect_ratio,
+                            }
+                        )
+                        report_entry(entries[-1])
+                        continue
+                submit(
+                    partial(self._render_page, story, page, illustration_dir, cancel_token)
+                )
+
+            if generate_cover and not is_canceled():
+                existing_cover_path = (
+                    find_existing_cover_asset(illustration_dir=illustration_dir)
+                    if skip_existing
+                    else None
+                )
                 if existing_cover_path:
-                    cover_status = "skipped_exists"
-                    cover_path = existing_cover_path
-                    cover_skipped = 1
                     print(f"SKIP cover reason=exists path={existing_cover_path}")
                     entries.append(
                         {
                             "asset_type": "cover",
-                            "status": cover_status,
+                            "status": "skipped_exists",
                             "path": existing_cover_path,
                             "prompt_mode": "cover_prompt",
                             "aspect_ratio": self.cover_aspect_ratio,
                         }
                     )
-
-            if cover_status == "not_requested":
-                try:
-                    prompt = self._build_cover_prompt(story=story)
-                    image_bytes, mime_type = self._generate_image_bytes(
-                        prompt=prompt,
-                        aspect_ratio=self.cover_aspect_ratio,
+                    report_entry(entries[-1])
+                else:
+                    final_story = story.story if isinstance(story, StoryPageFeed) else story
+                    submit(
+                        partial(self._render_cover, final_story, illustration_dir, cancel_token)
                     )
-                    extension = pick_image_extension(mime_type)
-                    image_path = illustration_dir / f"cover{extension}"
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        # Errors outside a render's own handler surface here, as they would
+        # in sequential mode, instead of silently dropping the entry.
+        for future in futures:
+            future.result()
 
-                    with open(image_path, "wb") as file:
-                        file.write(image_bytes)
+        recorded_entries = [entry for entry in entries if entry is not None]
+        page_entries = [entry for entry in recorded_entries if entry["asset_type"] == "page"]
+        cover_entry = next(
+            (entry for entry in recorded_entries if entry["asset_type"] == "cover"),
+            None,
+        )
+        page_generated = sum(1 for entry in page_entries if entry["status"] == "generated")
+        page_skipped = sum(1 for entry in page_entries if entry["status"] == "skipped_exists")
+        page_failed = sum(1 for entry in page_entries if entry["status"] == "failed")
 
-                    cover_status = "generated"
-                    cover_path = str(image_path)
-                    cover_generated = 1
-                    print(f"OK cover path={image_path} mode=cover_prompt")
-                    entries.append(
-                        {
-                            "asset_type": "cover",
-                            "status": cover_status,
-                            "path": cover_path,
-                            "prompt_mode": "cover_prompt",
-                            "aspect_ratio": self.cover_aspect_ratio,
-                        }
-                    )
-                except Exception as error:
-                    cover_status = "failed"
-                    cover_error = str(error)
-                    cover_failed = 1
-                    print(f"FAIL cover error={error}")
-                    entries.append(
-                        {
-                            "asset_type": "cover",
-                            "status": cover_status,
-                            "error": cover_error,
-                            "prompt_mode": "cover_prompt",
-                            "aspect_ratio": self.cover_aspect_ratio,
-                        }
-                    )
+        cover_status = cover_entry["status"] if cover_entry else "not_requested"
+        cover_error: str | None = cover_entry.get("error") if cover_entry else None
+        cover_path: str | None = cover_entry.get("path") if cover_entry else None
+        cover_generated = 1 if cover_status == "generated" else 0
+        cover_skipped = 1 if cover_status == "skipped_exists" else 0
+        cover_failed = 1 if cover_status == "failed" else 0
 
         manifest_path = illustration_dir / "manifest.json"
-        total_tasks = len(story.pages) + (1 if generate_cover else 0)
+        total_tasks = page_total + (1 if generate_cover else 0)
         total_generated = page_generated + cover_generated
         total_skipped = page_skipped + cover_skipped
         total_failed = page_failed + cover_failed
+        cache_hits = sum(1 for entry in recorded_entries if entry.get("cache_hit"))
+        canceled = is_canceled()
         write_manifest(
             manifest_path=manifest_path,
             model_name=self.model_name,
@@ -219,7 +386,9 @@ class IllustrationGenerator:
             generated=total_generated,
             skipped=total_skipped,
             failed=total_failed,
-            entries=entries,
+            entries=recorded_entries,
+            cache_hits=cache_hits,
+            canceled=canceled,
         )
 
         return {
@@ -227,7 +396,8 @@ class IllustrationGenerator:
             "generated": total_generated,
             "skipped": total_skipped,
             "failed": total_failed,
-            "page_total_tasks": len(story.pages),
+            "cache_hits": cache_hits,
+            "page_total_tasks": page_total,
             "page_generated": page_generated,
             "page_skipped": page_skipped,
             "page_failed": page_failed,
@@ -239,4 +409,5 @@ class IllustrationGenerator:
                 "aspect_ratio": self.cover_aspect_ratio,
             },
             "manifest_path": str(manifest_path),
+            "canceled": canceled,
         }
@@ -36,7 +36,15 @@ def write_manifest(
     skipped: int,
     failed: int,
     entries: list[dict[str, Any]],
+    cache_hits: int = 0,
+    canceled: bool = False,
 ) -> None:
+    # Pages in page order, even when a streamed story delivered some late,
+    # then the cover.
+    entries = sorted(
+        entries,
+        key=lambda entry: (entry.get("page_number") is None, entry.get("page_number") or 0),
+    )
     with open(manifest_path, "w", encoding="utf-8") as file:
         json.dump(
             {
@@ -48,6 +56,8 @@ def write_manifest(
                 "generated": generated,
                 "skipped": skipped,
                 "failed": failed,
+                "cache_hits": cache_hits,
+                "canceled": canceled,
                 "entries": entries,
             },
             file,
@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from generators.common.quota import estimate_tokens
+from generators.story.story_model import Story
+
+
+@dataclass(frozen=True)
+class QuizContext:
+    text: str
+    estimated_tokens: int
+    # What the previous full, indented serialization would have cost.
+    baseline_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.baseline_tokens - self.estimated_tokens)
+
+
+def _full_pages(story: Story) -> list[dict[str, Any]]:
+    return [
+        {
+            "page_number": page.page_number,
+            "text_primary": page.text_primary,
+            "text_secondary": page.text_secondary,
+            "vocabulary": [
+                {
+                    "entry_id": entry.entry_id or "",
+                    "primary_word": entry.primary_word,
+                    "secondary_word": entry.secondary_word,
+                    "primary_definition": entry.primary_definition,
+                    "secondary_definition": entry.secondary_definition,
+                }
+                for entry in page.vocabulary
+            ],
+        }
+        for page in story.pages
+    ]
+
+
+def _compact_pages(
+    story: Story,
+    *,
+    include_secondary_text: bool,
+    max_vocabulary_per_page: int | None,
+    definitions: tuple[str, ...],
+) -> str:
+    lines: list[str] = []
+    for page in story.pages:
+        # Only entries with an id can be cited in source_vocabulary_entry_ids.
+        entries = [entry for entry in page.vocabulary if entry.entry_id]
+        item: dict[str, Any] = {
+            "page_number": page.page_number,
+            "text_primary": page.text_primary,
+        }
+        if include_secondary_text:
+            item["text_secondary"] = page.text_secondary
+        item["vocabulary"] = [
+            {
+                "entry_id": entry.entry_id,
+                "primary_word": entry.primary_word,
+                "secondary_word": entry.secondary_word,
+                **{name: getattr(entry, name) for name in definitions},
+            }
+            for entry in entries[:max_vocabulary_per_page]
+        ]
+        lines.append(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines)
+
+
+def build_quiz_context(
+    story: Story,
+    *,
+    token_budget: int | None = None,
+    include_secondary_text: bool = True,
+    max_vocabulary_per_page: int = 3,
+) -> QuizContext:
+    """Serialize the story for the quiz prompt, one compact JSON object per page.
+
+    Every vocabulary entry with an ``entry_id`` is kept with both definitions.
+    Only if the result exceeds ``token_budget`` is it reduced step by step:
+    the secondary-language text goes first, then the secondary and primary
+    definitions, then entries beyond ``max_vocabulary_per_page`` and finally
+    all but one entry per page. Page text in the primary language is never
+    cut, so the budget is a target rather than a hard limit.
+    """
+    baseline_tokens = estimate_tokens(
+        json.dumps(_full_pages(story), ensure_ascii=False, indent=2)
+    )
+    max_vocabulary_per_page = max(1, max_vocabulary_per_page)
+    both = ("primary_definition", "secondary_definition")
+    steps = [
+        (include_secondary_text, None, both),
+        (False, None, both),
+        (False, None, both[:1]),
+        (False, None, ()),
+        (False, max_vocabulary_per_page, ()),
+        (False, 1, ()),
+    ]
+    text = ""
+    for secondary, vocabulary_limit, definitions in steps:
+        text = _compact_pages(
+            story,
+            include_secondary_text=secondary,
+            max_vocabulary_per_page=vocabulary_limit,
+            definitions=definitions,
+        )
+        if token_budget is None or estimate_tokens(text) <= token_budget:
+            break
+    return QuizContext(
+        text=text,
+        estimated_tokens=estimate_tokens(text),
+        baseline_tokens=baseline_tokens,
+    )
@@ -1,26 +1,53 @@
 import os
 from pathlib import Path
+from typing import get_args
 
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
+from pydantic import ValidationError
 
-from generators.quiz.quiz_model import Quiz
+from generators.common.llm_cache import LLMResponseCache, get_llm_response_cache
+from generators.common.quota import estimate_tokens, get_provider_quota
+from generators.common.repair_stats import get_repair_stats
+from generators.common.structured_output import response_items
+from generators.quiz.quiz_context import QuizContext
+from generators.quiz.quiz_model import Quiz, QuizQuestion, QuizQuestionBatch, QuizSkill
 from generators.quiz.quiz_prompts import QuizPrompt
 from generators.story.story_model import Story
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
 
+_VOCABULARY_SKILL = "vocabulary_in_context"
+_OTHER_SKILLS = tuple(skill for skill in get_args(QuizSkill) if skill != _VOCABULARY_SKILL)
+
 
 class QuizGenerator:
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        max_repair_rounds: int = 2,
+        context_token_budget: int | None = None,
+        include_secondary_text: bool = True,
+        response_cache: LLMResponseCache | None = None,
+    ):
         gemini_api_key = (os.getenv("GEMINI_STORY_API_KEY") or "").strip()
         if not gemini_api_key:
             raise ValueError("GEMINI_STORY_API_KEY environment variable not set.")
         self.client = genai.Client(api_key=gemini_api_key)
         self.model_name = model_name
-        self.prompts = QuizPrompt()
+        self.quota = get_provider_quota(api_key=gemini_api_key, model_name=model_name)
+        self.prompts = QuizPrompt(
+            context_token_budget=context_token_budget,
+            include_secondary_text=include_secondary_text,
+        )
+        self.max_repair_rounds = max(0, max_repair_rounds)
+        self.repair_stats = get_repair_stats("quiz")
+        # Record/replay cache of raw responses, set by MORETALE_LLM_CACHE_MODE.
+        self.response_cache = (
+            response_cache if response_cache is not None else get_llm_response_cache()
+        )
 
     def generate_quiz(
         self,
@@ -29,27 +56,182 @@ class QuizGenerator:
         story: Story,
         question_count: int = 5,
     ) -> Quiz:
+        """Generate a quiz, replacing only the questions that fail validation.
+
+        Questions are validated one by one. Valid questions that fit the
+        quiz-level rules are kept and only the missing slots are requested
+        again, for at most ``max_repair_rounds`` rounds.
+        """
+        story_context = self.prompts.build_story_context(story)
+        print(
+            f"Quiz context tokens~{story_context.estimated_tokens} "
+            f"saved~{story_context.saved_tokens}"
+        )
         user_prompt = self.prompts.generate_user_prompt(
             story_id=story_id,
             story=story,
             question_count=question_count,
+            story_context=story_context,
         )
 
         try:
-            response = self.client.models.generate_content(
+            cache_key = self._cache_key(user_prompt, Quiz)
+            response = self._request(user_prompt, Quiz, cache_key)
+            try:
+                quiz = response.parsed or Quiz.model_validate_json(response.text)
+            except ValidationError:
+                # Never replay an invalid quiz into a retry; repairs go live.
+                self._forget(cache_key)
+                questions = _select_questions(
+                    _salvage_questions(response_items(response, "questions")), question_count
+                )
+                return self._repair_quiz(
+                    story_id, story, question_count, questions, story_context
+                )
+            self._remember(cache_key, response)
+            return quiz
+        except Exception as error:
+            print(f"Error generating quiz: {error}")
+            raise
+
+    def _cache_key(self, user_prompt: str, response_schema) -> str | None:
+        if self.response_cache is None:
+            return None
+        return LLMResponseCache.build_key(
+            model_name=self.model_name,
+            system_instruction=self.prompts.system_instruction,
+            user_prompt=user_prompt,
+            response_schema=response_schema,
+        )
+
+    def _request(self, user_prompt: str, response_schema, cache_key: str | None = None):
+        """Call the model, through the response cache when ``cache_key`` is given."""
+        if cache_key is None:
+            return self._request_live(user_prompt, response_schema)
+        return self.response_cache.fetch(
+            cache_key,
+            lambda: self._request_live(user_prompt, response_schema),
+        )
+
+    def _remember(self, cache_key: str | None, response) -> None:
+        if cache_key is not None:
+            self.response_cache.record(cache_key, response)
+
+    def _forget(self, cache_key: str | None) -> None:
+        if cache_key is not None:
+            self.response_cache.evict(cache_key)
+
+    def _request_live(self, user_prompt: str, response_schema):
+        with self.quota.slot(
+            estimated_tokens=estimate_tokens(self.prompts.system_instruction, user_prompt)
+        ):
+            return self.client.models.generate_content(
                 model=self.model_name,
                 contents=user_prompt,
                 config=types.GenerateContentConfig(
                     system_instruction=self.prompts.system_instruction,
                     temperature=0.6,
                     response_mime_type="application/json",
-                    response_schema=Quiz,
+                    response_schema=response_schema,
                 ),
             )
 
-            if response.parsed:
-                return response.parsed
-            return Quiz.model_validate_json(response.text)
-        except Exception as error:
-            print(f"Error generating quiz: {error}")
-            raise
+    def _repair_quiz(
+        self,
+        story_id: str,
+        story: Story,
+        question_count: int,
+        questions: list[QuizQuestion],
+        story_context: QuizContext,
+    ) -> Quiz:
+        skills = _replacement_skills(questions, question_count)
+        if skills:
+            print(f"[warn] Quiz failed validation; replacing skills={skills}")
+        requested = 0
+        rounds = 0
+        while skills and rounds < self.max_repair_rounds:
+            rounds += 1
+            requested += len(skills)
+            try:
+                response = self._request(
+                    self.prompts.generate_repair_prompt(
+                        story_id=story_id,
+                        story=story,
+                        kept_questions=questions,
+                        skills=skills,
+                        story_context=story_context,
+                    ),
+                    QuizQuestionBatch,
+                )
+            except Exception:
+                self.repair_stats.record(repaired=False, items_requested=requested, rounds=rounds)
+                raise
+            questions = _select_questions(
+                questions + _salvage_questions(response_items(response, "questions")),
+                question_count,
+            )
+            skills = _replacement_skills(questions, question_count)
+
+        self.repair_stats.record(repaired=not skills, items_requested=requested, rounds=rounds)
+        if skills:
+            raise ValueError(
+                f"Quiz still needs {len(skills)} question(s) after {rounds} repair round(s)"
+            )
+        return Quiz(
+            story_id=story_id,
+            story_title_primary=story.title_primary,
+            story_title_secondary=story.title_secondary,
+            primary_language=story.primary_language,
+            secondary_language=story.secondary_language,
+            question_count=question_count,
+            # Kept and replacement questions may reuse ids, so renumber them.
+            questions=[
+                question.model_copy(update={"question_id": f"q{index}"})
+                for index, question in enumerate(questions, start=1)
+            ],
+        )
+
+
+def _salvage_questions(raw_questions: list) -> list[QuizQuestion]:
+    questions: list[QuizQuestion] = []
+    for raw_question in raw_questions:
+        try:
+            questions.append(QuizQuestion.model_validate(raw_question))
+        except ValidationError:
+            continue
+    return questions
+
+
+def _select_questions(questions: list[QuizQuestion], question_count: int) -> list[QuizQuestion]:
+    """Keep valid questions, in order, that still fit the quiz-level rules."""
+    kept: list[QuizQuestion] = []
+    has_vocabulary = False
+    for question in questions:
+        if len(kept) == question_count:
+            break
+        if question.skill == _VOCABULARY_SKILL:
+            if has_vocabulary and question_count == 5:
+                continue
+            has_vocabulary = True
+        elif not has_vocabulary and len(kept) == question_count - 1:
+            # The last free slot is reserved for the required vocabulary question.
+            continue
+        kept.append(question)
+    return kept
+
+
+def _replacement_skills(questions: list[QuizQuestion], question_count: int) -> list[QuizSkill]:
+    needed = question_count - len(questions)
+    if needed <= 0:
+        return []
+    used = {question.skill for question in questions}
+    skills: list[QuizSkill] = []
+    if _VOCABULARY_SKILL not in used:
+        skills.append(_VOCABULARY_SKILL)
+    # Prefer skills the quiz does not cover yet, then cycle through the rest.
+    candidates = [skill for skill in _OTHER_SKILLS if skill not in used] + list(_OTHER_SKILLS)
+    index = 0
+    while len(skills) < needed:
+        skills.append(candidates[index % len(candidates)])
+        index += 1
+    return skills
@@ -111,3 +111,9 @@ class Quiz(BaseModel):
         if self.question_count == 5 and len(vocabulary_questions) != 1:
             raise ValueError("5-question quiz must include exactly one vocabulary_in_context question")
         return self
+
+
+class QuizQuestionBatch(BaseModel):
+    questions: list[QuizQuestion] = Field(
+        ..., description="Replacement questions, in the requested skill order."
+    )
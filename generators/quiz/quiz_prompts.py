@@ -1,8 +1,8 @@
-import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
 
+from generators.quiz.quiz_context import QuizContext, build_quiz_context
+from generators.quiz.quiz_model import QuizQuestion, QuizSkill
 from generators.story.story_model import Story
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -17,9 +17,18 @@ class QuizPrompt:
     user_prompt_path: str = field(
         default_factory=lambda: str(PROMPTS_DIR / "quiz_user_prompt.txt")
     )
+    repair_prompt_path: str = field(
+        default_factory=lambda: str(PROMPTS_DIR / "quiz_repair_prompt.txt")
+    )
+    # Target size of the story context; None keeps every page and entry.
+    context_token_budget: int | None = None
+    include_secondary_text: bool = True
+    # Entry cap per page, applied only when the budget is exceeded.
+    max_vocabulary_per_page: int = 3
 
     _system_instruction: str | None = field(init=False, repr=False, default=None)
     _user_prompt_template: str | None = field(init=False, repr=False, default=None)
+    _repair_prompt_template: str | None = field(init=False, repr=False, default=None)
 
     @staticmethod
     def _read_text(path: str, label: str) -> str:
@@ -43,13 +52,14 @@ class QuizPrompt:
         story_id: str,
         story: Story,
         question_count: int,
+        story_context: QuizContext | None = None,
     ) -> str:
         if self._user_prompt_template is None:
             self._user_prompt_template = self._read_text(
                 self.user_prompt_path, "Quiz user prompt"
             )
 
-        story_context = self._build_story_context(story)
+        story_context = story_context or self.build_story_context(story)
         try:
             return self._user_prompt_template.format(
                 story_id=story_id,
@@ -58,33 +68,51 @@ class QuizPrompt:
                 primary_language=story.primary_language,
                 secondary_language=story.secondary_language,
                 question_count=question_count,
-                story_context=story_context,
+                story_context=story_context.text,
             )
         except KeyError as exc:
             raise ValueError(
                 f"Quiz user prompt template has an unknown placeholder: {exc.args[0]}"
             ) from exc
 
-    @staticmethod
-    def _build_story_context(story: Story) -> str:
-        pages: list[dict[str, Any]] = []
-        for page in story.pages:
-            pages.append(
-                {
-                    "page_number": page.page_number,
-                    "text_primary": page.text_primary,
-                    "text_secondary": page.text_secondary,
-                    "vocabulary": [
-                        {
-                            "entry_id": entry.entry_id or "",
-                            "primary_word": entry.primary_word,
-                            "secondary_word": entry.secondary_word,
-                            "primary_definition": entry.primary_definition,
-                            "secondary_definition": entry.secondary_definition,
-                        }
-                        for entry in page.vocabulary
-                    ],
-                }
+    def generate_repair_prompt(
+        self,
+        *,
+        story_id: str,
+        story: Story,
+        kept_questions: list[QuizQuestion],
+        skills: list[QuizSkill],
+        story_context: QuizContext | None = None,
+    ) -> str:
+        if self._repair_prompt_template is None:
+            self._repair_prompt_template = self._read_text(
+                self.repair_prompt_path, "Quiz repair prompt"
+            )
+
+        kept_lines = "\n".join(
+            f"- [{question.skill}] {question.question_text}" for question in kept_questions
+        )
+        try:
+            return self._repair_prompt_template.format(
+                story_id=story_id,
+                story_title_primary=story.title_primary,
+                story_title_secondary=story.title_secondary,
+                primary_language=story.primary_language,
+                secondary_language=story.secondary_language,
+                kept_questions=kept_lines or "- (none)",
+                replacement_count=len(skills),
+                skills=", ".join(skills),
+                story_context=(story_context or self.build_story_context(story)).text,
             )
+        except KeyError as exc:
+            raise ValueError(
+                f"Quiz repair prompt template has an unknown placeholder: {exc.args[0]}"
+            ) from exc
 
-        return json.dumps(pages, ensure_ascii=False, indent=2)
+    def build_story_context(self, story: Story) -> QuizContext:
+        return build_quiz_context(
+            story,
+            token_budget=self.context_token_budget,
+            include_secondary_text=self.include_secondary_text,
+            max_vocabulary_per_page=self.max_vocabulary_per_page,
+        )
@@ -1,5 +1,6 @@
 from .story_model import STORY_PAGE_COUNT, Page, Story, VocabularyEntry
 from .story_prompts import StoryPrompt
+from .story_stream import StoryPageFeed, StoryStreamParser
 
 __all__ = [
     "Page",
@@ -7,6 +8,8 @@ __all__ = [
     "Story",
     "StoryPrompt",
     "StoryGenerator",
+    "StoryPageFeed",
+    "StoryStreamParser",
     "VocabularyEntry",
 ]
 
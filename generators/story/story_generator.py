@@ -1,39 +1,83 @@
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Collection, Optional
 
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
+from generators.common.cancellation import CancellationToken
+from generators.common.llm_cache import LLMResponseCache, get_llm_response_cache
+from generators.common.quota import estimate_tokens, get_provider_quota
+from generators.common.repair_stats import get_repair_stats
+from generators.common.structured_output import response_items
 from generators.illustration.illustration_cover_prompt import build_cover_prompt
 from generators.illustration.illustration_prompt_utils import (
     build_illustration_prefix,
     split_scene_prompt,
 )
-from generators.story.story_model import Story
+from generators.story.story_model import (
+    STORY_PAGE_COUNT,
+    Page,
+    Story,
+    StoryOutline,
+    StoryPageChunk,
+)
 from generators.story.story_prompts import StoryPrompt
+from generators.story.story_stream import StoryPageFeed, StoryStreamParser
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
 
+_STORY_HEADER_FIELDS = tuple(name for name in Story.model_fields if name != "pages")
+_ALL_PAGE_NUMBERS = range(1, STORY_PAGE_COUNT + 1)
+
 
 def _slugify_identifier(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
 
 
+def split_page_ranges(page_count: int, chunk_count: int) -> list[tuple[int, int]]:
+    """Split pages 1..page_count into contiguous, near-equal (first, last) ranges."""
+    chunk_count = max(1, min(chunk_count, page_count))
+    base, extra = divmod(page_count, chunk_count)
+    ranges: list[tuple[int, int]] = []
+    first_page = 1
+    for index in range(chunk_count):
+        size = base + (1 if index < extra else 0)
+        ranges.append((first_page, first_page + size - 1))
+        first_page += size
+    return ranges
+
+
 class StoryGenerator:
-    def __init__(self, model_name: str = "gemini-2.5-flash", include_style_guide: bool = True):
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        include_style_guide: bool = True,
+        max_repair_rounds: int = 2,
+        response_cache: Optional[LLMResponseCache] = None,
+    ):
         gemini_api_key = (os.getenv("GEMINI_STORY_API_KEY") or "").strip()
         if not gemini_api_key:
             raise ValueError("GEMINI_STORY_API_KEY environment variable not set.")
         self.client = genai.Client(api_key=gemini_api_key)
         self.model_name = model_name
+        self.quota = get_provider_quota(api_key=gemini_api_key, model_name=model_name)
         # `include_style_guide` is kept for backwards compatibility. The style guide
         # is now always appended to the system instruction.
         _ = include_style_guide
         self.prompts = StoryPrompt()
+        self.max_repair_rounds = max(0, max_repair_rounds)
+        self.repair_stats = get_repair_stats("story")
+        # Record/replay cache of raw responses, set by MORETALE_LLM_CACHE_MODE.
+        self.response_cache = (
+            response_cache if response_cache is not None else get_llm_response_cache()
+        )
 
     def generate_story(
         self,
@@ -43,43 +87,389 @@ class StoryGenerator:
         theme: str,
         extra_prompt: str = "",
         child_age: Optional[int] = None,
+        page_feed: Optional[StoryPageFeed] = None,
+        chunk_count: int = 1,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Story:
         """
         Generates a bilingual fairy tale using the Gemini API.
+
+        With ``page_feed`` the response is streamed and each page is put on the
+        feed as soon as it is complete, so audio and illustration work can
+        start before the whole story has been written.
+
+        With ``chunk_count`` > 1 a short call first plans the titles, style and
+        a one-beat-per-page outline, then that many concurrent calls each write
+        a contiguous range of pages against the outline.
+
+        A response with missing, extra or malformed pages is not regenerated:
+        the valid pages are kept and only the missing page numbers are
+        requested again, for at most ``max_repair_rounds`` rounds.
+
+        ``cancel_token`` is checked between streamed chunks and before every
+        chunk and repair call, so a canceled job stops instead of writing the
+        rest of the story.
         """
-        user_prompt = self.prompts.generate_user_prompt(
-            child_name=child_name,
-            child_age=child_age,
-            primary_lang=primary_lang,
-            secondary_lang=secondary_lang,
-            theme=theme,
-            extra_prompt=extra_prompt,
-        )
-        
+        story_inputs = {
+            "child_name": child_name,
+            "child_age": child_age,
+            "primary_lang": primary_lang,
+            "secondary_lang": secondary_lang,
+            "extra_prompt": extra_prompt,
+        }
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=user_prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=self.prompts.system_instruction,
-                    temperature=1.0, # High creativity
-                    response_mime_type="application/json",
-                    response_schema=Story,
-                ),
-            )
-            
-            if response.parsed:
-                story = response.parsed
+            if chunk_count > 1:
+                story = self._generate_chunked_story(
+                    story_inputs, theme, chunk_count, page_feed, cancel_token
+                )
+            elif page_feed is not None:
+                user_prompt = self.prompts.generate_user_prompt(theme=theme, **story_inputs)
+                cache_key = self._cache_key(user_prompt, Story)
+                parser = self._stream_story(user_prompt, page_feed, cache_key, cancel_token)
+                story = self._validate_story_text(
+                    parser.text,
+                    story_inputs,
+                    on_page=lambda page: self._put_page(page_feed, parser.header, page),
+                    cache_key=cache_key,
+                    cancel_token=cancel_token,
+                )
             else:
-                story = Story.model_validate_json(response.text)
+                user_prompt = self.prompts.generate_user_prompt(theme=theme, **story_inputs)
+                cache_key = self._cache_key(user_prompt, Story)
+                response = self._request(user_prompt, Story, cache_key, cancel_token)
+                if response.parsed:
+                    story = response.parsed
+                    self._remember(cache_key, response)
+                else:
+                    story = self._validate_story_text(
+                        response.text,
+                        story_inputs,
+                        cache_key=cache_key,
+                        cancel_token=cancel_token,
+                    )
 
             self._populate_illustration_fields(story)
             self._populate_vocabulary_fields(story)
+            if page_feed is not None:
+                page_feed.finish(story)
             return story
 
-        except Exception as e:
-            print(f"Error generating story: {e}")
+        except BaseException as e:
+            if page_feed is not None:
+                page_feed.fail(e)
+            if isinstance(e, Exception):
+                print(f"Error generating story: {e}")
+            raise
+
+    def _build_config(self, response_schema) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            system_instruction=self.prompts.system_instruction,
+            temperature=1.0, # High creativity
+            response_mime_type="application/json",
+            response_schema=response_schema,
+        )
+
+    def _cache_key(self, user_prompt: str, response_schema) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return LLMResponseCache.build_key(
+            model_name=self.model_name,
+            system_instruction=self.prompts.system_instruction,
+            user_prompt=user_prompt,
+            response_schema=response_schema,
+        )
+
+    def _request(
+        self,
+        user_prompt: str,
+        response_schema,
+        cache_key: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        """Call the model, through the response cache when ``cache_key`` is given.
+
+        Repair rounds pass no key: they must reach the model every time.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_canceled()
+        if cache_key is None:
+            return self._request_live(user_prompt, response_schema, cancel_token)
+        return self.response_cache.fetch(
+            cache_key,
+            lambda: self._request_live(user_prompt, response_schema, cancel_token),
+        )
+
+    def _remember(self, cache_key: Optional[str], response) -> None:
+        if cache_key is not None:
+            self.response_cache.record(cache_key, response)
+
+    def _forget(self, cache_key: Optional[str]) -> None:
+        if cache_key is not None:
+            self.response_cache.evict(cache_key)
+
+    def _request_live(
+        self,
+        user_prompt: str,
+        response_schema,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        with self.quota.slot(
+            estimated_tokens=estimate_tokens(self.prompts.system_instruction, user_prompt),
+            cancel_token=cancel_token,
+        ):
+            return self.client.models.generate_content(
+                model=self.model_name,
+                contents=user_prompt,
+                config=self._build_config(response_schema),
+            )
+
+    def _generate_structured(
+        self,
+        user_prompt: str,
+        response_schema,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        cache_key = self._cache_key(user_prompt, response_schema)
+        response = self._request(user_prompt, response_schema, cache_key, cancel_token)
+        try:
+            result = response.parsed or response_schema.model_validate_json(response.text)
+        except ValidationError:
+            self._forget(cache_key)
             raise
+        self._remember(cache_key, response)
+        return result
+
+    def _validate_story_text(
+        self,
+        text: str,
+        story_inputs: dict,
+        on_page: Optional[Callable[[Page], None]] = None,
+        cache_key: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Story:
+        try:
+            story = Story.model_validate_json(text)
+        except ValidationError:
+            self._forget(cache_key)
+            salvaged = _salvage_story(text)
+            if salvaged is None:
+                # Without usable story-level fields there is nothing to keep.
+                raise
+            header, pages = salvaged
+            return self._repair_story(
+                story_inputs, header, pages, on_page=on_page, cancel_token=cancel_token
+            )
+        self._remember(cache_key, text)
+        return story
+
+    def _repair_story(
+        self,
+        story_inputs: dict,
+        header: dict,
+        pages: dict[int, Page],
+        on_page: Optional[Callable[[Page], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Story:
+        missing = [number for number in _ALL_PAGE_NUMBERS if number not in pages]
+        if missing:
+            print(f"[warn] Story failed validation; repairing pages={missing}")
+        requested = 0
+        rounds = 0
+        while missing and rounds < self.max_repair_rounds:
+            rounds += 1
+            requested += len(missing)
+            # Neighbouring pages give the model enough continuity to write
+            # the gap without resending the whole story.
+            context_numbers = sorted(
+                {
+                    neighbour
+                    for number in missing
+                    for neighbour in (number - 1, number + 1)
+                    if neighbour in pages
+                }
+            )
+            try:
+                response = self._request(
+                    self.prompts.generate_repair_prompt(
+                        header=header,
+                        context_pages=[pages[number] for number in context_numbers],
+                        missing_pages=missing,
+                        **story_inputs,
+                    ),
+                    StoryPageChunk,
+                    cancel_token=cancel_token,
+                )
+            except Exception:
+                self.repair_stats.record(repaired=False, items_requested=requested, rounds=rounds)
+                raise
+            for number, page in _salvage_pages(response_items(response, "pages"), missing).items():
+                pages[number] = page
+                if on_page is not None:
+                    on_page(page)
+            missing = [number for number in _ALL_PAGE_NUMBERS if number not in pages]
+
+        self.repair_stats.record(repaired=not missing, items_requested=requested, rounds=rounds)
+        if missing:
+            raise ValueError(
+                f"Story is still missing pages {missing} after {rounds} repair round(s)"
+            )
+        return Story.model_validate({**header, "pages": [pages[n] for n in _ALL_PAGE_NUMBERS]})
+
+    def _generate_chunked_story(
+        self,
+        story_inputs: dict,
+        theme: str,
+        chunk_count: int,
+        page_feed: Optional[StoryPageFeed],
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Story:
+        outline = self._generate_structured(
+            self.prompts.generate_outline_prompt(theme=theme, **story_inputs),
+            StoryOutline,
+            cancel_token,
+        )
+        header = outline.model_dump(exclude={"beats"})
+        if page_feed is not None:
+            page_feed.set_header(self._build_stream_header(header))
+
+        page_ranges = split_page_ranges(STORY_PAGE_COUNT, chunk_count)
+        pages: dict[int, Page] = {}
+        with ThreadPoolExecutor(
+            max_workers=len(page_ranges),
+            thread_name_prefix="moretale-story",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._generate_page_chunk,
+                    story_inputs,
+                    outline,
+                    first_page,
+                    last_page,
+                    cancel_token,
+                )
+                for first_page, last_page in page_ranges
+            ]
+            # Chunks are merged in page order; a feed gets each chunk as soon
+            # as it and every chunk before it are done.
+            for future in futures:
+                for page in future.result():
+                    pages[page.page_number] = page
+                    if page_feed is not None:
+                        self._put_page(page_feed, header, page)
+
+        return self._repair_story(
+            story_inputs,
+            header,
+            pages,
+            on_page=(
+                (lambda page: self._put_page(page_feed, header, page))
+                if page_feed is not None
+                else None
+            ),
+            cancel_token=cancel_token,
+        )
+
+    def _generate_page_chunk(
+        self,
+        story_inputs: dict,
+        outline: StoryOutline,
+        first_page: int,
+        last_page: int,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> list[Page]:
+        user_prompt = self.prompts.generate_chunk_prompt(
+            outline=outline,
+            first_page=first_page,
+            last_page=last_page,
+            **story_inputs,
+        )
+        cache_key = self._cache_key(user_prompt, StoryPageChunk)
+        response = self._request(user_prompt, StoryPageChunk, cache_key, cancel_token)
+        raw_pages = response_items(response, "pages")
+        if len(raw_pages) == last_page - first_page + 1:
+            # A complete chunk is numbered by position; the model's own page
+            # numbers are only a hint. Short or long chunks keep their numbers
+            # and whatever is missing is repaired after the merge.
+            raw_pages = [
+                {**raw_page, "page_number": first_page + offset}
+                if isinstance(raw_page, dict)
+                else raw_page
+                for offset, raw_page in enumerate(raw_pages)
+            ]
+        pages = _salvage_pages(raw_pages, range(first_page, last_page + 1))
+        # Only a complete chunk is worth replaying; gaps are repaired live.
+        if len(pages) == last_page - first_page + 1:
+            self._remember(cache_key, response)
+        else:
+            self._forget(cache_key)
+        return list(pages.values())
+
+    def _stream_story(
+        self,
+        user_prompt: str,
+        page_feed: StoryPageFeed,
+        cache_key: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> StoryStreamParser:
+        parser = StoryStreamParser()
+        streamed: set[int] = set()
+
+        def feed(text: str) -> None:
+            for page in parser.feed(text):
+                # Extra or repeated page numbers are dropped again when the
+                # story is validated, so they never reach the feed.
+                if page.page_number in _ALL_PAGE_NUMBERS and page.page_number not in streamed:
+                    streamed.add(page.page_number)
+                    self._put_page(page_feed, parser.header, page)
+
+        if cache_key is not None:
+            cached_text = self.response_cache.lookup(cache_key)
+            if cached_text is not None:
+                feed(cached_text)
+                return parser
+
+        with self.quota.slot(
+            estimated_tokens=estimate_tokens(self.prompts.system_instruction, user_prompt),
+            cancel_token=cancel_token,
+        ):
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=user_prompt,
+                config=self._build_config(Story),
+            ):
+                if cancel_token is not None:
+                    cancel_token.raise_if_canceled()
+                feed(getattr(chunk, "text", None) or "")
+        # The caller records the text once the whole story has validated.
+        return parser
+
+    def _put_page(self, page_feed: StoryPageFeed, header: dict, page: Page) -> None:
+        page_feed.set_header(self._build_stream_header(header))
+        self._populate_page_fields(header, page)
+        page_feed.put(page)
+
+    @staticmethod
+    def _build_stream_header(header: dict) -> dict:
+        return {
+            **header,
+            "illustration_prefix": build_illustration_prefix(
+                header.get("image_style", ""), header.get("main_character_design", "")
+            ),
+        }
+
+    @staticmethod
+    def _populate_page_fields(header: dict, page: Page) -> None:
+        # Early pages get the same derived fields the final story gets below.
+        image_style = header.get("image_style")
+        main_character_design = header.get("main_character_design")
+        if image_style and main_character_design:
+            page.illustration_scene_prompt, _ = split_scene_prompt(
+                illustration_prefix=build_illustration_prefix(image_style, main_character_design),
+                main_character_design=main_character_design,
+                full_prompt=page.illustration_prompt,
+            )
+        StoryGenerator._assign_vocabulary_ids(page)
 
     @staticmethod
     def _populate_illustration_fields(story: Story) -> None:
@@ -107,18 +497,56 @@ class StoryGenerator:
     @staticmethod
     def _populate_vocabulary_fields(story: Story) -> None:
         for page in story.pages:
-            seen_ids: set[str] = set()
-            for index, entry in enumerate(page.vocabulary, start=1):
-                raw_id = (
-                    entry.entry_id
-                    or _slugify_identifier(entry.primary_word)
-                    or _slugify_identifier(entry.secondary_word)
-                    or f"word-{index:02d}"
-                )
-                candidate = raw_id
-                suffix = 2
-                while candidate in seen_ids:
-                    candidate = f"{raw_id}-{suffix}"
-                    suffix += 1
-                entry.entry_id = candidate
-                seen_ids.add(candidate)
+            StoryGenerator._assign_vocabulary_ids(page)
+
+    @staticmethod
+    def _assign_vocabulary_ids(page: Page) -> None:
+        seen_ids: set[str] = set()
+        for index, entry in enumerate(page.vocabulary, start=1):
+            raw_id = (
+                entry.entry_id
+                or _slugify_identifier(entry.primary_word)
+                or _slugify_identifier(entry.secondary_word)
+                or f"word-{index:02d}"
+            )
+            candidate = raw_id
+            suffix = 2
+            while candidate in seen_ids:
+                candidate = f"{raw_id}-{suffix}"
+                suffix += 1
+            entry.entry_id = candidate
+            seen_ids.add(candidate)
+
+
+def _salvage_pages(raw_pages: list, page_numbers: Collection[int]) -> dict[int, Page]:
+    """Keep the first valid page for each wanted page number."""
+    pages: dict[int, Page] = {}
+    for raw_page in raw_pages:
+        try:
+            page = Page.model_validate(raw_page)
+        except ValidationError:
+            continue
+        if page.page_number in page_numbers and page.page_number not in pages:
+            pages[page.page_number] = page
+    return pages
+
+
+def _salvage_story(text: str) -> tuple[dict, dict[int, Page]] | None:
+    try:
+        data = json.loads(text or "")
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    header = {name: data[name] for name in _STORY_HEADER_FIELDS if name in data}
+    try:
+        # Validate the story-level fields on their own with a placeholder page
+        # list; only the pages may be repaired.
+        Story.model_validate({**header, "pages": []})
+    except ValidationError as error:
+        if any(tuple(item["loc"][:1]) != ("pages",) for item in error.errors()):
+            return None
+    raw_pages = data.get("pages")
+    if not isinstance(raw_pages, list):
+        raw_pages = []
+    return header, _salvage_pages(raw_pages, _ALL_PAGE_NUMBERS)
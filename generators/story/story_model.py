@@ -116,3 +116,45 @@ class Story(BaseModel):
                 f"Story must have exactly {STORY_PAGE_COUNT} pages, but got {len(value)}"
             )
         return value
+
+
+class StoryOutline(BaseModel):
+    """Story-level fields plus one beat per page, planned before any page is written."""
+
+    title_primary: str = Field(..., description="Title in primary language")
+    title_secondary: str = Field(..., description="Title in secondary language")
+    author_name: str = Field(..., description="Name of the author (AI or Child's name)")
+    primary_language: str = Field(..., description="Primary language of the story text")
+    secondary_language: str = Field(
+        ..., description="Secondary language of the story text"
+    )
+    image_style: str = Field(
+        ..., description="The consistent art style for the entire book."
+    )
+    main_character_design: str = Field(
+        ...,
+        description=(
+            "Fixed physical description of the main character, reused verbatim in "
+            "every page's illustration prompt."
+        ),
+    )
+    beats: List[str] = Field(
+        ...,
+        description=(
+            f"Exactly {STORY_PAGE_COUNT} one-sentence plot beats, one per page in order."
+        ),
+    )
+
+    @field_validator("beats")
+    def check_beat_count(cls, value):
+        if len(value) != STORY_PAGE_COUNT:
+            raise ValueError(
+                f"Outline must have exactly {STORY_PAGE_COUNT} beats, but got {len(value)}"
+            )
+        return value
+
+
+class StoryPageChunk(BaseModel):
+    pages: List[Page] = Field(
+        ..., description="The requested contiguous range of pages, in order."
+    )
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from generators.story.story_model import Page, StoryOutline
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 PROMPTS_DIR = PROJECT_ROOT / "prompts"
@@ -18,10 +19,22 @@ class StoryPrompt:
     style_guide_path: str = field(
         default_factory=lambda: str(PROMPTS_DIR / "style_guide.txt")
     )
+    outline_prompt_path: str = field(
+        default_factory=lambda: str(PROMPTS_DIR / "story_outline_prompt.txt")
+    )
+    chunk_prompt_path: str = field(
+        default_factory=lambda: str(PROMPTS_DIR / "story_chunk_prompt.txt")
+    )
+    repair_prompt_path: str = field(
+        default_factory=lambda: str(PROMPTS_DIR / "story_repair_prompt.txt")
+    )
     include_style_guide: bool = True
 
     _system_instruction: Optional[str] = field(init=False, repr=False, default=None)
     _user_prompt_template: Optional[str] = field(init=False, repr=False, default=None)
+    _outline_prompt_template: Optional[str] = field(init=False, repr=False, default=None)
+    _chunk_prompt_template: Optional[str] = field(init=False, repr=False, default=None)
+    _repair_prompt_template: Optional[str] = field(init=False, repr=False, default=None)
 
     @staticmethod
     def _read_text(path: str, label: str) -> str:
@@ -57,18 +70,127 @@ class StoryPrompt:
                 self.user_prompt_path, "User prompt"
             )
 
-        child_age_text = "" if child_age is None else str(child_age)
+        return self._format(
+            self._user_prompt_template,
+            "User prompt",
+            child_name=child_name,
+            child_age="" if child_age is None else str(child_age),
+            primary_lang=primary_lang,
+            secondary_lang=secondary_lang,
+            theme="" if theme is None else theme,
+            extra_prompt=extra_prompt,
+        )
 
-        try:
-            return self._user_prompt_template.format(
-                child_name=child_name,
-                child_age=child_age_text,
-                primary_lang=primary_lang,
-                secondary_lang=secondary_lang,
-                theme="" if theme is None else theme,
-                extra_prompt=extra_prompt,
+    def generate_outline_prompt(
+        self,
+        child_name: str,
+        primary_lang: str,
+        secondary_lang: str,
+        theme: str,
+        extra_prompt: str = "",
+        child_age: Optional[int] = None,
+    ) -> str:
+        if self._outline_prompt_template is None:
+            self._outline_prompt_template = self._read_text(
+                self.outline_prompt_path, "Outline prompt"
+            )
+
+        return self._format(
+            self._outline_prompt_template,
+            "Outline prompt",
+            child_name=child_name,
+            child_age="" if child_age is None else str(child_age),
+            primary_lang=primary_lang,
+            secondary_lang=secondary_lang,
+            theme="" if theme is None else theme,
+            extra_prompt=extra_prompt,
+        )
+
+    def generate_chunk_prompt(
+        self,
+        child_name: str,
+        primary_lang: str,
+        secondary_lang: str,
+        outline: StoryOutline,
+        first_page: int,
+        last_page: int,
+        extra_prompt: str = "",
+        child_age: Optional[int] = None,
+    ) -> str:
+        if self._chunk_prompt_template is None:
+            self._chunk_prompt_template = self._read_text(
+                self.chunk_prompt_path, "Chunk prompt"
             )
+
+        return self._format(
+            self._chunk_prompt_template,
+            "Chunk prompt",
+            child_name=child_name,
+            child_age="" if child_age is None else str(child_age),
+            primary_lang=primary_lang,
+            secondary_lang=secondary_lang,
+            extra_prompt=extra_prompt,
+            outline=self._build_outline_context(outline),
+            first_page=first_page,
+            last_page=last_page,
+        )
+
+    def generate_repair_prompt(
+        self,
+        child_name: str,
+        primary_lang: str,
+        secondary_lang: str,
+        header: dict,
+        context_pages: list[Page],
+        missing_pages: list[int],
+        extra_prompt: str = "",
+        child_age: Optional[int] = None,
+    ) -> str:
+        if self._repair_prompt_template is None:
+            self._repair_prompt_template = self._read_text(
+                self.repair_prompt_path, "Repair prompt"
+            )
+
+        lines = [
+            f"- {name}: {header.get(name, '')}"
+            for name in ("title_primary", "title_secondary", "image_style", "main_character_design")
+        ]
+        lines.extend(
+            f"- Page {page.page_number}: {page.text_primary} / {page.text_secondary}"
+            for page in context_pages
+        )
+        return self._format(
+            self._repair_prompt_template,
+            "Repair prompt",
+            child_name=child_name,
+            child_age="" if child_age is None else str(child_age),
+            primary_lang=primary_lang,
+            secondary_lang=secondary_lang,
+            extra_prompt=extra_prompt,
+            story_context="\n".join(lines),
+            missing_pages=", ".join(str(number) for number in missing_pages),
+        )
+
+    @staticmethod
+    def _build_outline_context(outline: StoryOutline) -> str:
+        lines = [
+            f"- title_primary: {outline.title_primary}",
+            f"- title_secondary: {outline.title_secondary}",
+            f"- image_style: {outline.image_style}",
+            f"- main_character_design: {outline.main_character_design}",
+            "- beats:",
+        ]
+        lines.extend(
+            f"  - Page {page_number}: {beat}"
+            for page_number, beat in enumerate(outline.beats, start=1)
+        )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format(template: str, label: str, **values) -> str:
+        try:
+            return template.format(**values)
         except KeyError as exc:
             raise ValueError(
-                f"User prompt template has an unknown placeholder: {exc.args[0]}"
+                f"{label} template has an unknown placeholder: {exc.args[0]}"
             ) from exc
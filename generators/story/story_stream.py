@@ -0,0 +1,208 @@
+import json
+import threading
+from typing import Any, Iterator
+
+from pydantic import ValidationError
+
+from .story_model import STORY_PAGE_COUNT, Page, Story
+
+
+class StoryStreamParser:
+    """Incremental parser for the story JSON as it streams from the model.
+
+    Only tracks enough structure to recognise the top-level string fields and
+    each complete object inside the top-level ``pages`` array, so every page
+    can be handed downstream as soon as its closing brace arrives. The full
+    text is still validated as a ``Story`` once the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self.header: dict[str, Any] = {}
+        self._text = ""
+        self._position = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._top_key: str | None = None
+        self._pages_depth: int | None = None
+        self._page_start: int | None = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[Page]:
+        """Consume the next chunk and return the pages it completed."""
+        if not chunk:
+            return []
+        self._text += chunk
+        pages: list[Page] = []
+        text = self._text
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._on_string(text[self._string_start : index + 1])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                if (
+                    char == "{"
+                    and self._pages_depth is not None
+                    and len(self._stack) == self._pages_depth
+                ):
+                    self._page_start = index
+                self._stack.append(char)
+                if len(self._stack) == 1:
+                    self._expect_key = True
+                elif len(self._stack) == 2 and char == "[" and self._top_key == "pages":
+                    self._pages_depth = 2
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if (
+                    char == "}"
+                    and self._page_start is not None
+                    and len(self._stack) == self._pages_depth
+                ):
+                    raw_page = text[self._page_start : index + 1]
+                    self._page_start = None
+                    try:
+                        pages.append(Page.model_validate_json(raw_page))
+                    except ValidationError:
+                        # Left for the repair pass once the whole story is in.
+                        pass
+                elif char == "]" and self._pages_depth is not None and len(self._stack) < 2:
+                    self._pages_depth = None
+            elif len(self._stack) == 1:
+                if char == ",":
+                    self._expect_key = True
+                elif char == ":":
+                    self._expect_key = False
+        self._position = len(text)
+        return pages
+
+    def _on_string(self, raw: str) -> None:
+        if len(self._stack) != 1:
+            return
+        value = json.loads(raw)
+        if self._expect_key:
+            self._top_key = value
+        elif self._top_key is not None:
+            self.header[self._top_key] = value
+
+
+class StoryPageFeed:
+    """Hands the pages of a still-generating story to downstream stages.
+
+    The story generator ``put``s pages as they stream in and ends the feed
+    with ``finish`` (or ``fail``). Consumers read ``pages``: each iteration
+    yields every page in arrival order, blocking for pages not written yet.
+    Story-level fields such as ``image_style`` block until the header part of
+    the story has been parsed.
+    """
+
+    _HEADER_FIELDS = (
+        "title_primary",
+        "title_secondary",
+        "author_name",
+        "primary_language",
+        "secondary_language",
+        "image_style",
+        "main_character_design",
+        "illustration_prefix",
+    )
+
+    def __init__(self, expected_pages: int = STORY_PAGE_COUNT) -> None:
+        self.expected_pages = expected_pages
+        self._condition = threading.Condition()
+        self._pages: list[Page] = []
+        self._header: dict[str, Any] | None = None
+        self._story: Story | None = None
+        self._error: BaseException | None = None
+        self._done = False
+
+    def set_header(self, header: dict[str, Any]) -> None:
+        with self._condition:
+            if self._header is None:
+                self._header = dict(header)
+                self._condition.notify_all()
+
+    def put(self, page: Page) -> None:
+        with self._condition:
+            self._pages.append(page)
+            self._condition.notify_all()
+
+    def finish(self, story: Story) -> None:
+        with self._condition:
+            self._story = story
+            if self._header is None:
+                self._header = {
+                    name: getattr(story, name, None) for name in self._HEADER_FIELDS
+                }
+            self._done = True
+            self._condition.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        with self._condition:
+            self._error = error
+            self._done = True
+            self._condition.notify_all()
+
+    @property
+    def story(self) -> Story:
+        """The final validated story; blocks until the stream has ended."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._done)
+            if self._story is None:
+                raise self._error or RuntimeError("story stream ended without a story")
+            return self._story
+
+    @property
+    def pages(self) -> "_FeedPages":
+        return _FeedPages(self)
+
+    def _page_at(self, index: int) -> Page | None:
+        with self._condition:
+            self._condition.wait_for(lambda: index < len(self._pages) or self._done)
+            if index < len(self._pages):
+                return self._pages[index]
+            if self._error is not None:
+                raise self._error
+            return None
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in StoryPageFeed._HEADER_FIELDS:
+            raise AttributeError(name)
+        with self._condition:
+            self._condition.wait_for(lambda: self._header is not None or self._done)
+            if self._header is None:
+                raise self._error or RuntimeError("story stream ended without a header")
+            return self._header.get(name)
+
+
+class _FeedPages:
+    def __init__(self, feed: StoryPageFeed) -> None:
+        self._feed = feed
+
+    def __len__(self) -> int:
+        return self._feed.expected_pages
+
+    def __iter__(self) -> Iterator[Page]:
+        index = 0
+        while True:
+            page = self._feed._page_at(index)
+            if page is None:
+                return
+            yield page
+            index += 1
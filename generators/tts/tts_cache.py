@@ -0,0 +1,24 @@
+from generators.common.content_cache import ContentCache, cache_from_env, content_key
+
+TTS_CACHE_DIR_ENV = "MORETALE_TTS_CACHE_DIR"
+TTS_CACHE_MAX_MB_ENV = "MORETALE_TTS_CACHE_MAX_MB"
+_DEFAULT_MAX_MB = 2048
+
+
+def get_tts_audio_cache() -> ContentCache | None:
+    return cache_from_env(TTS_CACHE_DIR_ENV, TTS_CACHE_MAX_MB_ENV, _DEFAULT_MAX_MB)
+
+
+def build_tts_cache_key(
+    *,
+    model_name: str,
+    voice_name: str,
+    temperature: float,
+    language: str,
+    prompt: str,
+) -> str:
+    # Whitespace differences never change the spoken audio.
+    normalized_prompt = " ".join(prompt.split())
+    return content_key(
+        "tts", model_name, voice_name, float(temperature), language.strip(), normalized_prompt
+    )
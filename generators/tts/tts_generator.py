@@ -4,11 +4,17 @@ from typing import Callable
 from google import genai
 from google.genai import types
 
+from generators.common.cancellation import CancellationToken
+from generators.common.content_cache import ContentCache, write_bytes_atomic
+from generators.common.progress import ProgressCallback
+from generators.common.quota import estimate_tokens, get_provider_quota
+
 from .tts_audio import (
     convert_to_wav,
     normalize_to_wav_bytes,
     parse_audio_mime_type,
 )
+from .tts_cache import build_tts_cache_key, get_tts_audio_cache
 from .tts_pipeline import generate_book_audio_pipeline
 from .tts_runtime import TTSRuntime
 from .tts_stream import stream_audio_bytes
@@ -24,6 +30,10 @@ class TTSGenerator:
         temperature: float = 1.0,
         request_interval_sec: float = 10.0,
         client: genai.Client | None = None,
+        requests_per_minute: float | None = None,
+        max_concurrent_requests: int = 1,
+        adaptive_rate_control: bool = False,
+        audio_cache: ContentCache | None = None,
     ):
         if not api_key:
             raise ValueError("GEMINI_TTS_API_KEY environment variable not set.")
@@ -32,7 +42,15 @@ class TTSGenerator:
         self.model_name = model_name
         self.voice_name = voice_name
         self.temperature = temperature
-        self.runtime = TTSRuntime(request_interval_sec=request_interval_sec)
+        self.quota = get_provider_quota(api_key=api_key, model_name=model_name)
+        self.runtime = TTSRuntime(
+            request_interval_sec=request_interval_sec,
+            requests_per_minute=requests_per_minute,
+            max_concurrent_requests=max_concurrent_requests,
+            adaptive_rate_control=adaptive_rate_control,
+        )
+        # Shared across stories; configured by MORETALE_TTS_CACHE_DIR by default.
+        self.audio_cache = audio_cache if audio_cache is not None else get_tts_audio_cache()
 
     @property
     def _last_request_time(self) -> float | None:
@@ -45,6 +63,15 @@ class TTSGenerator:
     def _build_prompt(self, language_name: str, text: str) -> str:
         return build_tts_prompt(language_name=language_name, text=text)
 
+    def _cache_key(self, language_name: str, prompt: str) -> str:
+        return build_tts_cache_key(
+            model_name=self.model_name,
+            voice_name=self.voice_name,
+            temperature=self.temperature,
+            language=language_name,
+            prompt=prompt,
+        )
+
     def _build_contents(self, prompt: str) -> list[types.Content]:
         return [
             types.Content(
@@ -66,10 +93,14 @@ class TTSGenerator:
             ),
         )
 
-    def _enforce_rate_limit(self) -> None:
+    @staticmethod
+    def _sleep_fn(cancel_token: CancellationToken | None) -> Callable[[float], None]:
+        return cancel_token.sleep if cancel_token is not None else time.sleep
+
+    def _enforce_rate_limit(self, cancel_token: CancellationToken | None = None) -> None:
         self.runtime.enforce_rate_limit(
             monotonic_fn=time.monotonic,
-            sleep_fn=time.sleep,
+            sleep_fn=self._sleep_fn(cancel_token),
         )
 
     def _retry_with_backoff(
@@ -78,33 +109,48 @@ class TTSGenerator:
         attempts: int = 3,
         backoff: list[float] | None = None,
         context: str = "",
+        cancel_token: CancellationToken | None = None,
     ) -> None:
         self.runtime.run_with_retry(
             func=func,
             attempts=attempts,
             backoff=backoff,
             context=context,
-            sleep_fn=time.sleep,
+            sleep_fn=self._sleep_fn(cancel_token),
         )
 
     def _stream_audio_bytes(
         self,
         contents: list[types.Content],
         config: types.GenerateContentConfig,
+        cancel_token: CancellationToken | None = None,
     ) -> tuple[bytes, str]:
-        self._enforce_rate_limit()
-        self.runtime.mark_request_time(monotonic_fn=time.monotonic)
-        return stream_audio_bytes(
-            client=self.client,
-            model_name=self.model_name,
-            contents=contents,
-            config=config,
-        )
+        if cancel_token is not None:
+            cancel_token.raise_if_canceled()
+        self._enforce_rate_limit(cancel_token)
+        prompt_texts = [
+            getattr(part, "text", None)
+            for content in contents
+            for part in (getattr(content, "parts", None) or [])
+        ]
+        # The per-job interval above paces this book; the provider quota is
+        # shared by every job in every worker process using the same key.
+        with self.quota.slot(
+            estimated_tokens=estimate_tokens(*prompt_texts),
+            cancel_token=cancel_token,
+        ):
+            return stream_audio_bytes(
+                client=self.client,
+                model_name=self.model_name,
+                contents=contents,
+                config=config,
+                cancel_token=cancel_token,
+            )
 
     def _save_audio_file(self, file_path: str, audio_bytes: bytes, mime_type: str) -> None:
         wav_bytes = normalize_to_wav_bytes(audio_bytes=audio_bytes, mime_type=mime_type)
-        with open(file_path, "wb") as file:
-            file.write(wav_bytes)
+        # Never truncate in place: the file may be a hardlink into the cache.
+        write_bytes_atomic(file_path, wav_bytes)
 
     def generate_book_audio(
         self,
@@ -113,7 +159,9 @@ class TTSGenerator:
         primary_language: str | None = None,
         secondary_language: str | None = None,
         skip_existing: bool = True,
-    ) -> dict[str, int | list[str] | str]:
+        cancel_token: CancellationToken | None = None,
+        progress_callback: ProgressCallback | None = None,
+    ) -> dict[str, int | list[str] | str | bool]:
         chosen_primary_language = (
             primary_language or getattr(story, "primary_language", "") or "Primary"
         ).strip()
@@ -123,7 +171,19 @@ class TTSGenerator:
         config = self._build_config()
 
         def stream_with_config(contents: list[types.Content]) -> tuple[bytes, str]:
-            return self._stream_audio_bytes(contents=contents, config=config)
+            return self._stream_audio_bytes(
+                contents=contents,
+                config=config,
+                cancel_token=cancel_token,
+            )
+
+        def retry_with_cancel(
+            func: Callable[[], None],
+            attempts: int = 3,
+            backoff: list[float] | None = None,
+            context: str = "",
+        ) -> None:
+            self._retry_with_backoff(func, attempts, backoff, context, cancel_token=cancel_token)
 
         return generate_book_audio_pipeline(
             story=story,
@@ -135,5 +195,10 @@ class TTSGenerator:
             build_contents_fn=self._build_contents,
             stream_audio_fn=stream_with_config,
             save_audio_fn=self._save_audio_file,
-            retry_with_backoff_fn=self._retry_with_backoff,
+            retry_with_backoff_fn=retry_with_cancel,
+            max_concurrent_requests=self.runtime.max_concurrent_requests,
+            cancel_token=cancel_token,
+            progress_callback=progress_callback,
+            audio_cache=self.audio_cache,
+            cache_key_fn=self._cache_key,
         )
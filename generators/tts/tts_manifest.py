@@ -9,6 +9,7 @@ def build_manifest_entry(
     path: str,
     status: str,
     error: str | None = None,
+    cache_hit: bool = False,
 ) -> dict[str, str | int]:
     entry: dict[str, str | int] = {
         "page_number": page_number,
@@ -19,6 +20,8 @@ def build_manifest_entry(
     }
     if error is not None:
         entry["error"] = error
+    if cache_hit:
+        entry["cache_hit"] = True
     return entry
 
 
@@ -31,8 +34,13 @@ def write_tts_manifest(
     skipped: int,
     failed: int,
     entries: list[dict[str, str | int]],
+    cache_hits: int = 0,
+    canceled: bool = False,
 ) -> str:
     manifest_path = os.path.join(audio_root, "manifest.json")
+    # Streamed stories can deliver repaired pages late; keep the manifest in
+    # page order (the sort is stable, so languages/roles keep their order).
+    entries = sorted(entries, key=lambda entry: entry["page_number"])
     with open(manifest_path, "w", encoding="utf-8") as file:
         json.dump(
             {
@@ -42,6 +50,8 @@ def write_tts_manifest(
                 "generated": generated,
                 "skipped": skipped,
                 "failed": failed,
+                "cache_hits": cache_hits,
+                "canceled": canceled,
                 "entries": entries,
             },
             file,
@@ -1,10 +1,29 @@
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Callable
 
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.common.content_cache import ContentCache
+from generators.common.progress import ProgressCallback, report_progress
+
 from .tts_manifest import build_manifest_entry, write_tts_manifest
 from .tts_text import slugify_language_name
 
 
+@dataclass(frozen=True)
+class _TTSTask:
+    page_number: int
+    role: str
+    language: str
+    text: str
+    file_path: str
+
+    @property
+    def label(self) -> str:
+        return f"page={self.page_number} lang={self.language} role={self.role}"
+
+
 def _build_language_specs(
     audio_root: str,
     primary_language: str,
@@ -22,6 +41,20 @@ def _build_language_specs(
     )
 
 
+def _build_page_tasks(page, language_specs) -> list[_TTSTask]:
+    page_number = page.page_number
+    return [
+        _TTSTask(
+            page_number=page_number,
+            role=role_label,
+            language=language_name,
+            text=getattr(page, text_attr, ""),
+            file_path=os.path.join(lang_dir, f"page_{page_number:02d}_{role_label}.wav"),
+        )
+        for role_label, text_attr, language_name, lang_dir in language_specs
+    ]
+
+
 def generate_book_audio_pipeline(
     story,
     output_dir: str,
@@ -33,106 +66,214 @@ def generate_book_audio_pipeline(
     stream_audio_fn: Callable[[object], tuple[bytes, str]],
     save_audio_fn: Callable[[str, bytes, str], None],
     retry_with_backoff_fn: Callable[[Callable[[], None], int, list[float], str], None],
-) -> dict[str, int | list[str] | str]:
+    max_concurrent_requests: int = 1,
+    cancel_token: CancellationToken | None = None,
+    progress_callback: ProgressCallback | None = None,
+    audio_cache: ContentCache | None = None,
+    cache_key_fn: Callable[[str, str], str] | None = None,
+) -> dict[str, int | list[str] | str | bool]:
     audio_root = os.path.join(output_dir, "audio")
     language_specs = _build_language_specs(
         audio_root=audio_root,
         primary_language=primary_language,
         secondary_language=secondary_language,
     )
+    # ``story.pages`` may be a live feed of a story still being written, so
+    # tasks are built and submitted page by page as the pages arrive.
+    report_progress(
+        progress_callback,
+        "tasks.planned",
+        stage="tts",
+        total=len(story.pages) * len(language_specs),
+    )
+
+    def report_task(task: _TTSTask, status: str, error: str | None = None) -> None:
+        report_progress(
+            progress_callback,
+            "task",
+            stage="tts",
+            page_number=task.page_number,
+            language=task.language,
+            role=task.role,
+            status=status,
+            error=error,
+        )
+
+    # One slot per task keeps the manifest in page/role order no matter in
+    # which order concurrent requests complete.
+    tasks: list[_TTSTask] = []
+    manifest_entries: dict[int, dict[str, str | int]] = {}
+    failures_by_index: dict[int, str] = {}
+
+    def is_canceled() -> bool:
+        return cancel_token is not None and cancel_token.is_canceled
+
+    def needs_request(index: int) -> bool:
+        task = tasks[index]
+        if not task.text or not task.text.strip():
+            print(f"SKIP {task.label} reason=empty_text")
+            manifest_entries[index] = build_manifest_entry(
+                page_number=task.page_number,
+                language=task.language,
+                role=task.role,
+                path=task.file_path,
+                status="skipped_empty_text",
+            )
+            report_task(task, "skipped_empty_text")
+            return False
 
-    generated = 0
-    skipped = 0
-    total_tasks = 0
-    failures: list[str] = []
-    manifest_entries: list[dict[str, str | int]] = []
-
-    for page in story.pages:
-        page_number = page.page_number
-        for role_label, text_attr, language_name, lang_dir in language_specs:
-            total_tasks += 1
-            text = getattr(page, text_attr, "")
-            label = f"page={page_number} lang={language_name} role={role_label}"
-            file_path = os.path.join(lang_dir, f"page_{page_number:02d}_{role_label}.wav")
-
-            if not text or not text.strip():
-                skipped += 1
-                print(f"SKIP {label} reason=empty_text")
-                manifest_entries.append(
-                    build_manifest_entry(
-                        page_number=page_number,
-                        language=language_name,
-                        role=role_label,
-                        path=file_path,
-                        status="skipped_empty_text",
-                    )
-                )
-                continue
-
-            if skip_existing and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                skipped += 1
-                print(f"SKIP {label} reason=exists path={file_path}")
-                manifest_entries.append(
-                    build_manifest_entry(
-                        page_number=page_number,
-                        language=language_name,
-                        role=role_label,
-                        path=file_path,
-                        status="skipped_exists",
-                    )
-                )
-                continue
-
-            prompt = build_prompt_fn(language_name, text)
-            contents = build_contents_fn(prompt)
-
-            def run_single_request() -> None:
-                audio_bytes, mime_type = stream_audio_fn(contents)
-                save_audio_fn(file_path, audio_bytes, mime_type)
-
-            try:
-                retry_with_backoff_fn(run_single_request, 3, [2.0, 4.0, 8.0], label)
-                generated += 1
-                print(f"OK {label} path={file_path}")
-                manifest_entries.append(
-                    build_manifest_entry(
-                        page_number=page_number,
-                        language=language_name,
-                        role=role_label,
-                        path=file_path,
-                        status="generated",
-                    )
-                )
-            except Exception as error:
-                failures.append(f"{label}: {error}")
-                print(f"FAIL {label} error={error}")
-                manifest_entries.append(
-                    build_manifest_entry(
-                        page_number=page_number,
-                        language=language_name,
-                        role=role_label,
-                        path=file_path,
-                        status="failed",
-                        error=str(error),
-                    )
-                )
+        if (
+            skip_existing
+            and os.path.exists(task.file_path)
+            and os.path.getsize(task.file_path) > 0
+        ):
+            print(f"SKIP {task.label} reason=exists path={task.file_path}")
+            manifest_entries[index] = build_manifest_entry(
+                page_number=task.page_number,
+                language=task.language,
+                role=task.role,
+                path=task.file_path,
+                status="skipped_exists",
+            )
+            report_task(task, "skipped_exists")
+            return False
+
+        return True
+
+    def restore_from_cache(task: _TTSTask, cache_key: str) -> bool:
+        cached_path = audio_cache.lookup(cache_key, ".wav")
+        if cached_path is None:
+            return False
+        try:
+            return audio_cache.materialize(cached_path, task.file_path)
+        except OSError as error:
+            print(f"[warn] TTS cache read failed {task.label} error={error}")
+            return False
+
+    def store_in_cache(task: _TTSTask, cache_key: str) -> None:
+        # The audio is already saved; a cache failure must not fail the task.
+        try:
+            audio_cache.put_file(cache_key, task.file_path, ".wav")
+        except OSError as error:
+            print(f"[warn] TTS cache write failed {task.label} error={error}")
+
+    def run_task(index: int) -> None:
+        # Canceled tasks leave their slot empty, so the manifest written below
+        # only lists what actually happened.
+        if is_canceled():
+            return
+        task = tasks[index]
+        prompt = build_prompt_fn(task.language, task.text)
+        cache_key = (
+            cache_key_fn(task.language, prompt)
+            if audio_cache is not None and cache_key_fn is not None
+            else None
+        )
+        if cache_key is not None and restore_from_cache(task, cache_key):
+            print(f"CACHE {task.label} path={task.file_path}")
+            manifest_entries[index] = build_manifest_entry(
+                page_number=task.page_number,
+                language=task.language,
+                role=task.role,
+                path=task.file_path,
+                status="generated",
+                cache_hit=True,
+            )
+            report_task(task, "generated")
+            return
+        contents = build_contents_fn(prompt)
+
+        def run_single_request() -> None:
+            audio_bytes, mime_type = stream_audio_fn(contents)
+            save_audio_fn(task.file_path, audio_bytes, mime_type)
+
+        try:
+            retry_with_backoff_fn(run_single_request, 3, [2.0, 4.0, 8.0], task.label)
+            print(f"OK {task.label} path={task.file_path}")
+            if cache_key is not None:
+                store_in_cache(task, cache_key)
+            manifest_entries[index] = build_manifest_entry(
+                page_number=task.page_number,
+                language=task.language,
+                role=task.role,
+                path=task.file_path,
+                status="generated",
+            )
+            report_task(task, "generated")
+        except GenerationCanceled:
+            print(f"CANCEL {task.label}")
+        except Exception as error:
+            failures_by_index[index] = f"{task.label}: {error}"
+            print(f"FAIL {task.label} error={error}")
+            manifest_entries[index] = build_manifest_entry(
+                page_number=task.page_number,
+                language=task.language,
+                role=task.role,
+                path=task.file_path,
+                status="failed",
+                error=str(error),
+            )
+            report_task(task, "failed", error=str(error))
+
+    executor = (
+        ThreadPoolExecutor(
+            max_workers=max_concurrent_requests,
+            thread_name_prefix="moretale-tts",
+        )
+        if max_concurrent_requests > 1
+        else None
+    )
+    futures: list[Future] = []
+    try:
+        for page in story.pages:
+            if is_canceled():
+                break
+            for task in _build_page_tasks(page, language_specs):
+                tasks.append(task)
+                index = len(tasks) - 1
+                if not needs_request(index):
+                    continue
+                if executor is not None:
+                    futures.append(executor.submit(run_task, index))
+                else:
+                    run_task(index)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+    # Errors outside a task's own handler surface here, as they would in
+    # sequential mode, instead of silently dropping the task.
+    for future in futures:
+        future.result()
+
+    entries = [manifest_entries[index] for index in sorted(manifest_entries)]
+    failures = [failures_by_index[index] for index in sorted(failures_by_index)]
+    generated = sum(1 for entry in entries if entry["status"] == "generated")
+    cache_hits = sum(1 for entry in entries if entry.get("cache_hit"))
+    skipped = sum(
+        1 for entry in entries if entry["status"] in {"skipped_exists", "skipped_empty_text"}
+    )
 
+    canceled = is_canceled()
     manifest_path = write_tts_manifest(
         audio_root=audio_root,
         primary_language=primary_language,
         secondary_language=secondary_language,
-        total_tasks=total_tasks,
+        total_tasks=len(tasks),
         generated=generated,
         skipped=skipped,
         failed=len(failures),
-        entries=manifest_entries,
+        entries=entries,
+        cache_hits=cache_hits,
+        canceled=canceled,
     )
 
     return {
-        "total_tasks": total_tasks,
+        "total_tasks": len(tasks),
         "generated": generated,
         "skipped": skipped,
         "failed": len(failures),
+        "cache_hits": cache_hits,
         "failures": failures,
         "manifest_path": manifest_path,
+        "canceled": canceled,
     }
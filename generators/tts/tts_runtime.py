@@ -1,28 +1,59 @@
 import time
 from typing import Callable
 
+from generators.common.adaptive_rate import (
+    AdaptiveRateController,
+    compute_backoff_delay,
+    extract_retry_delay,
+    is_rate_limit_error,
+)
+from generators.common.rate_limit import TokenBucket
+
 
 class TTSRuntime:
-    def __init__(self, request_interval_sec: float):
+    def __init__(
+        self,
+        request_interval_sec: float,
+        requests_per_minute: float | None = None,
+        max_concurrent_requests: int = 1,
+        adaptive_rate_control: bool = False,
+        max_requests_per_minute: float | None = None,
+    ):
         if request_interval_sec <= 0:
             raise ValueError("request_interval_sec must be greater than 0.")
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be greater than 0.")
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1.")
         self.request_interval_sec = request_interval_sec
-        self.last_request_time: float | None = None
+        self.max_concurrent_requests = max_concurrent_requests
+        # An explicit RPM budget wins over the legacy fixed interval.
+        self.rate_limiter = TokenBucket(
+            requests_per_minute=requests_per_minute or 60.0 / request_interval_sec,
+        )
+        self.rate_controller = AdaptiveRateController(
+            bucket=self.rate_limiter,
+            adaptive=adaptive_rate_control,
+            max_requests_per_minute=max_requests_per_minute,
+        )
+
+    @property
+    def last_request_time(self) -> float | None:
+        return self.rate_limiter.last_request_time
+
+    @last_request_time.setter
+    def last_request_time(self, value: float | None) -> None:
+        self.rate_limiter.last_request_time = value
 
     def enforce_rate_limit(
         self,
         monotonic_fn: Callable[[], float] = time.monotonic,
         sleep_fn: Callable[[float], None] = time.sleep,
     ) -> None:
-        if self.last_request_time is None:
-            return
-        elapsed = monotonic_fn() - self.last_request_time
-        remaining = self.request_interval_sec - elapsed
-        if remaining > 0:
-            sleep_fn(remaining)
+        self.rate_controller.acquire(sleep_fn=sleep_fn, now=monotonic_fn())
 
     def mark_request_time(self, monotonic_fn: Callable[[], float] = time.monotonic) -> None:
-        self.last_request_time = monotonic_fn()
+        self.rate_limiter.record(now=monotonic_fn())
 
     def run_with_retry(
         self,
@@ -37,12 +68,20 @@ class TTSRuntime:
         for attempt in range(1, attempts + 1):
             try:
                 func()
+                self.rate_controller.on_success()
                 return
             except Exception as error:
                 last_error = error
+                retry_after = None
+                if is_rate_limit_error(error):
+                    retry_after = extract_retry_delay(error)
+                    self.rate_controller.on_rate_limited(retry_after=retry_after)
                 if attempt == attempts:
                     break
-                wait = waits[min(attempt - 1, len(waits) - 1)]
+                wait = compute_backoff_delay(
+                    base_delay=waits[min(attempt - 1, len(waits) - 1)],
+                    retry_after=retry_after,
+                )
                 print(
                     f"RETRY {context} attempt={attempt}/{attempts} "
                     f"error={error} wait={wait:.1f}s"
@@ -1,11 +1,14 @@
 from google.genai import types
 
+from generators.common.cancellation import CancellationToken
+
 
 def stream_audio_bytes(
     client,
     model_name: str,
     contents: list[types.Content],
     config: types.GenerateContentConfig,
+    cancel_token: CancellationToken | None = None,
 ) -> tuple[bytes, str]:
     audio_chunks: list[bytes] = []
     mime_type: str | None = None
@@ -14,6 +17,10 @@ def stream_audio_bytes(
         contents=contents,
         config=config,
     ):
+        # Leaving the loop drops the response stream, so a cancel stops the
+        # download at the next chunk instead of after the whole clip.
+        if cancel_token is not None:
+            cancel_token.raise_if_canceled()
         if not chunk.parts:
             continue
         for part in chunk.parts:
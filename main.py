@@ -31,6 +31,12 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--extra_prompt", default="", help="Additional request or details")
     parser.add_argument("--model_name", default="gemini-2.5-flash", help="Gemini model name to use")
+    parser.add_argument(
+        "--story_chunk_count",
+        type=int,
+        default=1,
+        help="Plan an outline first, then write the pages in this many concurrent calls.",
+    )
     parser.add_argument(
         "--enable_quiz",
         action="store_true",
@@ -47,6 +53,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=5,
         help="Number of quiz questions to generate when --enable_quiz is set.",
     )
+    parser.add_argument(
+        "--quiz_context_token_budget",
+        type=int,
+        default=None,
+        help="Target token size of the story context sent to the quiz model.",
+    )
+    parser.add_argument(
+        "--quiz_primary_text_only",
+        action="store_true",
+        help="Send only the primary-language page text to the quiz model.",
+    )
     parser.add_argument(
         "--include_style_guide",
         action="store_true",
@@ -79,6 +96,18 @@ def build_parser() -> argparse.ArgumentParser:
         default=10.0,
         help="Seconds between TTS requests to respect RPM limits.",
     )
+    parser.add_argument(
+        "--tts_requests_per_minute",
+        type=float,
+        default=None,
+        help="TTS requests-per-minute budget (overrides --tts_request_interval_sec).",
+    )
+    parser.add_argument(
+        "--tts_max_concurrent_requests",
+        type=int,
+        default=1,
+        help="Number of TTS requests allowed in flight at once.",
+    )
     parser.add_argument(
         "--enable_illustration",
         action="store_true",
@@ -105,6 +134,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=1.0,
         help="Seconds between image requests when --enable_illustration is set.",
     )
+    parser.add_argument(
+        "--illustration_max_concurrent_requests",
+        type=int,
+        default=1,
+        help="Number of image requests allowed in flight at once.",
+    )
     parser.add_argument(
         "--illustration_skip_existing",
         action="store_true",
@@ -115,6 +150,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip cover generation and only create interior illustrations.",
     )
+    parser.add_argument(
+        "--adaptive_rate_control",
+        action="store_true",
+        help="Raise TTS/image request rates while calls succeed and back off on 429s.",
+    )
     return parser
 
 
@@ -128,21 +168,28 @@ def build_pipeline_request(args: argparse.Namespace) -> StoryPipelineRequest:
         extra_prompt=args.extra_prompt,
         include_style_guide=True,
         story_model=args.model_name,
+        story_chunk_count=args.story_chunk_count,
         enable_quiz=args.enable_quiz,
         quiz_model=args.quiz_model,
         quiz_question_count=args.quiz_question_count,
+        quiz_context_token_budget=args.quiz_context_token_budget,
+        quiz_include_secondary_text=not args.quiz_primary_text_only,
         enable_tts=args.enable_tts,
         tts_model=args.tts_model,
         tts_voice=args.tts_voice,
         tts_temperature=args.tts_temperature,
         tts_request_interval_sec=args.tts_request_interval_sec,
+        tts_requests_per_minute=args.tts_requests_per_minute,
+        tts_max_concurrent_requests=args.tts_max_concurrent_requests,
         enable_illustration=args.enable_illustration,
         enable_cover_illustration=not args.illustration_skip_cover,
         illustration_model=args.illustration_model,
         illustration_aspect_ratio=args.illustration_aspect_ratio,
         illustration_cover_aspect_ratio=args.illustration_cover_aspect_ratio,
         illustration_request_interval_sec=args.illustration_request_interval_sec,
+        illustration_max_concurrent_requests=args.illustration_max_concurrent_requests,
         illustration_skip_existing=args.illustration_skip_existing,
+        adaptive_rate_control=args.adaptive_rate_control,
     )
 
 
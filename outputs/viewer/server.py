@@ -15,6 +15,7 @@ ROOT_DIR = OUTPUTS_DIR.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from app.services.result_cache import get_result_payload_cache
 from app.services.story_result_builder import build_story_result_payload
 
 RUN_GLOB = "*_story_*"
@@ -219,18 +220,22 @@ def build_book_payload(run_id: str) -> dict:
         raise FileNotFoundError(f"run not found: {run_id}")
 
     illustration_aspect_ratio = load_illustration_aspect_ratio(run_dir=run_dir) or "1:1"
-    payload = build_story_result_payload(
-        story_id=run_id,
-        include_tts=(run_dir / "audio").exists(),
-        include_illustration=(run_dir / "illustrations").exists(),
-        include_cover_illustration=(run_dir / "illustrations").exists(),
-        illustration_aspect_ratio=illustration_aspect_ratio,
-        cover_aspect_ratio="5:4",
-        job_status="completed",
-        static_prefix="",
+    # The viewer serves ad-hoc CLI runs too, so it builds without a result.json snapshot.
+    payload = get_result_payload_cache().get_or_build(
+        {
+            "story_id": run_id,
+            "include_tts": (run_dir / "audio").exists(),
+            "include_illustration": (run_dir / "illustrations").exists(),
+            "include_cover_illustration": (run_dir / "illustrations").exists(),
+            "illustration_aspect_ratio": illustration_aspect_ratio,
+            "cover_aspect_ratio": "5:4",
+            "job_status": "completed",
+            "static_prefix": "",
+        },
+        build_fn=build_story_result_payload,
     )
-    payload["run_id"] = payload["id"]
-    return payload
+    # Cached payloads are shared; copy before adding viewer-only fields.
+    return {**payload, "run_id": payload["id"]}
 
 
 def find_quiz_json_path(run_dir: Path) -> Path | None:
@@ -0,0 +1,137 @@
+import random
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from generators.common.adaptive_rate import (
+    AdaptiveRateController,
+    compute_backoff_delay,
+    extract_retry_delay,
+    is_rate_limit_error,
+)
+from generators.common.rate_limit import TokenBucket
+from generators.illustration.illustration_image_client import ImageGenerationClient
+from generators.tts.tts_runtime import TTSRuntime
+
+
+class _QuotaError(Exception):
+    def __init__(self, message="429 RESOURCE_EXHAUSTED", details=None, response=None):
+        super().__init__(message)
+        self.code = 429
+        self.status = "RESOURCE_EXHAUSTED"
+        self.details = details
+        self.response = response
+
+
+class TestRateLimitErrors(unittest.TestCase):
+    def test_detects_quota_errors(self):
+        self.assertTrue(is_rate_limit_error(_QuotaError()))
+        self.assertTrue(is_rate_limit_error(RuntimeError("RESOURCE_EXHAUSTED: quota")))
+        self.assertFalse(is_rate_limit_error(RuntimeError("500 INTERNAL")))
+
+    def test_extracts_retry_info_then_header_then_message(self):
+        retry_info = {
+            "error": {
+                "details": [
+                    {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "17s"}
+                ]
+            }
+        }
+        self.assertEqual(extract_retry_delay(_QuotaError(details=retry_info)), 17.0)
+
+        response = SimpleNamespace(headers={"Retry-After": "5"})
+        self.assertEqual(extract_retry_delay(_QuotaError(response=response)), 5.0)
+
+        self.assertEqual(
+            extract_retry_delay(RuntimeError("Please retry in 3.5s.")),
+            3.5,
+        )
+        self.assertIsNone(extract_retry_delay(RuntimeError("boom")))
+
+    def test_backoff_is_jittered_and_honors_server_delay(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            wait = compute_backoff_delay(base_delay=4.0, rng=rng)
+            self.assertGreaterEqual(wait, 2.0)
+            self.assertLessEqual(wait, 4.0)
+
+        wait = compute_backoff_delay(base_delay=4.0, retry_after=10.0, rng=rng)
+        self.assertGreaterEqual(wait, 10.0)
+        self.assertLessEqual(wait, 11.0)
+
+
+class TestAdaptiveRateController(unittest.TestCase):
+    def test_additive_increase_and_multiplicative_decrease_within_bounds(self):
+        controller = AdaptiveRateController(
+            bucket=TokenBucket(requests_per_minute=10),
+            adaptive=True,
+            min_requests_per_minute=4,
+            max_requests_per_minute=12,
+        )
+
+        for _ in range(5):
+            controller.on_success()
+        self.assertEqual(controller.requests_per_minute, 12)
+
+        controller.on_rate_limited()
+        self.assertEqual(controller.requests_per_minute, 6)
+        controller.on_rate_limited()
+        self.assertEqual(controller.requests_per_minute, 4)
+
+    def test_fixed_mode_keeps_rate_but_pauses_for_retry_delay(self):
+        clock = [100.0]
+        controller = AdaptiveRateController(
+            bucket=TokenBucket(requests_per_minute=60),
+            monotonic_fn=lambda: clock[0],
+        )
+        sleeps: list[float] = []
+
+        controller.on_success()
+        controller.on_rate_limited(retry_after=5.0)
+        controller.acquire(sleep_fn=sleeps.append, now=101.0)
+
+        self.assertEqual(controller.requests_per_minute, 60)
+        self.assertEqual(sleeps, [4.0])
+
+
+class TestAdaptiveRetries(unittest.TestCase):
+    def test_tts_retry_waits_for_server_delay_and_slows_down(self):
+        runtime = TTSRuntime(request_interval_sec=6.0, adaptive_rate_control=True)
+        calls = {"count": 0}
+        sleeps: list[float] = []
+
+        def flaky() -> None:
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise _QuotaError(message="429 RESOURCE_EXHAUSTED retryDelay: '7s'")
+
+        runtime.run_with_retry(flaky, context="page=1", sleep_fn=sleeps.append)
+
+        self.assertEqual(calls["count"], 2)
+        self.assertGreaterEqual(sleeps[0], 7.0)
+        self.assertLess(sleeps[0], 8.0)
+        # Halved to 5 rpm on the 429, then +1 on the successful retry.
+        self.assertEqual(runtime.rate_limiter.requests_per_minute, 6.0)
+
+    def test_image_client_retries_only_rate_limit_errors(self):
+        client = ImageGenerationClient(
+            client=MagicMock(),
+            model_name="image-model",
+            aspect_ratio="1:1",
+            request_interval_sec=0.0,
+        )
+        client._request_image = MagicMock(
+            side_effect=[_QuotaError(message="retry in 0s"), (b"img", "image/png")]
+        )
+
+        self.assertEqual(client.generate_image_bytes("prompt"), (b"img", "image/png"))
+        self.assertEqual(client._request_image.call_count, 2)
+
+        client._request_image = MagicMock(side_effect=ValueError("no image"))
+        with self.assertRaises(ValueError):
+            client.generate_image_bytes("prompt")
+        self.assertEqual(client._request_image.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
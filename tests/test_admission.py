@@ -0,0 +1,89 @@
+import unittest
+
+try:
+    from app.services.admission import AdmissionController, JobLoadTracker
+except ModuleNotFoundError:  # pragma: no cover
+    AdmissionController = None
+    JobLoadTracker = None
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@unittest.skipIf(AdmissionController is None, "fastapi/pydantic dependencies are not installed")
+class TestAdmissionController(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.tracker = JobLoadTracker(monotonic_fn=self.clock)
+
+    def _controller(self, max_queued_jobs=10, max_active_jobs_per_key=10, workers=2):
+        return AdmissionController(
+            source=self.tracker,
+            max_queued_jobs=max_queued_jobs,
+            max_active_jobs_per_key=max_active_jobs_per_key,
+            workers=workers,
+        )
+
+    def test_tracker_counts_queued_and_running_per_owner(self):
+        self.tracker.add("a1", owner="a")
+        self.tracker.add("a2", owner="a")
+        self.tracker.add("b1", owner="b")
+        self.tracker.mark_running("a1")
+
+        self.assertEqual(self.tracker.load(), (2, 1))
+        self.assertEqual(self.tracker.load(owner="a"), (1, 1))
+
+        self.clock.now = 30.0
+        self.tracker.finish("a1")
+        self.assertEqual(self.tracker.load(owner="a"), (1, 0))
+        self.assertEqual(self.tracker.average_duration_sec(), 30.0)
+
+    def test_retry_after_scales_with_queue_depth_and_observed_duration(self):
+        self.tracker.add("done", owner="a")
+        self.tracker.mark_running("done")
+        self.clock.now = 20.0
+        self.tracker.finish("done")
+        for index in range(5):
+            self.tracker.add(f"q{index}", owner="b")
+
+        decision = self._controller(max_queued_jobs=2, workers=2).check(owner="a")
+
+        # 4 jobs must start before the queue is under its cap: 2 rounds of 20s.
+        self.assertFalse(decision.allowed)
+        self.assertEqual(decision.status_code, 503)
+        self.assertEqual(decision.retry_after_sec, 40)
+
+    def test_per_key_cap_only_blocks_that_key(self):
+        self.tracker.add("a1", owner="a")
+        self.tracker.mark_running("a1")
+        controller = self._controller(max_active_jobs_per_key=1)
+
+        blocked = controller.check(owner="a")
+
+        self.assertEqual(blocked.status_code, 429)
+        self.assertEqual(blocked.retry_after_sec, 60)
+        self.assertTrue(controller.check(owner="b").allowed)
+
+    def test_saturation_snapshot(self):
+        self.tracker.add("a1", owner="a")
+        snapshot = self._controller(max_queued_jobs=4).saturation()
+
+        self.assertEqual(snapshot["queued"], 1)
+        self.assertEqual(snapshot["queue_utilization"], 0.25)
+        self.assertFalse(snapshot["saturated"])
+
+    def test_saturation_snapshot_without_queue_capacity(self):
+        self.tracker.add("a1", owner="a")
+        snapshot = self._controller(max_queued_jobs=0).saturation()
+
+        self.assertIsNone(snapshot["queue_utilization"])
+        self.assertTrue(snapshot["saturated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from generators.common.content_cache import ContentCache, content_key, write_bytes_atomic
+
+
+class TestContentCache(unittest.TestCase):
+    def test_evicts_least_recently_used_entries_first(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(tmp_dir, max_bytes=35)
+            keys = [content_key("entry", index) for index in range(3)]
+            for offset, key in enumerate(keys):
+                path = cache.put_bytes(key, b"x" * 10, ".bin")
+                os.utime(path, (time.time() - 100 + offset, time.time() - 100 + offset))
+            # A lookup refreshes the oldest entry, so the second one goes next.
+            self.assertIsNotNone(cache.lookup(keys[0], ".bin"))
+
+            cache.put_bytes(content_key("entry", 3), b"x" * 10, ".bin")
+
+            self.assertIsNotNone(cache.lookup(keys[0], ".bin"))
+            self.assertIsNone(cache.lookup(keys[1], ".bin"))
+            self.assertIsNotNone(cache.lookup(keys[2], ".bin"))
+
+    def test_writes_under_the_limit_do_not_rescan_the_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(tmp_dir, max_bytes=35)
+            with patch.object(cache, "evict", wraps=cache.evict) as evict:
+                for index in range(3):
+                    cache.put_bytes(content_key("entry", index), b"x" * 10, ".bin")
+                # Only the first write scans, to seed the size estimate.
+                self.assertEqual(evict.call_count, 1)
+
+                cache.put_bytes(content_key("entry", 3), b"x" * 10, ".bin")
+
+            self.assertEqual(evict.call_count, 2)
+            self.assertEqual(cache._estimated_bytes, 30)
+
+    def test_materialize_links_entry_and_rewrites_do_not_touch_the_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(Path(tmp_dir) / "cache", max_bytes=1024)
+            cached_path = cache.put_bytes(content_key("audio"), b"cached", ".wav")
+            destination = Path(tmp_dir) / "page_01.wav"
+
+            self.assertTrue(cache.materialize(cached_path, destination))
+            write_bytes_atomic(destination, b"rewritten")
+
+            self.assertEqual(cached_path.read_bytes(), b"cached")
+            self.assertEqual(destination.read_bytes(), b"rewritten")
+
+    def test_materialize_reports_evicted_entry(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(tmp_dir, max_bytes=1024)
+            missing = cache.path_for(content_key("gone"), ".wav")
+
+            self.assertFalse(cache.materialize(missing, Path(tmp_dir) / "page_01.wav"))
+            self.assertFalse((Path(tmp_dir) / "page_01.wav").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -179,6 +179,102 @@ class TestFastAPIServerPhase1(unittest.TestCase):
             result_body["pages"][0]["vocabulary"][0]["pronunciation"]["primary_url"]
         )
 
+    def test_status_and_result_support_conditional_get(self) -> None:
+        story_id = "20260221_120003_story_mina-friendship"
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            return_value=(_build_fake_story(), "gemini-2.5-flash"),
+        ):
+            with patch("app.services.story_orchestrator.make_story_id", return_value=story_id):
+                self.client.post(
+                    "/api/stories/",
+                    json=self._build_create_payload(),
+                    headers=self.headers,
+                )
+
+        status_response = self.client.get(f"/api/stories/{story_id}", headers=self.headers)
+        etag = status_response.headers["etag"]
+        self.assertEqual(
+            status_response.headers["cache-control"], "private, max-age=60, must-revalidate"
+        )
+        not_modified = self.client.get(
+            f"/api/stories/{story_id}",
+            headers={**self.headers, "If-None-Match": etag},
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified.headers["etag"], etag)
+
+        result_etag = self.client.get(
+            f"/api/stories/{story_id}/result", headers=self.headers
+        ).headers["etag"]
+        with patch(
+            "app.services.story_orchestrator.get_result_payload_cache"
+        ) as mocked_cache:
+            result_not_modified = self.client.get(
+                f"/api/stories/{story_id}/result",
+                headers={**self.headers, "If-None-Match": f'W/{result_etag}, "other"'},
+            )
+        self.assertEqual(result_not_modified.status_code, 304)
+        mocked_cache.assert_not_called()
+
+        illustrations_dir = os.path.join(self.tmp_dir.name, story_id, "illustrations")
+        os.makedirs(illustrations_dir, exist_ok=True)
+        with open(os.path.join(illustrations_dir, "page_01.png"), "wb") as file:
+            file.write(b"image")
+        changed = self.client.get(
+            f"/api/stories/{story_id}/result",
+            headers={**self.headers, "If-None-Match": result_etag},
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], result_etag)
+
+    def test_result_supports_page_and_field_selection(self) -> None:
+        story_id = "20260221_120004_story_mina-friendship"
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            return_value=(_build_fake_story(), "gemini-2.5-flash"),
+        ):
+            with patch("app.services.story_orchestrator.make_story_id", return_value=story_id):
+                self.client.post(
+                    "/api/stories/",
+                    json=self._build_create_payload(),
+                    headers=self.headers,
+                )
+
+        paged = self.client.get(
+            f"/api/stories/{story_id}/result?pages=2-3,5", headers=self.headers
+        ).json()
+        self.assertEqual([page["page_number"] for page in paged["pages"]], [2, 3, 5])
+        self.assertEqual(paged["meta"]["page_count"], STORY_PAGE_COUNT)
+
+        trimmed = self.client.get(
+            f"/api/stories/{story_id}/result?pages=1&fields=meta,text_primary",
+            headers=self.headers,
+        ).json()
+        self.assertEqual(set(trimmed), {"id", "meta", "pages"})
+        self.assertEqual(trimmed["pages"], [{"page_number": 1, "text_primary": "Primary text 1"}])
+
+        page_response = self.client.get(f"/api/stories/{story_id}/pages/4", headers=self.headers)
+        self.assertEqual(page_response.status_code, 200)
+        self.assertEqual(page_response.json()["text_secondary"], "Secondary text 4")
+        self.assertNotEqual(
+            page_response.headers["etag"],
+            self.client.get(
+                f"/api/stories/{story_id}/result?pages=4", headers=self.headers
+            ).headers["etag"],
+        )
+
+        missing_page = self.client.get(f"/api/stories/{story_id}/pages/99", headers=self.headers)
+        self.assertEqual(missing_page.status_code, 404)
+        self.assertEqual(missing_page.json()["error"]["code"], "STORY_PAGE_NOT_FOUND")
+
+        invalid = self.client.get(
+            f"/api/stories/{story_id}/result?pages=4-2&fields=nope", headers=self.headers
+        )
+        self.assertEqual(invalid.status_code, 422)
+        self.assertEqual(invalid.json()["error"]["code"], "INVALID_RESULT_SELECTION")
+
     def test_get_story_not_found_returns_404(self) -> None:
         response = self.client.get(
             "/api/stories/non-existent-story-id",
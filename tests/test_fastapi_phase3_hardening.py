@@ -14,8 +14,11 @@ except ModuleNotFoundError:  # pragma: no cover
     create_app = None
 
 try:
+    from app.services.admission import job_load_tracker, owner_key
     from app.services.rate_limiter import post_stories_rate_limiter
 except ModuleNotFoundError:  # pragma: no cover
+    job_load_tracker = None
+    owner_key = None
     post_stories_rate_limiter = None
 
 try:
@@ -94,6 +97,8 @@ class TestFastAPIServerPhase3Hardening(unittest.TestCase):
         self.addCleanup(self.env_patcher.stop)
 
         post_stories_rate_limiter.reset()
+        job_load_tracker.reset()
+        self.addCleanup(job_load_tracker.reset)
         self.client = TestClient(create_app())
         self.headers_a = {"X-API-Key": "key-a"}
         self.headers_b = {"X-API-Key": "key-b"}
@@ -184,6 +189,42 @@ class TestFastAPIServerPhase3Hardening(unittest.TestCase):
             )
         self.assertEqual(allowed_b.status_code, 202)
 
+    def test_active_job_cap_per_key_returns_429_with_retry_after(self) -> None:
+        job_load_tracker.add("20260221_142000_story_mina", owner=owner_key("key-a"))
+        with patch.dict(os.environ, {"MORETALE_ADMISSION_MAX_ACTIVE_JOBS_PER_KEY": "1"}):
+            blocked_a = self._post_story(
+                story_id="20260221_142001_story_mina",
+                payload=self._base_payload(),
+                headers=self.headers_a,
+            )
+            allowed_b = self._post_story(
+                story_id="20260221_142002_story_mina",
+                payload=self._base_payload(),
+                headers=self.headers_b,
+            )
+
+        self.assertEqual(blocked_a.status_code, 429)
+        self.assertEqual(blocked_a.json()["error"]["code"], "TOO_MANY_ACTIVE_JOBS")
+        self.assertEqual(blocked_a.headers.get("Retry-After"), "60")
+        self.assertEqual(allowed_b.status_code, 202)
+
+    def test_full_queue_returns_503_and_healthz_reports_saturation(self) -> None:
+        job_load_tracker.add("20260221_143000_story_mina", owner=owner_key("key-b"))
+        with patch.dict(os.environ, {"MORETALE_ADMISSION_MAX_QUEUED_JOBS": "1"}):
+            blocked = self._post_story(
+                story_id="20260221_143001_story_mina",
+                payload=self._base_payload(),
+                headers=self.headers_a,
+            )
+            health = self.client.get("/healthz")
+
+        self.assertEqual(blocked.status_code, 503)
+        self.assertEqual(blocked.json()["error"]["code"], "SERVER_SATURATED")
+        self.assertTrue(int(blocked.headers["Retry-After"]) >= 1)
+        self.assertEqual(health.status_code, 200)
+        self.assertTrue(health.json()["saturation"]["saturated"])
+        self.assertEqual(health.json()["saturation"]["queued"], 1)
+
     def test_invalid_story_model_returns_422(self) -> None:
         payload = self._base_payload()
         payload["generation"]["story_model"] = "unsupported-model"
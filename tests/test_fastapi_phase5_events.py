@@ -0,0 +1,253 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+try:
+    from tests.asgi_test_client import ASGITestClient as TestClient
+except ModuleNotFoundError:  # pragma: no cover
+    TestClient = None
+
+try:
+    from app.main import create_app
+except ModuleNotFoundError:  # pragma: no cover
+    create_app = None
+
+try:
+    from app.services.job_events import JobEventBroker, job_event_broker
+    from app.services.story_orchestrator import job_store
+except ModuleNotFoundError:  # pragma: no cover
+    JobEventBroker = None
+    job_event_broker = None
+    job_store = None
+
+try:
+    from generators.story.story_model import STORY_PAGE_COUNT, Page, Story, VocabularyEntry
+except ModuleNotFoundError:  # pragma: no cover
+    STORY_PAGE_COUNT = None
+    Page = None
+    Story = None
+    VocabularyEntry = None
+
+
+def _build_fake_story():
+    pages = [
+        Page(
+            page_number=page_number,
+            text_primary=f"Primary text {page_number}",
+            text_secondary=f"Secondary text {page_number}",
+            illustration_prompt=f"Illustration prompt {page_number}",
+            illustration_scene_prompt=f"Scene prompt {page_number}",
+            vocabulary=[
+                VocabularyEntry(
+                    entry_id=f"page-{page_number}-dragon",
+                    primary_word="dragon",
+                    secondary_word="용",
+                    primary_definition="a large creature from stories",
+                    secondary_definition="이야기 속 상상의 큰 동물",
+                )
+            ],
+        )
+        for page_number in range(1, STORY_PAGE_COUNT + 1)
+    ]
+    return Story(
+        title_primary="Test Title Primary",
+        title_secondary="Test Title Secondary",
+        author_name="Test Author",
+        primary_language="Korean",
+        secondary_language="English",
+        image_style="Soft watercolor",
+        main_character_design="A child with short hair and green clothes",
+        pages=pages,
+    )
+
+
+def _parse_sse(body: str) -> list[tuple[str | None, str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@unittest.skipIf(
+    TestClient is None
+    or create_app is None
+    or job_store is None
+    or Page is None
+    or Story is None
+    or STORY_PAGE_COUNT is None
+    or VocabularyEntry is None,
+    "fastapi/pydantic dependencies are not installed in this environment",
+)
+class TestFastAPIPhase5Events(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.env_patcher = patch.dict(
+            os.environ,
+            {
+                "MORETALE_API_KEY": "test-api-key",
+                "MORETALE_OUTPUTS_DIR": self.tmp_dir.name,
+                "MORETALE_RATE_LIMIT_POST_STORIES_PER_MIN": "100",
+            },
+            clear=False,
+        )
+        self.env_patcher.start()
+        self.addCleanup(self.env_patcher.stop)
+        job_event_broker.reset()
+
+        self.client = TestClient(create_app())
+        self.headers = {"X-API-Key": "test-api-key"}
+
+    @staticmethod
+    def _payload() -> dict:
+        return {
+            "child_name": "Mina",
+            "child_age": 5,
+            "primary_lang": "Korean",
+            "secondary_lang": "English",
+            "theme": "Friendship",
+            "generation": {
+                "story_model": "gemini-2.5-flash",
+                "enable_tts": True,
+                "enable_illustration": False,
+            },
+        }
+
+    def _post_story(self, story_id: str):
+        def fake_tts(*, request, story, output_dir):
+            request.progress_callback({"event": "tasks.planned", "stage": "tts", "total": 2})
+            for role in ("primary", "secondary"):
+                request.progress_callback(
+                    {
+                        "event": "task",
+                        "stage": "tts",
+                        "page_number": 1,
+                        "role": role,
+                        "status": "generated",
+                    }
+                )
+            return {"total_tasks": 2, "generated": 2, "skipped": 0, "failed": 0, "failures": []}
+
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            return_value=(_build_fake_story(), "gemini-2.5-flash"),
+        ), patch("app.services.generation_pipeline.generate_tts", side_effect=fake_tts):
+            with patch("app.services.story_orchestrator.make_story_id", return_value=story_id):
+                return self.client.post("/api/stories/", json=self._payload(), headers=self.headers)
+
+    def test_streams_stage_task_and_terminal_status_events(self) -> None:
+        story_id = "20260221_170001_story_mina"
+        self.assertEqual(self._post_story(story_id).status_code, 202)
+
+        response = self.client.get(f"/api/stories/{story_id}/events", headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = _parse_sse(response.text)
+        summary = [
+            (event_type, data.get("status") or data.get("stage"))
+            for _, event_type, data in events
+        ]
+        self.assertEqual(
+            summary,
+            [
+                ("status", "queued"),
+                ("status", "running"),
+                ("stage.start", "story"),
+                ("stage.end", "completed"),
+                ("stage.start", "tts"),
+                ("tasks.planned", "tts"),
+                ("task", "generated"),
+                ("task", "generated"),
+                ("stage.end", "completed"),
+                ("status", "completed"),
+            ],
+        )
+
+    def test_status_response_includes_progress_counters(self) -> None:
+        story_id = "20260221_170004_story_mina"
+        self._post_story(story_id)
+
+        response = self.client.get(f"/api/stories/{story_id}", headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        progress = response.json()["progress"]
+        self.assertEqual(progress["stages"]["story"]["status"], "completed")
+        self.assertEqual(
+            progress["stages"]["tts"],
+            {
+                "status": "completed",
+                "total": 2,
+                "completed": 2,
+                "failed": 0,
+                "remaining": 0,
+                "eta_sec": None,
+            },
+        )
+        self.assertTrue(progress["updated_at"])
+
+    def test_last_event_id_resumes_after_that_event(self) -> None:
+        story_id = "20260221_170002_story_mina"
+        self._post_story(story_id)
+        events = _parse_sse(
+            self.client.get(f"/api/stories/{story_id}/events", headers=self.headers).text
+        )
+
+        resumed = _parse_sse(
+            self.client.get(
+                f"/api/stories/{story_id}/events",
+                headers={**self.headers, "Last-Event-ID": events[-3][0]},
+            ).text
+        )
+
+        self.assertEqual(resumed, events[-2:])
+
+    def test_finished_job_without_history_gets_single_status_snapshot(self) -> None:
+        story_id = "20260221_170003_story_mina"
+        job_store.initialize_job(story_id=story_id, request_payload=self._payload())
+        job_store.mark_failed(story_id, error={"code": "ERR", "message": "fail"})
+
+        events = _parse_sse(
+            self.client.get(f"/api/stories/{story_id}/events", headers=self.headers).text
+        )
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][1], "status")
+        self.assertEqual(events[0][2]["status"], "failed")
+        self.assertEqual(events[0][2]["error"]["code"], "ERR")
+
+    def test_unknown_story_returns_404(self) -> None:
+        response = self.client.get("/api/stories/no-such-story/events", headers=self.headers)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["error"]["code"], "STORY_NOT_FOUND")
+
+
+@unittest.skipIf(JobEventBroker is None, "fastapi/pydantic dependencies are not installed")
+class TestJobEventBroker(unittest.TestCase):
+    def test_publish_drops_events_for_a_closed_loop(self) -> None:
+        broker = JobEventBroker()
+
+        async def subscribe():
+            return broker.subscribe("story-a")
+
+        loop = asyncio.new_event_loop()
+        subscription, _ = loop.run_until_complete(subscribe())
+        loop.close()
+
+        broker.publish_status("story-a", {"status": "completed"})
+        broker.publish_status("story-a", {"status": "completed"})
+
+        self.assertNotIn(subscription, broker._channels["story-a"].subscribers)
+
+
+if __name__ == "__main__":
+    unittest.main()
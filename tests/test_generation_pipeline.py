@@ -1,10 +1,14 @@
 import os
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from generators.common.cancellation import CancellationToken
+
 from app.services.generation_pipeline import (
     StoryPipelineRequest,
     build_pipeline_request_from_story_request,
@@ -181,6 +185,151 @@ class TestGenerationPipeline(unittest.TestCase):
                             strict_assets=True,
                         )
 
+    def test_asset_stages_run_concurrently(self):
+        request = _build_request(enable_quiz=True, enable_tts=True, enable_illustration=True)
+        fake_story = SimpleNamespace(
+            title_primary="Test Story",
+            model_dump_json=lambda indent=4: '{"title_primary":"Test Story","pages":[]}',
+        )
+        fake_quiz = SimpleNamespace(
+            model_dump_json=lambda indent=4: '{"story_id":"run","question_count":5,"questions":[]}',
+        )
+        # Each stage blocks until all three are in flight; a sequential
+        # pipeline would break the barrier.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def quiz_stage(**kwargs):
+            del kwargs
+            barrier.wait()
+            return fake_quiz, "gemini-2.5-flash"
+
+        def tts_stage(**kwargs):
+            del kwargs
+            barrier.wait()
+            return {"total_tasks": 0, "generated": 0, "skipped": 0, "failed": 0}
+
+        def illustration_stage(**kwargs):
+            del kwargs
+            barrier.wait()
+            return {"total_tasks": 0, "generated": 0, "skipped": 0, "failed": 0}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch(
+                "app.services.generation_pipeline.generate_story",
+                return_value=(fake_story, "gemini-2.5-flash"),
+            ), patch(
+                "app.services.generation_pipeline.generate_quiz",
+                side_effect=quiz_stage,
+            ), patch(
+                "app.services.generation_pipeline.generate_tts",
+                side_effect=tts_stage,
+            ), patch(
+                "app.services.generation_pipeline.generate_illustrations",
+                side_effect=illustration_stage,
+            ):
+                result = run_story_generation_pipeline(
+                    request=request,
+                    output_dir_factory=lambda story, model: Path(tmp_dir) / "run",
+                    strict_assets=True,
+                )
+
+        self.assertIs(result.quiz_result, fake_quiz)
+        self.assertIsNotNone(result.tts_result)
+        self.assertIsNotNone(result.illustration_result)
+        self.assertEqual(
+            result.service_errors,
+            {"quiz": None, "tts": None, "illustrations": None},
+        )
+
+    def test_strict_pipeline_cancels_running_stages_on_first_error(self):
+        job_token = CancellationToken()
+        request = _build_request(
+            enable_tts=True,
+            enable_illustration=True,
+            cancel_token=job_token,
+        )
+        fake_story = SimpleNamespace(
+            title_primary="Test Story",
+            model_dump_json=lambda indent=4: '{"title_primary":"Test Story","pages":[]}',
+        )
+        illustration_started = threading.Event()
+        illustration_done = threading.Event()
+        stage_tokens = []
+
+        def tts_stage(*, request, story, output_dir):
+            del request, story, output_dir
+            self.assertTrue(illustration_started.wait(timeout=5))
+            raise RuntimeError("tts unavailable")
+
+        def illustration_stage(*, request, story, output_dir):
+            del story, output_dir
+            stage_tokens.append(request.cancel_token)
+            illustration_started.set()
+            try:
+                # Wakes up with GenerationCanceled once the TTS stage fails.
+                request.cancel_token.sleep(5)
+            finally:
+                illustration_done.set()
+            return {"total_tasks": 0, "generated": 0, "skipped": 0, "failed": 0}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch(
+                "app.services.generation_pipeline.generate_story",
+                return_value=(fake_story, "gemini-2.5-flash"),
+            ), patch(
+                "app.services.generation_pipeline.generate_tts",
+                side_effect=tts_stage,
+            ), patch(
+                "app.services.generation_pipeline.generate_illustrations",
+                side_effect=illustration_stage,
+            ):
+                started = time.monotonic()
+                # The real failure is raised, not the sibling's cancellation.
+                with self.assertRaisesRegex(RuntimeError, "tts unavailable"):
+                    run_story_generation_pipeline(
+                        request=request,
+                        output_dir_factory=lambda story, model: Path(tmp_dir) / "run",
+                        strict_assets=True,
+                    )
+                # No stage is still running once the pipeline has raised.
+                self.assertTrue(illustration_done.is_set())
+                self.assertLess(time.monotonic() - started, 4)
+
+        self.assertTrue(stage_tokens[0].is_canceled)
+        self.assertFalse(job_token.is_canceled)
+
+    def test_non_strict_pipeline_isolates_each_stage_error(self):
+        request = _build_request(enable_quiz=True, enable_tts=True, enable_illustration=True)
+        fake_story = SimpleNamespace(
+            title_primary="Test Story",
+            model_dump_json=lambda indent=4: '{"title_primary":"Test Story","pages":[]}',
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch(
+                "app.services.generation_pipeline.generate_story",
+                return_value=(fake_story, "gemini-2.5-flash"),
+            ), patch(
+                "app.services.generation_pipeline.generate_quiz",
+                side_effect=RuntimeError("quiz unavailable"),
+            ), patch(
+                "app.services.generation_pipeline.generate_tts",
+                side_effect=RuntimeError("tts unavailable"),
+            ), patch(
+                "app.services.generation_pipeline.generate_illustrations",
+                return_value={"total_tasks": 1, "generated": 1, "skipped": 0, "failed": 0},
+            ):
+                result = run_story_generation_pipeline(
+                    request=request,
+                    output_dir_factory=lambda story, model: Path(tmp_dir) / "run",
+                    strict_assets=False,
+                )
+
+        self.assertEqual(result.service_errors["quiz"], "quiz unavailable")
+        self.assertEqual(result.service_errors["tts"], "tts unavailable")
+        self.assertIsNone(result.service_errors["illustrations"])
+        self.assertIsNotNone(result.illustration_result)
+
     def test_strict_pipeline_raises_on_missing_tts_key(self):
         request = _build_request(enable_tts=True)
         fake_story = SimpleNamespace(
@@ -201,6 +350,89 @@ class TestGenerationPipeline(unittest.TestCase):
                             strict_assets=True,
                         )
 
+    def test_streamed_story_starts_assets_before_the_story_finishes(self):
+        request = _build_request(enable_quiz=True, enable_tts=True, stream_story=True)
+        first_page = SimpleNamespace(page_number=1)
+        second_page = SimpleNamespace(page_number=2)
+        fake_story = SimpleNamespace(
+            title_primary="Test Story",
+            pages=[first_page, second_page],
+            model_dump_json=lambda indent=4: '{"title_primary":"Test Story","pages":[]}',
+        )
+        fake_quiz = SimpleNamespace(
+            model_dump_json=lambda indent=4: '{"story_id":"run","question_count":5,"questions":[]}',
+        )
+        tts_saw_first_page = threading.Event()
+        quiz_stories = []
+
+        def story_stage(request, page_feed=None):
+            del request
+            page_feed.put(first_page)
+            # The story only finishes once TTS has already picked up page 1.
+            self.assertTrue(tts_saw_first_page.wait(timeout=5))
+            page_feed.put(second_page)
+            return fake_story, "gemini-2.5-flash"
+
+        def tts_stage(*, request, story, output_dir):
+            del request, output_dir
+            pages = []
+            for page in story.pages:
+                pages.append(page.page_number)
+                tts_saw_first_page.set()
+            return {"total_tasks": len(pages), "generated": len(pages), "skipped": 0, "failed": 0}
+
+        def quiz_stage(*, request, story_id, story):
+            del request, story_id
+            quiz_stories.append(story)
+            return fake_quiz, "gemini-2.5-flash"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch(
+                "app.services.generation_pipeline.generate_story",
+                side_effect=story_stage,
+            ), patch(
+                "app.services.generation_pipeline.generate_quiz",
+                side_effect=quiz_stage,
+            ), patch(
+                "app.services.generation_pipeline.generate_tts",
+                side_effect=tts_stage,
+            ):
+                result = run_story_generation_pipeline(
+                    request=request,
+                    output_dir_factory=lambda story, model: self.fail("factory not used"),
+                    strict_assets=True,
+                    output_dir=Path(tmp_dir) / "run",
+                )
+                self.assertTrue(result.story_json_path.exists())
+
+        self.assertIs(result.story, fake_story)
+        self.assertEqual(result.tts_result["total_tasks"], 2)
+        self.assertEqual(quiz_stories, [fake_story])
+        self.assertIs(result.quiz_result, fake_quiz)
+
+    def test_streamed_story_failure_is_raised(self):
+        request = _build_request(enable_tts=True, stream_story=True)
+
+        def tts_stage(*, request, story, output_dir):
+            del request, output_dir
+            return {"total_tasks": len(list(story.pages)), "generated": 0, "skipped": 0, "failed": 0}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch(
+                "app.services.generation_pipeline.generate_story",
+                side_effect=ValueError("GEMINI_STORY_API_KEY environment variable not set."),
+            ), patch(
+                "app.services.generation_pipeline.generate_tts",
+                side_effect=tts_stage,
+            ):
+                with self.assertRaisesRegex(ValueError, "GEMINI_STORY_API_KEY"):
+                    run_story_generation_pipeline(
+                        request=request,
+                        output_dir_factory=lambda story, model: Path(tmp_dir) / "run",
+                        strict_assets=False,
+                        output_dir=Path(tmp_dir) / "run",
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,17 +1,24 @@
+import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from generators.common.content_cache import ContentCache
+
 try:
     from generators.illustration.illustration_generator import (
         IllustrationGenerator,
         _resolve_api_key,
     )
     from generators.illustration.illustration_cover_prompt import build_cover_prompt
+    from generators.illustration.illustration_image_client import ImageGenerationClient
 except ModuleNotFoundError:  # pragma: no cover
     IllustrationGenerator = None
+    ImageGenerationClient = None
     _resolve_api_key = None
     build_cover_prompt = None
 
@@ -27,7 +34,9 @@ if IllustrationGenerator is not None:
             prompt: str,
             *,
             aspect_ratio: str | None = None,
+            cancel_token=None,
         ) -> tuple[bytes, str]:
+            del cancel_token
             self.seen_requests.append((prompt, aspect_ratio))
             return b"fake-image-bytes", "image/png"
 else:  # pragma: no cover
@@ -225,6 +234,158 @@ class TestIllustrationGenerationPipeline(unittest.TestCase):
             self.assertEqual(result["cover"]["status"], "skipped_exists")
             self.assertEqual(len(generator.seen_requests), 0)
 
+    def test_concurrent_generation_records_entries_in_page_order(self):
+        generator = _FakeIllustrationGenerator()
+        generator.max_concurrent_requests = 4
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_generate(prompt: str, *, aspect_ratio: str | None = None, cancel_token=None):
+            nonlocal in_flight, peak
+            del cancel_token
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            # Earlier pages take longer so they complete last.
+            time.sleep(0.05 if "scene 1" in prompt else 0.01)
+            with lock:
+                in_flight -= 1
+            generator.seen_requests.append((prompt, aspect_ratio))
+            return b"fake-image-bytes", "image/png"
+
+        generator._generate_image_bytes = slow_generate
+        story = SimpleNamespace(
+            pages=[
+                SimpleNamespace(
+                    page_number=page_number,
+                    illustration_prompt=f"full prompt {page_number}",
+                    illustration_scene_prompt=f"scene {page_number}",
+                )
+                for page_number in range(1, 5)
+            ],
+            illustration_prefix="prefix",
+            cover_illustration_prompt="storybook cover prompt",
+            image_style="style",
+            main_character_design="design",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = generator.generate_from_story(
+                story=story,
+                output_dir=tmp_dir,
+                skip_existing=False,
+            )
+            with open(result["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+        self.assertEqual(result["generated"], 5)
+        self.assertEqual(result["cover"]["status"], "generated")
+        self.assertGreater(peak, 1)
+        self.assertEqual(
+            [entry.get("page_number") for entry in manifest["entries"]],
+            [1, 2, 3, 4, None],
+        )
+        self.assertEqual(manifest["entries"][-1]["asset_type"], "cover")
+
+    def test_concurrent_generation_raises_errors_outside_the_render_handler(self):
+        generator = _FakeIllustrationGenerator()
+        generator.max_concurrent_requests = 4
+        story = SimpleNamespace(
+            pages=[
+                SimpleNamespace(
+                    page_number=1,
+                    illustration_prompt="full prompt 1",
+                    illustration_scene_prompt="scene 1",
+                ),
+            ],
+            illustration_prefix="prefix",
+            cover_illustration_prompt="storybook cover prompt",
+            image_style="style",
+            main_character_design="design",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.object(
+                generator, "_render_page", side_effect=RuntimeError("render crashed")
+            ):
+                with self.assertRaisesRegex(RuntimeError, "render crashed"):
+                    generator.generate_from_story(
+                        story=story,
+                        output_dir=tmp_dir,
+                        skip_existing=False,
+                        generate_cover=False,
+                    )
+
+    def test_image_cache_reuses_identical_prompts_across_jobs(self):
+        story = SimpleNamespace(
+            pages=[
+                SimpleNamespace(
+                    page_number=1,
+                    illustration_prompt="full prompt 1",
+                    illustration_scene_prompt="scene 1",
+                ),
+            ],
+            illustration_prefix="prefix",
+            cover_illustration_prompt="storybook cover prompt",
+            image_style="style",
+            main_character_design="design",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(os.path.join(tmp_dir, "cache"), max_bytes=1024 * 1024)
+            first = _FakeIllustrationGenerator()
+            first.image_cache = cache
+            first.generate_from_story(story=story, output_dir=os.path.join(tmp_dir, "run-a"))
+
+            second = _FakeIllustrationGenerator()
+            second.image_cache = cache
+            result = second.generate_from_story(
+                story=story, output_dir=os.path.join(tmp_dir, "run-b")
+            )
+            with open(result["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+            self.assertEqual(len(first.seen_requests), 2)
+            self.assertEqual(second.seen_requests, [])
+            self.assertEqual(result["generated"], 2)
+            self.assertEqual(result["cache_hits"], 2)
+            self.assertEqual(manifest["cache_hits"], 2)
+            self.assertTrue(all(entry["cache_hit"] for entry in manifest["entries"]))
+            page_path = os.path.join(tmp_dir, "run-b", "illustrations", "page_01.png")
+            with open(page_path, "rb") as file:
+                self.assertEqual(file.read(), b"fake-image-bytes")
+
+
+@unittest.skipIf(
+    ImageGenerationClient is None,
+    "illustration dependencies are not installed in this environment",
+)
+class TestImageGenerationClient(unittest.TestCase):
+    def test_aspect_ratio_is_a_per_call_parameter(self):
+        seen_ratios: list[str] = []
+
+        def fake_stream(*, model, contents, config):
+            del model, contents
+            seen_ratios.append(config.image_config.aspect_ratio)
+            inline_data = SimpleNamespace(data=b"image", mime_type="image/png")
+            return [SimpleNamespace(parts=[SimpleNamespace(inline_data=inline_data)])]
+
+        client = ImageGenerationClient(
+            client=SimpleNamespace(models=SimpleNamespace(generate_content_stream=fake_stream)),
+            model_name="gemini-2.5-flash-image",
+            aspect_ratio="1:1",
+            request_interval_sec=0.0,
+        )
+
+        client.generate_image_bytes(prompt="page")
+        client.generate_image_bytes(prompt="cover", aspect_ratio="5:4")
+        client.generate_image_bytes(prompt="page")
+
+        self.assertEqual(seen_ratios, ["1:1", "5:4", "1:1"])
+        self.assertEqual(client.aspect_ratio, "1:1")
+        self.assertIsNone(client.rate_limiter)
+
 
 if __name__ == "__main__":
     unittest.main()
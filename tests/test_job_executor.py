@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from app.services.job_executor import JobExecutor
+
+
+class TestJobExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = JobExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_submit_returns_result_from_worker_thread(self):
+        future = self.executor.submit(lambda value: (value, threading.current_thread().name), 7)
+
+        value, thread_name = future.result(timeout=5)
+
+        self.assertEqual(value, 7)
+        self.assertTrue(thread_name.startswith("moretale-job-"))
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+
+    def test_exceptions_are_propagated_to_future(self):
+        def fail() -> None:
+            raise RuntimeError("boom")
+
+        future = self.executor.submit(fail)
+
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=5)
+
+    def test_concurrency_is_bounded_by_max_workers(self):
+        release = threading.Event()
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def job() -> None:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(timeout=5)
+            with lock:
+                active -= 1
+
+        futures = [self.executor.submit(job) for _ in range(5)]
+        deadline = time.monotonic() + 5
+        while self.executor.running_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.executor.running_count, 2)
+        self.assertEqual(self.executor.queued_count, 3)
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(peak, 2)
+        self.assertEqual(self.executor.running_count, 0)
+
+    def test_submit_after_shutdown_raises(self):
+        self.executor.shutdown()
+
+        with self.assertRaises(RuntimeError):
+            self.executor.submit(lambda: None)
+
+    def test_rejects_non_positive_worker_count(self):
+        with self.assertRaises(ValueError):
+            JobExecutor(max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
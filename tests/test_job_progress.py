@@ -0,0 +1,74 @@
+import unittest
+
+from app.services.job_progress import JobProgressTracker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestJobProgressTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.writes = []
+        self.tracker = JobProgressTracker(
+            write_fn=self.writes.append,
+            min_interval_sec=2.0,
+            monotonic_fn=self.clock,
+        )
+
+    def _task(self, status: str = "generated") -> None:
+        self.tracker.observe({"event": "task", "stage": "tts", "status": status})
+
+    def test_task_events_are_coalesced_into_throttled_writes(self):
+        self.tracker.observe({"event": "stage.start", "stage": "tts"})
+        self.tracker.observe({"event": "tasks.planned", "stage": "tts", "total": 64})
+        for _ in range(10):
+            self.clock.now += 0.1
+            self._task()
+
+        self.assertEqual(len(self.writes), 1)
+        self.clock.now += 2.0
+        self._task(status="failed")
+
+        self.assertEqual(len(self.writes), 2)
+        tts = self.writes[-1]["stages"]["tts"]
+        self.assertEqual(
+            (tts["completed"], tts["failed"], tts["remaining"]),
+            (10, 1, 53),
+        )
+
+    def test_eta_extrapolates_stage_rate_and_job_eta_tracks_slowest_stage(self):
+        for stage, total in (("tts", 10), ("illustrations", 4)):
+            self.tracker.observe({"event": "stage.start", "stage": stage})
+            self.tracker.observe({"event": "tasks.planned", "stage": stage, "total": total})
+        self.clock.now += 10.0
+        for _ in range(5):
+            self._task()
+        self.tracker.observe({"event": "task", "stage": "illustrations", "status": "generated"})
+
+        snapshot = self.tracker.snapshot()
+
+        self.assertEqual(snapshot["stages"]["tts"]["eta_sec"], 10.0)
+        self.assertEqual(snapshot["stages"]["illustrations"]["eta_sec"], 30.0)
+        self.assertEqual(snapshot["eta_sec"], 30.0)
+
+    def test_stage_end_forces_write_and_clears_eta(self):
+        self.tracker.observe({"event": "stage.start", "stage": "tts"})
+        self.tracker.observe({"event": "tasks.planned", "stage": "tts", "total": 1})
+        self._task()
+        self.tracker.observe({"event": "stage.end", "stage": "tts", "status": "completed"})
+
+        self.assertEqual(self.writes[-1]["stages"]["tts"]["status"], "completed")
+        self.assertIsNone(self.writes[-1]["eta_sec"])
+        writes = len(self.writes)
+        self.tracker.flush()
+        self.assertEqual(len(self.writes), writes)
+
+
+if __name__ == "__main__":
+    unittest.main()
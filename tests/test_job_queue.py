@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    from app.services.job_queue import SQLiteJobQueue
+    from app.services.story_orchestrator import job_store
+    from app.worker import QueueWorker
+    _DEPS_AVAILABLE = True
+except ModuleNotFoundError:  # pragma: no cover
+    _DEPS_AVAILABLE = False
+    SQLiteJobQueue = None
+    job_store = None
+    QueueWorker = None
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@unittest.skipIf(not _DEPS_AVAILABLE, "fastapi/pydantic dependencies are not installed")
+class TestSQLiteJobQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.clock = _Clock()
+        self.queue = SQLiteJobQueue(
+            db_path=Path(self.tmp_dir.name) / "jobs.sqlite3",
+            lease_sec=60,
+            max_attempts=2,
+            clock=self.clock,
+        )
+
+    def test_uses_wal_journal(self):
+        connection = sqlite3.connect(self.queue.db_path)
+        self.addCleanup(connection.close)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_claims_in_fifo_order_and_completes(self):
+        self.queue.enqueue("story-a", {"n": 1}, request_id="req-a")
+        self.clock.now += 1
+        self.queue.enqueue("story-b", {"n": 2})
+
+        first = self.queue.claim("worker-1")
+        second = self.queue.claim("worker-2")
+
+        self.assertEqual((first.story_id, first.request_payload), ("story-a", {"n": 1}))
+        self.assertEqual(first.request_id, "req-a")
+        self.assertEqual(second.story_id, "story-b")
+        self.assertIsNone(self.queue.claim("worker-3"))
+
+        self.queue.complete("story-a", "worker-1")
+        self.assertEqual(self.queue.counts(), {"done": 1, "leased": 1})
+
+    def test_claim_prefers_idle_owners_and_holds_heavy_jobs_when_saturated(self):
+        self.queue.enqueue("a-1", {}, owner="a", heavy=True)
+        self.clock.now += 1
+        self.queue.enqueue("a-2", {}, owner="a", heavy=True)
+        self.clock.now += 1
+        self.queue.enqueue("b-1", {}, owner="b", heavy=True)
+        self.clock.now += 1
+        self.queue.enqueue("a-3", {}, owner="a")
+
+        claimed = [
+            self.queue.claim(f"worker-{index}", max_heavy_running=2)
+            for index in range(4)
+        ]
+
+        self.assertEqual([job.story_id for job in claimed[:3]], ["a-1", "b-1", "a-3"])
+        self.assertIsNone(claimed[3])
+
+    def test_claim_orders_owners_by_running_cost_over_weight(self):
+        queue = SQLiteJobQueue(
+            db_path=Path(self.tmp_dir.name) / "weighted.sqlite3",
+            clock=self.clock,
+            weights={"a": 4.0},
+        )
+        queue.enqueue("b-1", {}, owner="b", cost=1.0)
+        self.clock.now += 1
+        queue.enqueue("a-1", {}, owner="a", cost=3.0)
+        self.clock.now += 1
+        queue.enqueue("b-2", {}, owner="b", cost=1.0)
+        self.clock.now += 1
+        queue.enqueue("a-2", {}, owner="a", cost=3.0)
+
+        claimed = [queue.claim(f"worker-{index}").story_id for index in range(4)]
+
+        # a's running share is 3/4 after one job, below b's 1/1.
+        self.assertEqual(claimed, ["b-1", "a-1", "a-2", "b-2"])
+
+    def test_expired_lease_is_reclaimed_as_retry(self):
+        self.queue.enqueue("story-a", {})
+        self.assertFalse(self.queue.claim("worker-1").is_retry)
+
+        self.clock.now += 30
+        self.assertTrue(self.queue.heartbeat("story-a", "worker-1"))
+        self.clock.now += 61
+        retry = self.queue.claim("worker-2")
+
+        self.assertEqual(retry.attempts, 2)
+        self.assertTrue(retry.is_retry)
+        self.assertFalse(self.queue.heartbeat("story-a", "worker-1"))
+
+    def test_recover_orphans_requeues_then_buries_exhausted_jobs(self):
+        self.queue.enqueue("story-a", {})
+        self.queue.claim("worker-1")
+        self.clock.now += 61
+
+        self.assertEqual(self.queue.recover_orphans().requeued, ["story-a"])
+
+        self.queue.claim("worker-2")
+        self.clock.now += 61
+        recovery = self.queue.recover_orphans()
+
+        self.assertEqual(recovery.exhausted, ["story-a"])
+        self.assertEqual(self.queue.counts(), {"dead": 1})
+
+
+@unittest.skipIf(not _DEPS_AVAILABLE, "fastapi/pydantic dependencies are not installed")
+class TestQueueWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        env_patcher = patch.dict(
+            os.environ,
+            {"MORETALE_OUTPUTS_DIR": self.tmp_dir.name},
+            clear=False,
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        self.clock = _Clock()
+        self.queue = SQLiteJobQueue(
+            db_path=Path(self.tmp_dir.name) / "queue" / "jobs.sqlite3",
+            lease_sec=60,
+            max_attempts=2,
+            clock=self.clock,
+        )
+
+    def test_run_once_passes_resume_flag_for_recovered_jobs(self):
+        calls = []
+        worker = QueueWorker(
+            queue=self.queue,
+            run_job=lambda **kwargs: calls.append(kwargs),
+            worker_id="worker-1",
+        )
+        self.queue.enqueue("story-a", {"n": 1}, request_id="req-a")
+        self.queue.claim("crashed-worker")
+        self.clock.now += 61
+
+        self.assertTrue(worker.run_once())
+        self.assertFalse(worker.run_once())
+
+        self.assertEqual(
+            calls,
+            [
+                {
+                    "story_id": "story-a",
+                    "request_payload": {"n": 1},
+                    "request_id": "req-a",
+                    "resume": True,
+                }
+            ],
+        )
+        self.assertEqual(self.queue.counts(), {"done": 1})
+
+    def test_recover_marks_exhausted_jobs_failed(self):
+        job_store.initialize_job(story_id="story-a", request_payload={})
+        job_store.mark_running("story-a")
+        self.queue.enqueue("story-a", {})
+        self.queue.claim("worker-1")
+        self.clock.now += 61
+        self.queue.claim("worker-2")
+        self.clock.now += 61
+
+        QueueWorker(queue=self.queue, run_job=lambda **_: None).recover()
+
+        job = job_store.load_job("story-a")
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"]["code"], "JOB_ATTEMPTS_EXHAUSTED")
+
+
+    def test_failed_last_attempt_marks_job_failed(self):
+        job_store.initialize_job(story_id="story-a", request_payload={})
+        self.queue.enqueue("story-a", {})
+
+        def run_job(**kwargs):
+            job_store.mark_running(kwargs["story_id"])
+            raise RuntimeError("provider down")
+
+        worker = QueueWorker(queue=self.queue, run_job=run_job, worker_id="worker-1")
+        for _ in range(2):
+            with self.assertRaisesRegex(RuntimeError, "provider down"):
+                worker.run_once()
+
+        self.assertEqual(self.queue.counts(), {"dead": 1})
+        job = job_store.load_job("story-a")
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"]["code"], "JOB_ATTEMPTS_EXHAUSTED")
+        self.assertEqual(job["error"]["detail"]["last_error"], "provider down")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import unittest
+
+from app.services.job_scheduler import FairShareQueue, JobSpec, build_job_spec
+
+
+def _drain(job_queue: FairShareQueue, count: int) -> list[str]:
+    items = []
+    for _ in range(count):
+        item = job_queue.get()
+        items.append(item)
+    return items
+
+
+class TestFairShareQueue(unittest.TestCase):
+    def test_interleaves_owners_instead_of_fifo(self):
+        job_queue = FairShareQueue()
+        for index in range(3):
+            job_queue.put(f"a{index}", JobSpec(owner="a"))
+        job_queue.put("b0", JobSpec(owner="b"))
+
+        self.assertEqual(_drain(job_queue, 4), ["a0", "b0", "a1", "a2"])
+
+    def test_expensive_jobs_consume_more_of_the_owner_share(self):
+        job_queue = FairShareQueue()
+        for index in range(2):
+            job_queue.put(f"heavy{index}", build_job_spec("a", enable_illustration=True))
+        for index in range(3):
+            job_queue.put(f"text{index}", build_job_spec("b"))
+
+        order = []
+        for _ in range(5):
+            item = job_queue.get()
+            order.append(item)
+            if item.startswith("heavy"):
+                job_queue.done(build_job_spec("a", enable_illustration=True))
+
+        self.assertEqual(order, ["heavy0", "text0", "text1", "text2", "heavy1"])
+
+    def test_weights_scale_owner_share(self):
+        job_queue = FairShareQueue(weights={"a": 2.0})
+        for index in range(4):
+            job_queue.put(f"a{index}", JobSpec(owner="a"))
+            job_queue.put(f"b{index}", JobSpec(owner="b"))
+
+        self.assertEqual(_drain(job_queue, 6), ["a0", "b0", "a1", "b1", "a2", "a3"])
+
+    def test_priority_reorders_within_owner(self):
+        job_queue = FairShareQueue()
+        job_queue.put("normal", build_job_spec("a"))
+        job_queue.put("high", build_job_spec("a", priority="high"))
+        job_queue.put("low", build_job_spec("a", priority="low"))
+
+        self.assertEqual(_drain(job_queue, 3), ["high", "normal", "low"])
+
+    def test_text_only_jobs_bypass_saturated_heavy_slots(self):
+        job_queue = FairShareQueue(max_heavy_running=1)
+        heavy = build_job_spec("a", enable_tts=True)
+        job_queue.put("heavy0", heavy)
+        job_queue.put("heavy1", heavy)
+        job_queue.put("text", build_job_spec("a"))
+
+        self.assertEqual(job_queue.get(), "heavy0")
+        self.assertEqual(job_queue.get(), "text")
+
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(job_queue.get()))
+        waiter.start()
+        waiter.join(timeout=0.1)
+        self.assertTrue(waiter.is_alive())
+
+        job_queue.done(heavy)
+        waiter.join(timeout=5)
+        self.assertEqual(result, ["heavy1"])
+
+    def test_get_returns_none_once_closed_and_drained(self):
+        job_queue = FairShareQueue()
+        job_queue.put("last", JobSpec())
+        job_queue.close()
+
+        self.assertEqual(job_queue.get(), "last")
+        self.assertIsNone(job_queue.get())
+        with self.assertRaises(RuntimeError):
+            job_queue.put("late", JobSpec())
+
+
+if __name__ == "__main__":
+    unittest.main()
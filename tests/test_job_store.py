@@ -0,0 +1,101 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.job_store import JobStore
+
+
+def _write_statuses(
+    outputs_dir: str,
+    story_id: str,
+    status: str,
+    writes: int,
+    cancel_at: int | None,
+) -> None:
+    os.environ["MORETALE_OUTPUTS_DIR"] = outputs_dir
+    store = JobStore()
+    for index in range(writes):
+        if index == cancel_at:
+            store.mark_canceled(story_id)
+        elif status == "running":
+            store.mark_running(story_id)
+        else:
+            store.mark_queued(story_id)
+
+
+def _write_progress(outputs_dir: str, story_id: str, writes: int) -> None:
+    os.environ["MORETALE_OUTPUTS_DIR"] = outputs_dir
+    store = JobStore()
+    for index in range(writes):
+        store.update_progress(story_id, {"completed": index})
+
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        env_patcher = patch.dict(
+            os.environ,
+            {"MORETALE_OUTPUTS_DIR": self.tmp_dir.name},
+            clear=False,
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def test_cancel_survives_concurrent_writes_from_another_process(self) -> None:
+        story_id = "20260221_170001_story_mina"
+        JobStore().initialize_job(story_id=story_id, request_payload={})
+
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=_write_statuses,
+                args=(self.tmp_dir.name, story_id, "running", 200, None),
+            ),
+            context.Process(
+                target=_write_statuses,
+                args=(self.tmp_dir.name, story_id, "queued", 200, 100),
+            ),
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        run_dir = Path(self.tmp_dir.name) / story_id
+        meta = json.loads((run_dir / "meta.json").read_text(encoding="utf-8"))
+        self.assertEqual(meta["status"], "canceled")
+        self.assertEqual(list(run_dir.glob(".meta.*.tmp")), [])
+
+    def test_progress_writes_never_revert_a_cancel(self) -> None:
+        story_id = "20260221_170002_story_mina"
+        store = JobStore()
+        store.initialize_job(story_id=story_id, request_payload={})
+        store.mark_running(story_id)
+
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(
+            target=_write_progress,
+            args=(self.tmp_dir.name, story_id, 300),
+        )
+        process.start()
+        while store.load_job(story_id).get("progress") is None and process.is_alive():
+            time.sleep(0.001)
+        store.mark_canceled(story_id)
+        process.join(timeout=60)
+
+        self.assertEqual(process.exitcode, 0)
+        meta = store.load_job(story_id)
+        self.assertEqual(meta["status"], "canceled")
+        final = store.update_progress(story_id, {"completed": 999})
+        self.assertNotEqual(final["progress"]["completed"], 999)
+
+
+if __name__ == "__main__":
+    unittest.main()
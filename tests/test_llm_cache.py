@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from generators.common.content_cache import ContentCache
+from generators.common.llm_cache import LLMCacheMiss, LLMResponseCache
+from generators.story.story_generator import StoryGenerator
+from generators.story.story_model import STORY_PAGE_COUNT, Page, Story
+from generators.story.story_stream import StoryPageFeed
+
+
+def _story_text() -> str:
+    return json.dumps(
+        {
+            "title_primary": "용감한 여우",
+            "title_secondary": "The Brave Fox",
+            "author_name": "AI",
+            "primary_language": "Korean",
+            "secondary_language": "English",
+            "image_style": "Watercolor",
+            "main_character_design": "A small red fox",
+            "pages": [
+                Page(
+                    page_number=number,
+                    text_primary=f"페이지 {number}",
+                    text_secondary=f"Page {number}",
+                    illustration_prompt=f"Watercolor, A small red fox, scene {number}",
+                ).model_dump()
+                for number in range(1, STORY_PAGE_COUNT + 1)
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+class _CountingModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, *, model, contents, config):
+        del model, contents, config
+        self.calls += 1
+        return SimpleNamespace(parsed=None, text=_story_text())
+
+    def generate_content_stream(self, *, model, contents, config):
+        del model, contents, config
+        self.calls += 1
+        text = _story_text()
+        for start in range(0, len(text), 500):
+            yield SimpleNamespace(text=text[start : start + 500])
+
+
+def _build_generator(models, response_cache: LLMResponseCache) -> StoryGenerator:
+    with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+        with patch(
+            "generators.story.story_generator.genai.Client",
+            return_value=SimpleNamespace(models=models),
+        ):
+            return StoryGenerator(response_cache=response_cache)
+
+
+def _generate(generator: StoryGenerator, **kwargs) -> Story:
+    return generator.generate_story(
+        child_name="Mina",
+        primary_lang="Korean",
+        secondary_lang="English",
+        theme="Courage",
+        **kwargs,
+    )
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        self.store = ContentCache(self._tmp_dir.name, max_bytes=10 * 1024 * 1024)
+
+    def test_recorded_story_is_replayed_without_network_calls(self):
+        recording = _CountingModels()
+        recorded = _generate(_build_generator(recording, LLMResponseCache(self.store)))
+
+        replaying = _CountingModels()
+        replayed = _generate(
+            _build_generator(replaying, LLMResponseCache(self.store, mode="replay"))
+        )
+
+        self.assertEqual(recording.calls, 1)
+        self.assertEqual(replaying.calls, 0)
+        self.assertEqual(replayed.model_dump(), recorded.model_dump())
+
+    def test_streamed_story_is_recorded_and_replayed_to_the_feed(self):
+        recording = _CountingModels()
+        _generate(
+            _build_generator(recording, LLMResponseCache(self.store)),
+            page_feed=StoryPageFeed(),
+        )
+
+        replaying = _CountingModels()
+        feed = StoryPageFeed()
+        story = _generate(
+            _build_generator(replaying, LLMResponseCache(self.store, mode="replay")),
+            page_feed=feed,
+        )
+
+        self.assertEqual(recording.calls, 1)
+        self.assertEqual(replaying.calls, 0)
+        self.assertEqual(len(list(feed.pages)), STORY_PAGE_COUNT)
+        self.assertIs(feed.story, story)
+
+    def test_cache_hits_do_not_rewrite_the_entry(self):
+        cache = LLMResponseCache(self.store)
+        _generate(_build_generator(_CountingModels(), cache))
+        entry_path = next(self.store.root.glob("*/*.json"))
+        created_at = json.loads(entry_path.read_text(encoding="utf-8"))["created_at"]
+
+        with patch.object(self.store, "put_bytes", wraps=self.store.put_bytes) as put_bytes:
+            _generate(_build_generator(_CountingModels(), cache))
+            _generate(_build_generator(_CountingModels(), cache), page_feed=StoryPageFeed())
+
+        put_bytes.assert_not_called()
+        self.assertEqual(
+            json.loads(entry_path.read_text(encoding="utf-8"))["created_at"], created_at
+        )
+
+    def test_replay_miss_raises_instead_of_calling_the_model(self):
+        models = _CountingModels()
+        generator = _build_generator(models, LLMResponseCache(self.store, mode="replay"))
+
+        with self.assertRaises(LLMCacheMiss):
+            _generate(generator)
+        self.assertEqual(models.calls, 0)
+
+    def test_expired_entries_and_other_schemas_miss(self):
+        cache = LLMResponseCache(self.store, ttl_sec=60)
+        key = LLMResponseCache.build_key(
+            model_name="gemini-2.5-flash",
+            system_instruction="system",
+            user_prompt="prompt",
+            response_schema=Story,
+        )
+        cache.record(key, "{}")
+        self.assertEqual(cache.lookup(key), "{}")
+        self.assertNotEqual(
+            key,
+            LLMResponseCache.build_key(
+                model_name="gemini-2.5-flash",
+                system_instruction="system",
+                user_prompt="prompt",
+                response_schema=Page,
+            ),
+        )
+
+        with patch("generators.common.llm_cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.lookup(key))
+
+    def test_evict_drops_recorded_entries_but_keeps_replay_fixtures(self):
+        key = LLMResponseCache.build_key(
+            model_name="gemini-2.5-flash",
+            system_instruction="system",
+            user_prompt="prompt",
+            response_schema=Story,
+        )
+        recorder = LLMResponseCache(self.store)
+        recorder.record(key, "{}")
+        LLMResponseCache(self.store, mode="replay").evict(key)
+        self.assertEqual(recorder.lookup(key), "{}")
+
+        recorder.evict(key)
+        self.assertIsNone(recorder.lookup(key))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from generators.common.content_cache import ContentCache
+from generators.common.llm_cache import LLMResponseCache
+from generators.common.repair_stats import get_repair_stats
+from generators.quiz.quiz_generator import QuizGenerator
+from generators.quiz.quiz_model import QuizQuestionBatch
+from generators.story.story_model import STORY_PAGE_COUNT, Page, Story
+
+_SKILLS = (
+    "story_comprehension",
+    "cause_and_effect",
+    "character_emotion",
+    "sequence",
+    "vocabulary_in_context",
+)
+
+
+def _build_story() -> Story:
+    return Story(
+        title_primary="리아의 특별한 연",
+        title_secondary="Lia's Special Kite",
+        author_name="AI",
+        primary_language="Korean",
+        secondary_language="English",
+        image_style="Watercolor",
+        main_character_design="A child",
+        pages=[
+            Page(
+                page_number=page_number,
+                text_primary=f"Primary text {page_number}",
+                text_secondary=f"Secondary text {page_number}",
+                illustration_prompt=f"Illustration prompt {page_number}",
+            )
+            for page_number in range(1, STORY_PAGE_COUNT + 1)
+        ],
+    )
+
+
+def _question(question_id: str, skill: str, *, answer_text: str = "Answer") -> dict:
+    return {
+        "question_id": question_id,
+        "type": "multiple_choice",
+        "skill": skill,
+        "question_text": f"Question {question_id} {skill}?",
+        "choices": [
+            {"choice_id": "a", "text": "Answer"},
+            {"choice_id": "b", "text": "Choice B"},
+            {"choice_id": "c", "text": "Choice C"},
+            {"choice_id": "d", "text": "Choice D"},
+        ],
+        "answer": {"choice_id": "a", "text": answer_text},
+        "explanation": "Because the story says so.",
+        "source_page_numbers": [1],
+    }
+
+
+def _quiz_payload(questions: list[dict]) -> dict:
+    return {
+        "story_id": "run",
+        "story_title_primary": "리아의 특별한 연",
+        "story_title_secondary": "Lia's Special Kite",
+        "primary_language": "Korean",
+        "secondary_language": "English",
+        "question_count": 5,
+        "questions": questions,
+    }
+
+
+class TestQuizGeneratorRepair(unittest.TestCase):
+    def setUp(self):
+        self.stats = get_repair_stats("quiz")
+        self.stats.reset()
+
+    def _build(self, quiz_payload: dict, replacement_skills=None, max_repair_rounds: int = 2):
+        calls: list[str] = []
+
+        def generate_content(*, model, contents, config):
+            del model
+            calls.append(contents)
+            if config.response_schema is QuizQuestionBatch:
+                line = contents.split("in this order: ", 1)[1].split("\n", 1)[0]
+                skills = line.split(", ") if replacement_skills is None else replacement_skills
+                batch = QuizQuestionBatch.model_validate(
+                    {"questions": [_question("q1", skill) for skill in skills]}
+                )
+                return SimpleNamespace(parsed=batch)
+            # Gemini leaves `parsed` empty when the JSON fails the validators.
+            return SimpleNamespace(parsed=None, text=json.dumps(quiz_payload))
+
+        with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+            with patch(
+                "generators.quiz.quiz_generator.genai.Client",
+                return_value=SimpleNamespace(
+                    models=SimpleNamespace(generate_content=generate_content)
+                ),
+            ):
+                generator = QuizGenerator(max_repair_rounds=max_repair_rounds)
+        return generator, calls
+
+    def _generate(self, generator):
+        return generator.generate_quiz(story_id="run", story=_build_story(), question_count=5)
+
+    def test_only_the_invalid_question_is_replaced(self):
+        questions = [_question(f"q{index}", skill) for index, skill in enumerate(_SKILLS, 1)]
+        questions[1]["answer"]["text"] = "Not a choice"
+        generator, calls = self._build(_quiz_payload(questions))
+
+        quiz = self._generate(generator)
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn("exactly 1 question(s), one per skill, in this order: cause_and_effect", calls[1])
+        self.assertIn("[story_comprehension] Question q1 story_comprehension?", calls[1])
+        self.assertEqual(sorted(question.skill for question in quiz.questions), sorted(_SKILLS))
+        self.assertEqual(
+            [question.question_id for question in quiz.questions],
+            ["q1", "q2", "q3", "q4", "q5"],
+        )
+        self.assertEqual(self.stats.snapshot()["repaired"], 1)
+        self.assertEqual(self.stats.snapshot()["items_requested"], 1)
+
+    def test_extra_vocabulary_question_is_swapped_for_a_missing_skill(self):
+        questions = [
+            _question("q1", "story_comprehension"),
+            _question("q2", "vocabulary_in_context"),
+            _question("q3", "vocabulary_in_context"),
+            _question("q4", "sequence"),
+            _question("q5", "character_emotion"),
+        ]
+        generator, calls = self._build(_quiz_payload(questions))
+
+        quiz = self._generate(generator)
+
+        self.assertIn("in this order: cause_and_effect", calls[1])
+        self.assertEqual(
+            [question.skill for question in quiz.questions].count("vocabulary_in_context"), 1
+        )
+
+    def test_missing_vocabulary_question_is_requested(self):
+        questions = [_question(f"q{index}", skill) for index, skill in enumerate(_SKILLS[:4], 1)]
+        questions.append(_question("q5", "sequence"))
+        generator, calls = self._build(_quiz_payload(questions))
+
+        quiz = self._generate(generator)
+
+        self.assertIn("in this order: vocabulary_in_context", calls[1])
+        self.assertEqual(quiz.questions[-1].skill, "vocabulary_in_context")
+
+    def test_repair_budget_is_bounded(self):
+        questions = [_question(f"q{index}", skill) for index, skill in enumerate(_SKILLS[:4], 1)]
+        generator, calls = self._build(
+            _quiz_payload(questions), replacement_skills=["sequence"], max_repair_rounds=2
+        )
+
+        with self.assertRaisesRegex(ValueError, "after 2 repair round"):
+            self._generate(generator)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.stats.snapshot()["failed"], 1)
+
+    def test_valid_quiz_is_recorded_and_replayed(self):
+        questions = [_question(f"q{index}", skill) for index, skill in enumerate(_SKILLS, 1)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ContentCache(tmp_dir, max_bytes=1024 * 1024)
+            recorder, recorded_calls = self._build(_quiz_payload(questions))
+            recorder.response_cache = LLMResponseCache(store)
+            recorded = self._generate(recorder)
+
+            replayer, replayed_calls = self._build(_quiz_payload(questions))
+            replayer.response_cache = LLMResponseCache(store, mode="replay")
+            replayed = self._generate(replayer)
+
+        self.assertEqual(len(recorded_calls), 1)
+        self.assertEqual(replayed_calls, [])
+        self.assertEqual(replayed.model_dump(), recorded.model_dump())
+
+    def test_invalid_replies_and_repair_rounds_are_never_replayed(self):
+        questions = [_question(f"q{index}", skill) for index, skill in enumerate(_SKILLS[:4], 1)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ContentCache(tmp_dir, max_bytes=1024 * 1024)
+            # Same prompt every round: a cached repair reply would be replayed.
+            first, first_calls = self._build(
+                _quiz_payload(questions), replacement_skills=["sequence"], max_repair_rounds=2
+            )
+            first.response_cache = LLMResponseCache(store)
+            with self.assertRaisesRegex(ValueError, "after 2 repair round"):
+                self._generate(first)
+
+            retry, retry_calls = self._build(
+                _quiz_payload(questions), replacement_skills=["sequence"], max_repair_rounds=2
+            )
+            retry.response_cache = LLMResponseCache(store)
+            with self.assertRaisesRegex(ValueError, "after 2 repair round"):
+                self._generate(retry)
+
+        self.assertEqual(len(first_calls), 3)
+        self.assertEqual(first_calls[1], first_calls[2])
+        self.assertEqual(len(retry_calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,7 +65,53 @@ class TestQuizPrompt(unittest.TestCase):
             question_count=5,
         )
 
-        self.assertIn('"vocabulary": []', user_prompt)
+        self.assertIn('"vocabulary":[]', user_prompt)
+
+    def test_story_context_is_compact_and_reports_savings(self) -> None:
+        context = QuizPrompt().build_story_context(_build_story())
+
+        self.assertNotIn("\n  ", context.text)
+        self.assertEqual(len(context.text.splitlines()), STORY_PAGE_COUNT)
+        self.assertIn('"entry_id":"page-1-festival"', context.text)
+        self.assertIn("secondary_definition", context.text)
+        self.assertGreater(context.saved_tokens, 0)
+
+    def test_without_budget_every_entry_is_kept(self) -> None:
+        story = _build_story()
+        for index in range(5):
+            story.pages[0].vocabulary.append(
+                story.pages[0].vocabulary[0].model_copy(update={"entry_id": f"extra-{index}"})
+            )
+
+        context = QuizPrompt().build_story_context(story)
+
+        self.assertIn('"entry_id":"extra-4"', context.text)
+
+    def test_token_budget_trims_secondary_text_then_definitions(self) -> None:
+        story = _build_story()
+        full = QuizPrompt().build_story_context(story)
+        without_secondary = QuizPrompt(include_secondary_text=False).build_story_context(story)
+
+        trimmed = QuizPrompt(
+            context_token_budget=without_secondary.estimated_tokens
+        ).build_story_context(story)
+        tight = QuizPrompt(context_token_budget=1).build_story_context(story)
+
+        self.assertIn("Secondary text 1", full.text)
+        self.assertNotIn("Secondary text 1", trimmed.text)
+        self.assertIn("primary_definition", trimmed.text)
+        self.assertNotIn("primary_definition", tight.text)
+        self.assertEqual(tight.text.count('"entry_id"'), STORY_PAGE_COUNT)
+        self.assertIn("Primary text 32", tight.text)
+        self.assertIn('"entry_id":"page-32-festival"', tight.text)
+
+    def test_vocabulary_without_entry_id_is_left_out(self) -> None:
+        story = _build_story()
+        story.pages[0].vocabulary[0].entry_id = None
+
+        context = QuizPrompt().build_story_context(story)
+
+        self.assertIn('{"page_number":1,"text_primary":"Primary text 1","text_secondary":"Secondary text 1","vocabulary":[]}', context.text)
 
 
 if __name__ == "__main__":
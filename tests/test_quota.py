@@ -0,0 +1,223 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.common.quota import (
+    ProviderQuota,
+    QuotaLimits,
+    QuotaRegistry,
+    load_quota_limits,
+)
+
+
+class _FakeClock:
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+class TestQuotaLimits(unittest.TestCase):
+    def test_unset_configuration_is_unlimited(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertTrue(load_quota_limits("gemini-2.5-flash").is_unlimited)
+
+    def test_model_specific_limits_fall_back_to_wildcard(self):
+        config = {
+            "gemini-2.5-flash": {"rpm": 10, "tpm": 250000, "concurrency": 4},
+            "*": {"rpm": 5},
+        }
+        with patch.dict(os.environ, {"MORETALE_QUOTA_LIMITS": json.dumps(config)}):
+            story_limits = load_quota_limits("gemini-2.5-flash")
+            image_limits = load_quota_limits("gemini-2.5-flash-image")
+
+        self.assertEqual(story_limits, QuotaLimits(10.0, 250000.0, 4))
+        self.assertEqual(image_limits, QuotaLimits(requests_per_minute=5.0))
+
+    def test_invalid_json_is_ignored(self):
+        with patch.dict(os.environ, {"MORETALE_QUOTA_LIMITS": "{not json"}):
+            self.assertTrue(load_quota_limits("gemini-2.5-flash").is_unlimited)
+
+
+class TestProviderQuota(unittest.TestCase):
+    def test_in_process_rpm_budget_spaces_requests(self):
+        clock = _FakeClock()
+        quota = ProviderQuota(
+            quota_id="q",
+            limits=QuotaLimits(requests_per_minute=30),
+            monotonic_fn=clock.monotonic,
+            sleep_fn=clock.sleep,
+        )
+
+        for _ in range(3):
+            with quota.slot():
+                pass
+
+        self.assertEqual(clock.sleeps, [2.0, 4.0])
+
+    def test_tpm_budget_waits_once_a_minute_of_tokens_is_spent(self):
+        clock = _FakeClock()
+        quota = ProviderQuota(
+            quota_id="q",
+            limits=QuotaLimits(tokens_per_minute=600),
+            monotonic_fn=clock.monotonic,
+            sleep_fn=clock.sleep,
+        )
+
+        with quota.slot(estimated_tokens=600):
+            pass
+        with quota.slot(estimated_tokens=60):
+            pass
+
+        self.assertEqual(clock.sleeps, [6.0])
+
+    def test_shared_state_dir_coordinates_separate_instances(self):
+        # Two quota objects over the same directory behave like two worker
+        # processes sharing one budget.
+        clock = _FakeClock()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            quotas = [
+                ProviderQuota(
+                    quota_id="shared",
+                    limits=QuotaLimits(requests_per_minute=60),
+                    state_dir=Path(tmp_dir),
+                    sleep_fn=clock.sleep,
+                    wall_clock_fn=clock.monotonic,
+                )
+                for _ in range(2)
+            ]
+            for quota in quotas + quotas:
+                with quota.slot():
+                    pass
+
+        self.assertEqual(clock.sleeps, [1.0, 2.0, 3.0])
+
+    def test_shared_state_ignores_schedules_from_a_stale_clock(self):
+        # A state file written before a reboot or a clock step must not
+        # park callers until its far-future schedule comes around.
+        clock = _FakeClock()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            quota = ProviderQuota(
+                quota_id="stale",
+                limits=QuotaLimits(requests_per_minute=60),
+                state_dir=Path(tmp_dir),
+                sleep_fn=clock.sleep,
+                wall_clock_fn=clock.monotonic,
+            )
+            state_path = Path(tmp_dir) / "stale.state"
+            state_path.write_text(
+                json.dumps({"requests_next_free_at": clock.now + 86_400.0}),
+                encoding="utf-8",
+            )
+            with quota.slot():
+                pass
+            with quota.slot():
+                pass
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(clock.sleeps, [1.0])
+        self.assertEqual(state["requests_next_free_at"], clock.now + 2.0)
+
+    def test_shared_concurrency_slots_are_bounded(self):
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            quotas = [
+                ProviderQuota(
+                    quota_id="slots",
+                    limits=QuotaLimits(max_concurrency=2),
+                    state_dir=Path(tmp_dir),
+                )
+                for _ in range(3)
+            ]
+
+            def work(quota: ProviderQuota) -> None:
+                nonlocal in_flight, peak
+                with quota.slot():
+                    with lock:
+                        in_flight += 1
+                        peak = max(peak, in_flight)
+                    time.sleep(0.05)
+                    with lock:
+                        in_flight -= 1
+
+            threads = [threading.Thread(target=work, args=(quota,)) for quota in quotas * 2]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(peak, 2)
+
+
+    def test_canceled_job_stops_waiting_for_a_slot(self):
+        for state_dir in (None, "shared"):
+            with self.subTest(state_dir=state_dir), tempfile.TemporaryDirectory() as tmp_dir:
+                quota = ProviderQuota(
+                    quota_id="cancel",
+                    limits=QuotaLimits(max_concurrency=1),
+                    state_dir=Path(tmp_dir) if state_dir else None,
+                )
+                cancel_token = CancellationToken()
+                with quota.slot():
+                    timer = threading.Timer(0.05, cancel_token.cancel)
+                    timer.start()
+                    with self.assertRaises(GenerationCanceled):
+                        with quota.slot(cancel_token=cancel_token):
+                            pass
+                    timer.join()
+                # The canceled waiter never took the slot.
+                with quota.slot():
+                    pass
+
+    def test_rate_wait_runs_before_taking_a_slot(self):
+        clock = _FakeClock()
+        quota = ProviderQuota(
+            quota_id="order",
+            limits=QuotaLimits(requests_per_minute=60, max_concurrency=1),
+            monotonic_fn=clock.monotonic,
+            sleep_fn=clock.sleep,
+        )
+        cancel_token = CancellationToken()
+        cancel_token.cancel()
+        with quota.slot():
+            pass
+        # The second call must wait 1s for the rate budget; a canceled job
+        # gives up there instead of sleeping while holding the slot.
+        with self.assertRaises(GenerationCanceled):
+            with quota.slot(cancel_token=cancel_token):
+                pass
+        self.assertTrue(quota._semaphore.acquire(blocking=False))
+
+
+class TestQuotaRegistry(unittest.TestCase):
+    def test_same_key_and_model_share_one_quota(self):
+        registry = QuotaRegistry()
+
+        with patch.dict(os.environ, {}, clear=True):
+            first = registry.get(api_key="key-a", model_name="gemini-2.5-flash")
+            second = registry.get(api_key="key-a", model_name="gemini-2.5-flash")
+            other_key = registry.get(api_key="key-b", model_name="gemini-2.5-flash")
+            other_model = registry.get(api_key="key-a", model_name="gemini-2.5-flash-image")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_key)
+        self.assertIsNot(first, other_model)
+        self.assertNotIn("key-a", first.quota_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
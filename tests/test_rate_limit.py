@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from generators.common.rate_limit import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_first_request_is_free_and_next_waits_full_interval(self):
+        bucket = TokenBucket(requests_per_minute=6)
+
+        self.assertEqual(bucket.reserve(now=100.0), 0.0)
+        self.assertEqual(bucket.reserve(now=103.0), 7.0)
+
+    def test_reservations_are_spread_across_callers(self):
+        bucket = TokenBucket(requests_per_minute=60)
+
+        waits = [bucket.reserve(now=0.0) for _ in range(4)]
+
+        self.assertEqual(waits, [0.0, 1.0, 2.0, 3.0])
+
+    def test_capacity_allows_initial_burst(self):
+        bucket = TokenBucket(requests_per_minute=60, capacity=3)
+
+        waits = [bucket.reserve(now=0.0) for _ in range(5)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 1.0, 2.0])
+
+    def test_legacy_last_request_time_round_trip(self):
+        bucket = TokenBucket(requests_per_minute=6)
+        self.assertIsNone(bucket.last_request_time)
+
+        bucket.last_request_time = 10.0
+
+        self.assertEqual(bucket.last_request_time, 10.0)
+        self.assertEqual(bucket.reserve(now=13.0), 7.0)
+
+    def test_concurrent_reservations_never_share_a_slot(self):
+        bucket = TokenBucket(requests_per_minute=600)
+        waits: list[float] = []
+        lock = threading.Lock()
+
+        def reserve() -> None:
+            wait = bucket.reserve(now=0.0)
+            with lock:
+                waits.append(round(wait, 6))
+
+        threads = [threading.Thread(target=reserve) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(waits), [round(index * 0.1, 6) for index in range(20)])
+
+    def test_rejects_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(requests_per_minute=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(requests_per_minute=10, capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.result_cache import ResultPayloadCache
+
+
+class TestResultPayloadCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        env_patcher = patch.dict(
+            os.environ,
+            {"MORETALE_OUTPUTS_DIR": self.tmp_dir.name},
+            clear=False,
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+        self.story_id = "20260221_151009_story_mina"
+        self.run_dir = Path(self.tmp_dir.name) / self.story_id
+        (self.run_dir / "illustrations").mkdir(parents=True)
+        (self.run_dir / "story_gemini.json").write_text("{}", encoding="utf-8")
+        self.build_calls = 0
+
+    def _build(self, **build_kwargs) -> dict:
+        self.build_calls += 1
+        return {"id": build_kwargs["story_id"], "build": self.build_calls}
+
+    def _kwargs(self, **overrides) -> dict:
+        return {"story_id": self.story_id, "job_status": "completed", **overrides}
+
+    def test_serves_cached_payload_until_assets_change(self) -> None:
+        cache = ResultPayloadCache(max_entries=4)
+
+        first = cache.get_or_build(self._kwargs(), build_fn=self._build)
+        second = cache.get_or_build(self._kwargs(), build_fn=self._build)
+        self.assertIs(first, second)
+        self.assertEqual(self.build_calls, 1)
+
+        other_prefix = cache.get_or_build(self._kwargs(static_prefix=""), build_fn=self._build)
+        self.assertEqual(other_prefix["build"], 2)
+
+        manifest_path = self.run_dir / "illustrations" / "manifest.json"
+        manifest_path.write_text('{"items": []}', encoding="utf-8")
+        third = cache.get_or_build(self._kwargs(), build_fn=self._build)
+
+        self.assertEqual(third["build"], 3)
+        self.assertEqual(
+            cache.stats(),
+            {"entries": 2, "max_entries": 4, "hits": 1, "misses": 3, "evictions": 0},
+        )
+
+    def test_evicts_least_recently_used_entry(self) -> None:
+        cache = ResultPayloadCache(max_entries=1)
+        cache.get_or_build(self._kwargs(), build_fn=self._build)
+        cache.get_or_build(self._kwargs(job_status="failed"), build_fn=self._build)
+        cache.get_or_build(self._kwargs(), build_fn=self._build)
+
+        self.assertEqual(self.build_calls, 3)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_concurrent_misses_share_one_build(self) -> None:
+        cache = ResultPayloadCache()
+        results: list[dict] = []
+
+        def slow_build(**build_kwargs) -> dict:
+            time.sleep(0.05)
+            return self._build(**build_kwargs)
+
+        def worker() -> None:
+            results.append(cache.get_or_build(self._kwargs(), build_fn=slow_build))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.build_calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
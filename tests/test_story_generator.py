@@ -0,0 +1,277 @@
+import json
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.common.repair_stats import get_repair_stats
+from generators.story.story_generator import StoryGenerator, split_page_ranges
+from generators.story.story_model import (
+    STORY_PAGE_COUNT,
+    Page,
+    StoryOutline,
+    StoryPageChunk,
+)
+from generators.story.story_stream import StoryPageFeed
+
+
+def _build_page(number: int) -> Page:
+    return Page(
+        page_number=number,
+        text_primary=f"페이지 {number}",
+        text_secondary=f"Page {number}",
+        illustration_prompt=f"Watercolor, A small red fox, scene {number}",
+    )
+
+
+def _requested_pages(contents: str) -> list[int]:
+    if "Pages to write: " in contents:
+        line = contents.split("Pages to write: ", 1)[1].split("\n", 1)[0]
+        return [int(number) for number in line.split(", ")]
+    first_page = int(contents.split("Write pages ", 1)[1].split(" ", 1)[0])
+    last_page = int(contents.split(" to ", 1)[1].split(" ", 1)[0])
+    return list(range(first_page, last_page + 1))
+
+
+def _build_outline() -> StoryOutline:
+    return StoryOutline(
+        title_primary="용감한 여우",
+        title_secondary="The Brave Fox",
+        author_name="AI",
+        primary_language="Korean",
+        secondary_language="English",
+        image_style="Watercolor",
+        main_character_design="A small red fox",
+        beats=[f"beat {index + 1}" for index in range(STORY_PAGE_COUNT)],
+    )
+
+
+class _FakeModels:
+    """Answers outline and chunk calls; chunk calls wait until all are in flight."""
+
+    def __init__(self, chunk_count: int):
+        self.barrier = threading.Barrier(chunk_count, timeout=5)
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, *, model, contents, config):
+        del model
+        with self._lock:
+            self.prompts.append(contents)
+        if config.response_schema is StoryOutline:
+            return SimpleNamespace(parsed=_build_outline())
+        if "Pages to write: " not in contents:
+            self.barrier.wait()
+        pages = [_build_page(number) for number in _requested_pages(contents)]
+        return SimpleNamespace(parsed=StoryPageChunk(pages=pages))
+
+
+def _build_generator(models) -> StoryGenerator:
+    with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+        with patch(
+            "generators.story.story_generator.genai.Client",
+            return_value=SimpleNamespace(models=models),
+        ):
+            return StoryGenerator()
+
+
+class TestStoryGeneratorChunks(unittest.TestCase):
+    def test_split_page_ranges_covers_every_page_contiguously(self):
+        self.assertEqual(split_page_ranges(32, 4), [(1, 8), (9, 16), (17, 24), (25, 32)])
+        self.assertEqual(split_page_ranges(32, 3), [(1, 11), (12, 22), (23, 32)])
+        self.assertEqual(split_page_ranges(3, 8), [(1, 1), (2, 2), (3, 3)])
+        self.assertEqual(split_page_ranges(32, 0), [(1, 32)])
+
+    def test_chunks_are_written_concurrently_and_merged_in_order(self):
+        models = _FakeModels(chunk_count=4)
+        generator = _build_generator(models)
+        feed = StoryPageFeed()
+
+        story = generator.generate_story(
+            child_name="Mina",
+            primary_lang="Korean",
+            secondary_lang="English",
+            theme="Courage",
+            chunk_count=4,
+            page_feed=feed,
+        )
+
+        self.assertEqual(len(models.prompts), 5)
+        self.assertIn("beats", models.prompts[0])
+        self.assertTrue(any("Page 32: beat 32" in prompt for prompt in models.prompts[1:]))
+        self.assertEqual(
+            [page.page_number for page in story.pages],
+            list(range(1, STORY_PAGE_COUNT + 1)),
+        )
+        self.assertEqual(story.pages[8].text_secondary, "Page 9")
+        self.assertEqual(story.title_secondary, "The Brave Fox")
+        self.assertEqual(story.illustration_prefix, "Watercolor, A small red fox")
+        self.assertEqual(story.pages[0].illustration_scene_prompt, "scene 1")
+        self.assertEqual(len(list(feed.pages)), STORY_PAGE_COUNT)
+        self.assertIs(feed.story, story)
+
+    def test_short_chunk_is_repaired_after_merge(self):
+        models = _FakeModels(chunk_count=2)
+        original = models.generate_content
+        prompts: list[str] = []
+
+        def drop_last_page(**kwargs):
+            prompts.append(kwargs["contents"])
+            response = original(**kwargs)
+            if "Write pages 1 to 16" in kwargs["contents"]:
+                response.parsed.pages.pop()
+            return response
+
+        generator = _build_generator(SimpleNamespace(generate_content=drop_last_page))
+
+        story = generator.generate_story(
+            child_name="Mina",
+            primary_lang="Korean",
+            secondary_lang="English",
+            theme="Courage",
+            chunk_count=2,
+        )
+
+        self.assertEqual(
+            [page.page_number for page in story.pages],
+            list(range(1, STORY_PAGE_COUNT + 1)),
+        )
+        self.assertIn("Pages to write: 16\n", prompts[-1])
+
+    def test_canceled_token_stops_before_chunk_calls(self):
+        token = CancellationToken()
+        prompts: list[str] = []
+
+        def generate_content(*, model, contents, config):
+            del model
+            prompts.append(contents)
+            token.cancel()
+            return SimpleNamespace(parsed=_build_outline())
+
+        generator = _build_generator(SimpleNamespace(generate_content=generate_content))
+
+        with self.assertRaises(GenerationCanceled):
+            generator.generate_story(
+                child_name="Mina",
+                primary_lang="Korean",
+                secondary_lang="English",
+                theme="Courage",
+                chunk_count=4,
+                cancel_token=token,
+            )
+
+        self.assertEqual(len(prompts), 1)
+
+
+def _story_payload(page_numbers) -> dict:
+    outline = _build_outline().model_dump(exclude={"beats"})
+    return {
+        **outline,
+        "pages": [_build_page(number).model_dump() for number in page_numbers],
+    }
+
+
+class TestStoryGeneratorRepair(unittest.TestCase):
+    def setUp(self):
+        self.stats = get_repair_stats("story")
+        self.stats.reset()
+
+    def _build(self, story_payload: dict, repair_pages=None, max_repair_rounds: int = 2):
+        calls: list[str] = []
+
+        def generate_content(*, model, contents, config):
+            del model
+            calls.append(contents)
+            if config.response_schema is StoryPageChunk:
+                numbers = repair_pages if repair_pages is not None else _requested_pages(contents)
+                return SimpleNamespace(
+                    parsed=StoryPageChunk(pages=[_build_page(number) for number in numbers])
+                )
+            # Gemini leaves `parsed` empty when the JSON does not fit the schema.
+            return SimpleNamespace(parsed=None, text=json.dumps(story_payload))
+
+        with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+            with patch(
+                "generators.story.story_generator.genai.Client",
+                return_value=SimpleNamespace(
+                    models=SimpleNamespace(generate_content=generate_content)
+                ),
+            ):
+                generator = StoryGenerator(max_repair_rounds=max_repair_rounds)
+        return generator, calls
+
+    def _generate(self, generator):
+        return generator.generate_story(
+            child_name="Mina",
+            primary_lang="Korean",
+            secondary_lang="English",
+            theme="Courage",
+        )
+
+    def test_missing_and_malformed_pages_are_requested_alone(self):
+        payload = _story_payload([number for number in range(1, 33) if number != 7])
+        del payload["pages"][20]["text_secondary"]
+        generator, calls = self._build(payload)
+
+        story = self._generate(generator)
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn("Pages to write: 7, 22\n", calls[1])
+        self.assertIn("- Page 6: 페이지 6 / Page 6", calls[1])
+        self.assertEqual(story.pages[6].text_secondary, "Page 7")
+        self.assertEqual(self.stats.snapshot()["repaired"], 1)
+        self.assertEqual(self.stats.snapshot()["items_requested"], 2)
+
+    def test_extra_pages_are_dropped_without_a_model_call(self):
+        payload = _story_payload(list(range(1, 33)) + [33, 5])
+        generator, calls = self._build(payload)
+
+        story = self._generate(generator)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(story.pages), STORY_PAGE_COUNT)
+        self.assertEqual(self.stats.snapshot()["attempts"], 1)
+
+    def test_repair_budget_is_bounded(self):
+        payload = _story_payload(range(1, 32))
+        generator, calls = self._build(payload, repair_pages=[], max_repair_rounds=2)
+
+        with self.assertRaisesRegex(ValueError, r"missing pages \[32\] after 2 repair"):
+            self._generate(generator)
+
+        self.assertEqual(len(calls), 3)
+        snapshot = self.stats.snapshot()
+        self.assertEqual((snapshot["attempts"], snapshot["failed"]), (1, 1))
+        self.assertEqual(snapshot["success_rate"], 0.0)
+
+    def test_canceled_token_stops_before_a_repair_round(self):
+        payload = _story_payload(range(1, 32))
+        generator, calls = self._build(payload)
+        token = CancellationToken()
+        token.cancel()
+
+        with self.assertRaises(GenerationCanceled):
+            generator._validate_story_text(
+                json.dumps(payload),
+                {"child_name": "Mina", "primary_lang": "Korean", "secondary_lang": "English"},
+                cancel_token=token,
+            )
+
+        self.assertEqual(calls, [])
+
+    def test_invalid_story_fields_are_not_repaired(self):
+        payload = _story_payload(range(1, 33))
+        del payload["image_style"]
+        generator, calls = self._build(payload)
+
+        with self.assertRaises(ValueError):
+            self._generate(generator)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.stats.snapshot()["attempts"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import os
 import tempfile
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -129,6 +130,29 @@ class TestStoryOrchestrator(unittest.TestCase):
         self.assertIsNotNone(job)
         self.assertEqual(job["status"], "queued")
 
+    def test_background_job_runs_on_job_executor_thread(self) -> None:
+        import anyio
+
+        seen_threads: list[str] = []
+
+        def fake_job(**kwargs) -> None:
+            del kwargs
+            seen_threads.append(threading.current_thread().name)
+
+        with patch(
+            "app.services.story_orchestrator.run_story_generation_job",
+            side_effect=fake_job,
+        ):
+            anyio.run(
+                run_story_generation_job_background,
+                "20260221_150010_story_mina",
+                self._build_create_payload(),
+                "req-456",
+            )
+
+        self.assertEqual(len(seen_threads), 1)
+        self.assertTrue(seen_threads[0].startswith("moretale-job-"))
+
     def test_run_story_generation_job_marks_completed_with_assets_summary(self) -> None:
         story_id = "20260221_150002_story_mina"
         payload = self._build_create_payload()
@@ -264,6 +288,77 @@ class TestStoryOrchestrator(unittest.TestCase):
         mocked_generate.assert_not_called()
         self.assertEqual(job_store.load_job(story_id)["status"], "canceled")
 
+    def test_cancel_while_running_stops_later_stages_and_stays_canceled(self) -> None:
+        story_id = "20260221_151007_story_mina"
+        payload = self._build_create_payload()
+        payload["generation"]["enable_quiz"] = True
+        job_store.initialize_job(story_id=story_id, request_payload=payload)
+
+        def cancel_during_story(request):
+            cancel_story_job(story_id)
+            self.assertTrue(request.cancel_token.is_canceled)
+            return _build_fake_story(), "gemini-2.5-flash"
+
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            side_effect=cancel_during_story,
+        ):
+            with patch("app.services.generation_pipeline.generate_quiz") as mocked_quiz:
+                run_story_generation_job(story_id=story_id, request_payload=payload)
+
+        mocked_quiz.assert_not_called()
+        job = job_store.load_job(story_id)
+        self.assertEqual(job["status"], "canceled")
+        self.assertIsNone(job["result"])
+
+    def test_resumed_job_reuses_story_already_on_disk(self) -> None:
+        story_id = "20260221_151008_story_mina"
+        payload = self._build_create_payload()
+        job_store.initialize_job(story_id=story_id, request_payload=payload)
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            return_value=(_build_fake_story(), "gemini-2.5-flash"),
+        ):
+            run_story_generation_job(story_id=story_id, request_payload=payload)
+
+        with patch("app.services.generation_pipeline.generate_story") as mocked_generate:
+            run_story_generation_job(story_id=story_id, request_payload=payload, resume=True)
+
+        mocked_generate.assert_not_called()
+        self.assertEqual(job_store.load_job(story_id)["status"], "completed")
+
+    def test_result_is_served_from_snapshot_until_assets_change(self) -> None:
+        story_id = "20260221_151009_story_mina"
+        payload = self._build_create_payload()
+        payload["generation"]["enable_illustration"] = True
+        job_store.initialize_job(story_id=story_id, request_payload=payload)
+        with patch(
+            "app.services.generation_pipeline.generate_story",
+            return_value=(_build_fake_story(), "gemini-2.5-flash"),
+        ):
+            with patch(
+                "app.services.generation_pipeline.generate_illustrations",
+                return_value={"generated": 0, "failed": 0},
+            ):
+                run_story_generation_job(story_id=story_id, request_payload=payload)
+
+        run_dir = os.path.join(self.tmp_dir.name, story_id)
+        self.assertTrue(os.path.isfile(os.path.join(run_dir, "result.json")))
+        with patch(
+            "app.services.result_snapshot.build_story_result_payload"
+        ) as mocked_build:
+            first = load_story_result(story_id)
+        mocked_build.assert_not_called()
+        self.assertEqual(first.pages[0].illustration_status, "missing")
+
+        illustrations_dir = os.path.join(run_dir, "illustrations")
+        os.makedirs(illustrations_dir, exist_ok=True)
+        with open(os.path.join(illustrations_dir, "page_01.png"), "wb") as file:
+            file.write(b"image")
+        second = load_story_result(story_id)
+
+        self.assertEqual(second.pages[0].illustration_status, "generated")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 from app.services.output_paths import get_run_dir, write_story_json
 from app.services.story_result_builder import build_story_result_payload
+from benchmarks.result_builder import run as run_result_builder_benchmark
 from generators.story.story_model import STORY_PAGE_COUNT, Page, Story, VocabularyEntry
 
 
@@ -180,6 +181,39 @@ class TestStoryResultBuilder(unittest.TestCase):
 
         self.assertIsNone(payload["quiz_json_url"])
 
+    def test_page_selection_builds_only_selected_pages_but_summarizes_all(self) -> None:
+        story_id = "20260221_160003_story_mina"
+        write_story_json(story_id=story_id, story=_build_fake_story(), story_model="gemini-2.5-flash")
+        build_kwargs = {
+            "story_id": story_id,
+            "include_tts": True,
+            "include_illustration": True,
+            "include_cover_illustration": False,
+            "illustration_aspect_ratio": "1:1",
+            "cover_aspect_ratio": "5:4",
+            "job_status": "completed",
+        }
+
+        full = build_story_result_payload(**build_kwargs)
+        with patch(
+            "app.services.story_result_builder._build_vocabulary_payload",
+            return_value=[],
+        ) as mocked_vocabulary:
+            paged = build_story_result_payload(**build_kwargs, page_numbers=(2, 3))
+
+        self.assertEqual(mocked_vocabulary.call_count, 2)
+        self.assertEqual([page["page_number"] for page in paged["pages"]], [2, 3])
+        self.assertEqual(paged["assets"], full["assets"])
+        self.assertEqual(paged["meta"], full["meta"])
+
+    def test_syscall_count_does_not_grow_with_vocabulary(self) -> None:
+        small = run_result_builder_benchmark(page_count=32, vocabulary_per_page=1, repeat=1)
+        large = run_result_builder_benchmark(page_count=32, vocabulary_per_page=5, repeat=1)
+
+        self.assertEqual(small["syscalls"], large["syscalls"])
+        # One stat per page or vocabulary file would already exceed this.
+        self.assertLess(large["syscalls"], 32 * 5 * 2)
+
 
 if __name__ == "__main__":
     unittest.main()
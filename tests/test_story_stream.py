@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from generators.common.cancellation import CancellationToken, GenerationCanceled
+from generators.story.story_generator import StoryGenerator
+from generators.story.story_model import STORY_PAGE_COUNT, Page, Story
+from generators.story.story_stream import StoryPageFeed, StoryStreamParser
+
+
+def _build_story() -> Story:
+    return Story(
+        title_primary='The "Brave" {Fox}',
+        title_secondary="The Brave Fox",
+        author_name="AI",
+        primary_language="Korean",
+        secondary_language="English",
+        image_style="Watercolor",
+        main_character_design="A small red fox",
+        pages=[
+            Page(
+                page_number=index + 1,
+                text_primary=f"페이지 {index + 1} [시작]",
+                text_secondary=f"Page {index + 1} }}",
+                illustration_prompt=f"Watercolor, A small red fox, scene {index + 1}",
+            )
+            for index in range(STORY_PAGE_COUNT)
+        ],
+    )
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+class TestStoryStreamParser(unittest.TestCase):
+    def test_pages_are_emitted_as_soon_as_they_close(self):
+        text = _build_story().model_dump_json()
+        parser = StoryStreamParser()
+
+        emitted_at: list[tuple[int, int]] = []
+        consumed = 0
+        for chunk in _chunks(text, 37):
+            consumed += len(chunk)
+            for page in parser.feed(chunk):
+                emitted_at.append((page.page_number, consumed))
+
+        self.assertEqual(
+            [page_number for page_number, _ in emitted_at],
+            list(range(1, STORY_PAGE_COUNT + 1)),
+        )
+        # Page 1 is available long before the whole document has arrived.
+        self.assertLess(emitted_at[0][1], len(text) // 4)
+        self.assertEqual(parser.text, text)
+        self.assertEqual(parser.header["title_primary"], 'The "Brave" {Fox}')
+        self.assertEqual(parser.header["image_style"], "Watercolor")
+
+    def test_header_fields_after_pages_are_still_collected(self):
+        story = _build_story()
+        payload = story.model_dump(mode="json")
+        reordered = {"pages": payload.pop("pages"), **payload}
+        parser = StoryStreamParser()
+
+        pages = parser.feed(json.dumps(reordered, ensure_ascii=False))
+
+        self.assertEqual(len(pages), STORY_PAGE_COUNT)
+        self.assertEqual(parser.header["main_character_design"], "A small red fox")
+
+    def test_malformed_page_is_skipped_for_the_repair_pass(self):
+        payload = _build_story().model_dump(mode="json")
+        del payload["pages"][1]["text_primary"]
+        parser = StoryStreamParser()
+
+        pages = parser.feed(json.dumps(payload, ensure_ascii=False))
+
+        self.assertEqual(len(pages), STORY_PAGE_COUNT - 1)
+        self.assertNotIn(2, [page.page_number for page in pages])
+
+
+class TestStoryPageFeed(unittest.TestCase):
+    def test_consumer_receives_pages_while_producer_is_still_writing(self):
+        story = _build_story()
+        feed = StoryPageFeed()
+        first_page_seen = threading.Event()
+        seen: list[int] = []
+
+        def consume() -> None:
+            for page in feed.pages:
+                seen.append(page.page_number)
+                first_page_seen.set()
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        feed.set_header({"image_style": "Watercolor"})
+        feed.put(story.pages[0])
+        self.assertTrue(first_page_seen.wait(timeout=2))
+        for page in story.pages[1:]:
+            feed.put(page)
+        feed.finish(story)
+        consumer.join(timeout=2)
+
+        self.assertEqual(seen, list(range(1, STORY_PAGE_COUNT + 1)))
+        self.assertEqual(feed.image_style, "Watercolor")
+        self.assertIs(feed.story, story)
+        self.assertEqual(len(feed.pages), STORY_PAGE_COUNT)
+
+    def test_failure_is_raised_to_consumers(self):
+        feed = StoryPageFeed()
+        feed.put(_build_story().pages[0])
+        feed.fail(RuntimeError("stream broke"))
+
+        with self.assertRaisesRegex(RuntimeError, "stream broke"):
+            list(feed.pages)
+        with self.assertRaisesRegex(RuntimeError, "stream broke"):
+            _ = feed.story
+
+
+class TestStoryGeneratorStreaming(unittest.TestCase):
+    def test_streaming_feeds_pages_and_validates_final_story(self):
+        text = _build_story().model_dump_json()
+        stream = [SimpleNamespace(text=chunk) for chunk in _chunks(text, 500)]
+        fake_client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=lambda **_kwargs: iter(stream))
+        )
+
+        with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+            with patch("generators.story.story_generator.genai.Client", return_value=fake_client):
+                generator = StoryGenerator()
+        feed = StoryPageFeed()
+
+        story = generator.generate_story(
+            child_name="Mina",
+            primary_lang="Korean",
+            secondary_lang="English",
+            theme="Courage",
+            page_feed=feed,
+        )
+
+        streamed_pages = list(feed.pages)
+        self.assertEqual(len(streamed_pages), STORY_PAGE_COUNT)
+        self.assertEqual(streamed_pages[0].illustration_scene_prompt, "scene 1")
+        self.assertEqual(feed.illustration_prefix, story.illustration_prefix)
+        self.assertIs(feed.story, story)
+        self.assertEqual(story.pages[0].illustration_scene_prompt, "scene 1")
+
+    def test_canceled_token_stops_reading_the_stream(self):
+        text = _build_story().model_dump_json()
+        token = CancellationToken()
+        read: list[int] = []
+
+        def stream(**_kwargs):
+            for index, chunk in enumerate(_chunks(text, 500)):
+                read.append(index)
+                if index == 2:
+                    token.cancel()
+                yield SimpleNamespace(text=chunk)
+
+        fake_client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=stream))
+        with patch.dict(os.environ, {"GEMINI_STORY_API_KEY": "test-key"}):
+            with patch("generators.story.story_generator.genai.Client", return_value=fake_client):
+                generator = StoryGenerator()
+        feed = StoryPageFeed()
+
+        with self.assertRaises(GenerationCanceled):
+            generator.generate_story(
+                child_name="Mina",
+                primary_lang="Korean",
+                secondary_lang="English",
+                theme="Courage",
+                page_feed=feed,
+                cancel_token=token,
+            )
+
+        self.assertEqual(read, [0, 1, 2])
+        with self.assertRaises(GenerationCanceled):
+            _ = feed.story
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,14 @@
+import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+from generators.common.cancellation import CancellationToken
+from generators.common.content_cache import ContentCache
 from generators.tts.tts_generator import (
     TTSGenerator,
     convert_to_wav,
@@ -190,6 +195,208 @@ class TestTTSGenerator(unittest.TestCase):
                 )
             )
 
+    def test_concurrent_mode_keeps_manifest_in_task_order(self):
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=Mock(return_value=[]))
+        )
+        generator = TTSGenerator(
+            api_key="dummy",
+            client=client,
+            requests_per_minute=6000,
+            max_concurrent_requests=4,
+        )
+        story = _make_story(
+            [
+                SimpleNamespace(
+                    page_number=page_number,
+                    text_primary=f"문장 {page_number}",
+                    text_secondary=f"Line {page_number}",
+                )
+                for page_number in range(1, 5)
+            ]
+        )
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def fake_stream(contents, config, cancel_token=None):
+            nonlocal in_flight, peak
+            del config, cancel_token
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            # Earlier pages finish last to scramble completion order.
+            prompt = contents[0].parts[0].text
+            time.sleep(0.05 if "1" in prompt else 0.01)
+            with lock:
+                in_flight -= 1
+            return b"\x00\x01" * 10, "audio/L16;rate=24000"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.object(generator, "_stream_audio_bytes", side_effect=fake_stream):
+                result = generator.generate_book_audio(
+                    story=story,
+                    output_dir=tmp_dir,
+                    skip_existing=True,
+                )
+
+            with open(result["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+        self.assertEqual(result["generated"], 8)
+        self.assertEqual(result["failed"], 0)
+        self.assertGreater(peak, 1)
+        self.assertLessEqual(peak, 4)
+        self.assertEqual(
+            [(entry["page_number"], entry["role"]) for entry in manifest["entries"]],
+            [
+                (page_number, role)
+                for page_number in range(1, 5)
+                for role in ("primary", "secondary")
+            ],
+        )
+
+    def test_concurrent_mode_raises_errors_outside_the_task_handler(self):
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=Mock(return_value=[]))
+        )
+        generator = TTSGenerator(
+            api_key="dummy",
+            client=client,
+            requests_per_minute=6000,
+            max_concurrent_requests=4,
+        )
+        story = _make_story(
+            [SimpleNamespace(page_number=1, text_primary="첫 문장", text_secondary="First line")]
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.object(
+                generator, "_build_prompt", side_effect=RuntimeError("prompt template missing")
+            ):
+                with self.assertRaisesRegex(RuntimeError, "prompt template missing"):
+                    generator.generate_book_audio(
+                        story=story,
+                        output_dir=tmp_dir,
+                        skip_existing=False,
+                    )
+
+    def test_cancel_stops_remaining_tasks_and_writes_partial_manifest(self):
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=Mock(return_value=[]))
+        )
+        generator = TTSGenerator(api_key="dummy", client=client)
+        pages = [
+            SimpleNamespace(page_number=1, text_primary="첫 문장", text_secondary="First line"),
+            SimpleNamespace(page_number=2, text_primary="둘째 문장", text_secondary="Second line"),
+        ]
+        cancel_token = CancellationToken()
+        calls = []
+
+        def fake_stream(contents, config, cancel_token=None):
+            calls.append(contents)
+            cancel_token.cancel()
+            return b"\x00\x01" * 100, "audio/L16;rate=24000"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.object(generator, "_stream_audio_bytes", side_effect=fake_stream):
+                result = generator.generate_book_audio(
+                    story=_make_story(pages),
+                    output_dir=tmp_dir,
+                    skip_existing=False,
+                    cancel_token=cancel_token,
+                )
+
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(result["canceled"])
+            self.assertEqual(result["generated"], 1)
+            with open(result["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            self.assertTrue(manifest["canceled"])
+            self.assertEqual(len(manifest["entries"]), 1)
+            self.assertEqual(manifest["entries"][0]["status"], "generated")
+
+    def test_manifest_is_in_page_order_when_pages_arrive_late(self):
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=Mock(return_value=[]))
+        )
+        generator = TTSGenerator(api_key="dummy", client=client)
+        # A streamed story delivers a repaired page after the later pages.
+        pages = [
+            SimpleNamespace(page_number=2, text_primary="둘째 문장", text_secondary="Second line"),
+            SimpleNamespace(page_number=1, text_primary="첫 문장", text_secondary="First line"),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.object(
+                generator,
+                "_stream_audio_bytes",
+                return_value=(b"\x00\x01" * 100, "audio/L16;rate=24000"),
+            ):
+                result = generator.generate_book_audio(
+                    story=_make_story(pages),
+                    output_dir=tmp_dir,
+                    skip_existing=False,
+                )
+            with open(result["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+        self.assertEqual(
+            [(entry["page_number"], entry["role"]) for entry in manifest["entries"]],
+            [(1, "primary"), (1, "secondary"), (2, "primary"), (2, "secondary")],
+        )
+
+    def test_audio_cache_is_shared_across_stories(self):
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content_stream=Mock(return_value=[]))
+        )
+        pages = [
+            SimpleNamespace(page_number=1, text_primary="첫 문장", text_secondary="First line"),
+        ]
+        calls = []
+
+        def fake_stream(contents, config, cancel_token=None):
+            del config, cancel_token
+            calls.append(contents)
+            return b"\x00\x01" * 100, "audio/L16;rate=24000"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ContentCache(os.path.join(tmp_dir, "cache"), max_bytes=10 * 1024 * 1024)
+            results = []
+            for run_id in ("run-a", "run-b"):
+                generator = TTSGenerator(api_key="dummy", client=client, audio_cache=cache)
+                with patch.object(generator, "_stream_audio_bytes", side_effect=fake_stream):
+                    results.append(
+                        generator.generate_book_audio(
+                            story=_make_story(pages),
+                            output_dir=os.path.join(tmp_dir, run_id),
+                            skip_existing=True,
+                        )
+                    )
+
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(results[0]["cache_hits"], 0)
+            self.assertEqual(results[1]["cache_hits"], 2)
+            self.assertEqual(results[1]["generated"], 2)
+            with open(results[1]["manifest_path"], "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            self.assertEqual(manifest["cache_hits"], 2)
+            self.assertTrue(all(entry["cache_hit"] for entry in manifest["entries"]))
+            first_path = os.path.join(tmp_dir, "run-a", "audio", "01_korean", "page_01_primary.wav")
+            second_path = os.path.join(tmp_dir, "run-b", "audio", "01_korean", "page_01_primary.wav")
+            with open(first_path, "rb") as first, open(second_path, "rb") as second:
+                self.assertEqual(first.read(), second.read())
+
+    def test_audio_cache_key_ignores_whitespace_but_not_voice(self):
+        client = SimpleNamespace(models=SimpleNamespace())
+        generator = TTSGenerator(api_key="dummy", client=client)
+        other_voice = TTSGenerator(api_key="dummy", client=client, voice_name="Kore")
+
+        key = generator._cache_key("Korean", "Read.\n첫 문장")
+        self.assertEqual(key, generator._cache_key("Korean", "Read.  첫   문장 "))
+        self.assertNotEqual(key, other_voice._cache_key("Korean", "Read.\n첫 문장"))
+        self.assertNotEqual(key, generator._cache_key("English", "Read.\n첫 문장"))
+
 
 if __name__ == "__main__":
     unittest.main()